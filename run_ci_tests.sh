@@ -2,6 +2,14 @@
 echo "🎯 CI Test Suite Runner"
 echo "======================="
 
+# Result files older than this marker are left over from earlier runs
+RUN_MARKER=$(mktemp)
+trap 'rm -f "$RUN_MARKER"' EXIT
+
+written_this_run() {
+    [ -f "$1" ] && [ "$1" -nt "$RUN_MARKER" ]
+}
+
 # Run the simple test runner (most reliable)
 echo "🚀 Running simple test suite..."
 python run_simple_tests.py
@@ -20,21 +28,42 @@ echo "📋 FINAL RESULTS SUMMARY:"
 echo "========================="
 
 # Check for result files
-if [ -f "simple_test_results.json" ]; then
+if written_this_run "simple_test_results.json"; then
     echo "📁 Simple tests: Results saved to simple_test_results.json"
 fi
 
-if [ -f "network_test_results.json" ]; then
+if written_this_run "network_test_results.json"; then
     echo "📁 Network tests: Results saved to network_test_results.json"
 fi
 
-if [ -f "ci_test_results.json" ]; then
+if written_this_run "ci_test_results.json"; then
     echo "📁 Selenium tests: Results saved to ci_test_results.json"
 fi
 
-if [ -f "report_network.html" ]; then
+if written_this_run "report_network.html"; then
     echo "📊 HTML report: report_network.html"
 fi
 
+echo ""
+echo "📉 Checking for performance regressions..."
+# Only gate (and add to the baseline) what this run produced; stale files
+# would be re-appended to the baseline on every run
+GATE_FILES=()
+for results in simple_test_results.json network_test_results.json ci_test_results.json; do
+    if written_this_run "$results"; then
+        GATE_FILES+=("$results")
+    fi
+done
+
+if [ ${#GATE_FILES[@]} -eq 0 ]; then
+    echo "ℹ️  No results written by this run, nothing to gate"
+else
+    python scripts/regression_gate.py "${GATE_FILES[@]}" --baseline perf_baseline.json --update-baseline
+    if [ $? -ne 0 ]; then
+        echo "❌ Performance regression detected"
+        exit 1
+    fi
+fi
+
 echo ""
 echo "✅ CI test suite completed!"
\ No newline at end of file
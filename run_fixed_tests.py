@@ -5,24 +5,23 @@ Fixed test runner for Termux - No browser required
 
 import os
 import sys
+import importlib.util
 
 # Add scripts directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'scripts'))
 
+# pip package -> importable module
+REQUIRED_PACKAGES = {
+    'requests': 'requests',
+    'beautifulsoup4': 'bs4'
+}
+
 def check_dependencies():
-    """Check if required packages are installed"""
-    required_packages = ['requests', 'beautifulsoup4', 'speedtest-cli']
+    """Check if required packages are installed (without importing them)"""
     missing = []
     
-    for package in required_packages:
-        try:
-            if package == 'speedtest-cli':
-                import speedtest
-            elif package == 'beautifulsoup4':
-                from bs4 import BeautifulSoup
-            else:
-                __import__(package)
-        except ImportError:
+    for package, module in REQUIRED_PACKAGES.items():
+        if importlib.util.find_spec(module) is None:
             missing.append(package)
     
     return missing
@@ -39,7 +38,7 @@ def main():
         return 1
     
     try:
-        from scripts.selenium_test_fixed import TermuxNetworkTester
+        from selenium_test_fixed import TermuxNetworkTester
         
         tester = TermuxNetworkTester()
         results = tester.run_all_tests()
@@ -10,74 +10,128 @@ from datetime import datetime
 # Add scripts to path
 sys.path.insert(0, 'scripts')
 
-def run_simple_tests():
+def run_simple_tests(sequential=False):
     print("🎯 Simple Test Runner")
     print("====================")
     
+    from driver_session import shared_session
+    from suite_executor import SuiteExecutor
+    
     results = {
         "timestamp": datetime.now().isoformat(),
         "environment": "termux",
         "tests": {}
     }
     
-    # Test 1: Import network_tests
-    try:
-        from network_tests import TermuxNetworkTester
-        results["tests"]["import_network_tests"] = {"status": "success"}
-        print("✅ Import network_tests: PASS")
-    except Exception as e:
-        results["tests"]["import_network_tests"] = {"status": "error", "error": str(e)}
-        print(f"❌ Import network_tests: FAIL - {e}")
+    # Shared between checks: the tester class once the import succeeded
+    loaded = {}
+    
+    def new_tester():
+        if "TermuxNetworkTester" not in loaded:
+            raise RuntimeError("TermuxNetworkTester was not imported")
+        return loaded["TermuxNetworkTester"]()
+    
+    # Test 1: Import network_test
+    def import_network_tests():
+        try:
+            from network_test import TermuxNetworkTester
+            loaded["TermuxNetworkTester"] = TermuxNetworkTester
+            print("✅ Import network_test: PASS")
+            return {"status": "success"}
+        except Exception as e:
+            print(f"❌ Import network_test: FAIL - {e}")
+            return {"status": "error", "error": str(e)}
     
     # Test 2: Create network tester instance
-    try:
-        tester = TermuxNetworkTester()
-        results["tests"]["create_tester"] = {"status": "success"}
-        print("✅ Create tester instance: PASS")
-    except Exception as e:
-        results["tests"]["create_tester"] = {"status": "error", "error": str(e)}
-        print(f"❌ Create tester instance: FAIL - {e}")
+    def create_tester():
+        try:
+            new_tester()
+            print("✅ Create tester instance: PASS")
+            return {"status": "success"}
+        except Exception as e:
+            print(f"❌ Create tester instance: FAIL - {e}")
+            return {"status": "error", "error": str(e)}
     
     # Test 3: Test requests
-    try:
-        import requests
-        response = requests.get("https://httpbin.org/json", timeout=10)
-        results["tests"]["requests_test"] = {"status": "success", "status_code": response.status_code}
-        print(f"✅ Requests test: PASS (Status: {response.status_code})")
-    except Exception as e:
-        results["tests"]["requests_test"] = {"status": "error", "error": str(e)}
-        print(f"❌ Requests test: FAIL - {e}")
+    def requests_test():
+        try:
+            import requests
+            response = requests.get("https://httpbin.org/json", timeout=10)
+            print(f"✅ Requests test: PASS (Status: {response.status_code})")
+            return {"status": "success", "status_code": response.status_code}
+        except Exception as e:
+            print(f"❌ Requests test: FAIL - {e}")
+            return {"status": "error", "error": str(e)}
     
     # Test 4: Test Selenium
-    try:
-        from selenium_ci import GitHubSeleniumRunner
-        runner = GitHubSeleniumRunner(headless=True)
-        driver = runner.setup_selenium()
-        if driver:
-            driver.quit()
-            results["tests"]["selenium_test"] = {"status": "success"}
-            print("✅ Selenium test: PASS")
-        else:
-            results["tests"]["selenium_test"] = {"status": "error", "error": "Driver not created"}
-            print("❌ Selenium test: FAIL - Driver not created")
-    except Exception as e:
-        results["tests"]["selenium_test"] = {"status": "error", "error": str(e)}
-        print(f"❌ Selenium test: FAIL - {e}")
+    def selenium_test():
+        try:
+            from selenium_ci import GitHubSeleniumRunner
+            runner = GitHubSeleniumRunner(headless=True)
+            driver = runner.setup_selenium()
+            if driver:
+                runner.release_driver(driver)
+                print("✅ Selenium test: PASS")
+                return {"status": "success"}
+            else:
+                print("❌ Selenium test: FAIL - Driver not created")
+                return {"status": "error", "error": "Driver not created"}
+        except Exception as e:
+            print(f"❌ Selenium test: FAIL - {e}")
+            return {"status": "error", "error": str(e)}
     
     # Test 5: Run a quick network test
-    try:
-        tester = TermuxNetworkTester()
-        latency_result = tester.test_latency()
-        results["tests"]["network_latency"] = {"status": "success", "result": latency_result}
-        print("✅ Network latency test: PASS")
-    except Exception as e:
-        results["tests"]["network_latency"] = {"status": "error", "error": str(e)}
-        print(f"❌ Network latency test: FAIL - {e}")
+    def network_latency():
+        try:
+            tester = new_tester()
+            latency_result = tester.test_latency()
+            print("✅ Network latency test: PASS")
+            return {"status": "success", "result": latency_result}
+        except Exception as e:
+            print(f"❌ Network latency test: FAIL - {e}")
+            return {"status": "error", "error": str(e)}
+    
+    # Test 6: CI browser suite on the driver the Selenium check left warm
+    def ci_suite():
+        try:
+            from selenium_ci import GitHubSeleniumRunner
+            ci_results = GitHubSeleniumRunner(headless=True).run_ci_tests()
+            passed = sum(1 for r in ci_results["tests"].values() if r.get("status") == "success")
+            total = sum(1 for r in ci_results["tests"].values() if r.get("status") != "skipped")
+            if not total:
+                print("❌ CI suite: FAIL - Driver not created")
+                return {"status": "error", "error": "Driver not created"}
+            if passed == total:
+                print(f"✅ CI suite: PASS ({passed}/{total} tests)")
+                return {"status": "success", "passed": passed, "total": total}
+            print(f"❌ CI suite: FAIL - {passed}/{total} tests passed")
+            return {"status": "error", "error": f"{passed}/{total} tests passed", "passed": passed, "total": total}
+        except Exception as e:
+            print(f"❌ CI suite: FAIL - {e}")
+            return {"status": "error", "error": str(e)}
+    
+    # Network checks overlap with the browser startup; one browser at a time
+    executor = SuiteExecutor(sequential=sequential)
+    executor.add("import_network_tests", import_network_tests, category="cpu")
+    executor.add("create_tester", create_tester, category="cpu", depends_on=["import_network_tests"])
+    executor.add("requests_test", requests_test, category="http")
+    executor.add("selenium_test", selenium_test, category="browser")
+    executor.add("network_latency", network_latency, category="http", depends_on=["import_network_tests"])
+    executor.add("ci_suite", ci_suite, category="browser", depends_on=["selenium_test"])
+    
+    results["tests"], executor_report = executor.run()
+    results["executor"] = executor_report
+    # One browser served both browser checks; reuses and the time saved are measured here
+    results["session"] = shared_session.report()
     
     # Save results
     with open("simple_test_results.json", "w") as f:
         json.dump(results, f, indent=2)
     
+    # Keep a history across runs; the JSON file only holds the latest
+    from results_store import store_run
+    store_run("simple", results)
+    
     # Print summary
     print(f"\n📊 SIMPLE TEST SUMMARY:")
     print("=" * 40)
@@ -90,10 +144,14 @@ def run_simple_tests():
         print(f"{test_name:25} {icon} {status}")
     
     print(f"\n🏁 RESULTS: {success_count}/{total_count} tests passed")
+    print(f"⏱️  Wall {executor_report['wall_seconds']}s, critical path "
+          f"{executor_report['critical_path_seconds']}s, summed {executor_report['summed_seconds']}s")
+    print(f"♻️  Driver reuses: {results['session']['reuses']}, "
+          f"~{results['session']['estimated_seconds_saved']}s of startup saved")
     print("📁 Detailed results saved to: simple_test_results.json")
     
     return success_count == total_count
 
 if __name__ == "__main__":
-    success = run_simple_tests()
+    success = run_simple_tests(sequential="--sequential" in sys.argv[1:])
     sys.exit(0 if success else 1)
\ No newline at end of file
@@ -19,7 +19,7 @@ def main():
         print("Some features might not work correctly")
     
     try:
-        from scripts.selenium_test import TermuxSeleniumTester
+        from selenium_test import TermuxSeleniumTester
         
         # Run the tests
         tester = TermuxSeleniumTester(headless=True)
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Browser discovery - cached geckodriver/Firefox paths and versions, checked without a launch
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import subprocess
+
+from user_dirs import CACHE_DIR
+
+
+CACHE_FILE = os.path.join(CACHE_DIR, "browser_discovery.json")
+
+TERMUX_BIN = "/data/data/com.termux/files/usr/bin"
+
+CANDIDATES = {
+    "geckodriver": [
+        "/usr/bin/geckodriver",
+        "/usr/local/bin/geckodriver",
+        os.path.expanduser("~/geckodriver"),
+        os.path.join(os.getcwd(), "geckodriver"),
+        os.path.join(TERMUX_BIN, "geckodriver")
+    ],
+    "firefox": [
+        "/usr/bin/firefox",
+        "/usr/local/bin/firefox",
+        "/usr/bin/firefox-esr",
+        os.path.join(TERMUX_BIN, "firefox")
+    ]
+}
+PATH_NAMES = {
+    "geckodriver": ["geckodriver"],
+    "firefox": ["firefox", "firefox-esr"]
+}
+
+# Minimum Firefox major version per geckodriver release (newest first),
+# from the geckodriver "Supported platforms" table
+GECKODRIVER_MIN_FIREFOX = [
+    ((0, 36, 0), 128),
+    ((0, 34, 0), 115),
+    ((0, 32, 0), 102),
+    ((0, 31, 0), 91),
+    ((0, 30, 0), 78),
+    ((0, 26, 0), 60),
+    ((0, 21, 0), 57)
+]
+
+
+def parse_version(text):
+    """First dotted version number in text as a tuple of ints"""
+    match = re.search(r"(\d+)\.(\d+)(?:\.(\d+))?", text or "")
+    if not match:
+        return None
+    return tuple(int(part or 0) for part in match.groups())
+
+
+def probe_version(path, timeout=10):
+    """Run `<binary> --version` and return its first output line"""
+    try:
+        completed = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=timeout)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    output = (completed.stdout or completed.stderr).strip()
+    return output.splitlines()[0] if output else None
+
+
+def locate(tool):
+    """First existing candidate path, then PATH"""
+    for path in CANDIDATES[tool]:
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    for name in PATH_NAMES[tool]:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def check_compatibility(geckodriver_version, firefox_version):
+    """(compatible, reason) for a geckodriver/Firefox version pair"""
+    if not geckodriver_version or not firefox_version:
+        return None, "version unknown"
+    for release, min_firefox in GECKODRIVER_MIN_FIREFOX:
+        if geckodriver_version >= release:
+            if firefox_version[0] < min_firefox:
+                return False, (f"geckodriver {'.'.join(map(str, geckodriver_version))} "
+                               f"needs Firefox >= {min_firefox}, found {firefox_version[0]}")
+            return True, "ok"
+    return None, "geckodriver older than the compatibility table"
+
+
+class BrowserDiscovery:
+    """Resolve and version-probe geckodriver and Firefox, cached on disk"""
+
+    def __init__(self, cache_file=CACHE_FILE):
+        self.cache_file = cache_file
+        self.cache = self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, indent=2)
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            # A read-only home just means no cache
+            pass
+
+    def _still_valid(self, entry):
+        """Cached entry matches the binary on disk (same mtime and size)"""
+        try:
+            stat = os.stat(entry["path"])
+        except (OSError, KeyError, TypeError):
+            return False
+        return stat.st_mtime == entry.get("mtime") and stat.st_size == entry.get("size")
+
+    def resolve(self, tool, refresh=False):
+        """Path and version for tool; returns (entry, from_cache)"""
+        entry = self.cache.get(tool)
+        if not refresh and entry and self._still_valid(entry):
+            return entry, True
+
+        path = locate(tool)
+        if path is None:
+            entry = {"path": None, "version": None, "version_line": None}
+        else:
+            stat = os.stat(path)
+            version_line = probe_version(path)
+            version = parse_version(version_line)
+            entry = {
+                "path": path,
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+                "version_line": version_line,
+                "version": list(version) if version else None
+            }
+        # Missing tools are not cached so an install is noticed next time
+        if path is not None:
+            self.cache[tool] = entry
+            self._save()
+        return entry, False
+
+    def discover(self, refresh=False):
+        """Both tools plus a compatibility verdict"""
+        start_time = time.perf_counter()
+        geckodriver, geckodriver_cached = self.resolve("geckodriver", refresh)
+        firefox, firefox_cached = self.resolve("firefox", refresh)
+
+        compatible, reason = check_compatibility(
+            tuple(geckodriver["version"]) if geckodriver["version"] else None,
+            tuple(firefox["version"]) if firefox["version"] else None
+        )
+        return {
+            "geckodriver": geckodriver,
+            "firefox": firefox,
+            "compatible": compatible,
+            "reason": reason,
+            "cached": geckodriver_cached and firefox_cached,
+            "elapsed_ms": round((time.perf_counter() - start_time) * 1000, 2)
+        }
+
+
+def discover(refresh=False):
+    """Discovery report using the default cache file"""
+    return BrowserDiscovery().discover(refresh)
+
+
+def find_geckodriver():
+    """Cached geckodriver path, or the bare name to let PATH decide"""
+    entry, _ = BrowserDiscovery().resolve("geckodriver")
+    return entry["path"] or "geckodriver"
+
+
+def is_ready(report):
+    """Both binaries found and not known to be incompatible"""
+    return bool(report["geckodriver"]["path"] and report["firefox"]["path"]) and report["compatible"] is not False
+
+
+def print_report(report):
+    for tool in ("geckodriver", "firefox"):
+        entry = report[tool]
+        if entry["path"]:
+            print(f"✅ {tool}: {entry['path']} ({entry['version_line'] or 'version unknown'})")
+        else:
+            print(f"❌ {tool}: not found")
+    if report["compatible"] is False:
+        print(f"❌ Incompatible: {report['reason']}")
+    elif report["compatible"] is None:
+        print(f"⚠️  Compatibility unknown: {report['reason']}")
+    source = "cache" if report["cached"] else "probe"
+    print(f"⏱️  Discovery took {report['elapsed_ms']} ms ({source})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Find geckodriver and Firefox and check their versions')
+    parser.add_argument('--refresh', action='store_true', help='Ignore the cache and probe again')
+    parser.add_argument('--json', action='store_true', help='Print the raw report')
+    args = parser.parse_args()
+
+    report = discover(args.refresh)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    return 0 if is_ready(report) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
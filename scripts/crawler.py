@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Bounded site crawler - concurrent, per-host polite, streaming one record per page
+"""
+
+import sys
+import time
+import hashlib
+import argparse
+import threading
+from collections import deque
+from urllib.parse import urljoin, urlparse, urlunparse
+
+from latency_prober import percentile
+from result_sink import JSONLResultSink, write_summary
+from step_scheduler import HostPoliteness
+from target_urls import add_target_arguments, rewrite_url, start_targets
+
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+
+
+def normalize_url(url):
+    """Canonical form for deduplication: lowercase host, no fragment or default port"""
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    return urlunparse((scheme, host, parsed.path or "/", "", parsed.query, ""))
+
+
+class HashedURLSet:
+    """Seen-URL set storing 64-bit digests instead of URL strings
+
+    A collision (two URLs sharing a digest) needs billions of URLs to become
+    likely, so unlike a Bloom filter there are no false positives in practice."""
+
+    def __init__(self):
+        self.digests = set()
+
+    def add(self, url):
+        """Add url; returns True if it was not seen before"""
+        digest = int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'big')
+        if digest in self.digests:
+            return False
+        self.digests.add(digest)
+        return True
+
+    def __len__(self):
+        return len(self.digests)
+
+
+def extract_links(content, base_url, encoding=None):
+    """Absolute http(s) links of a page, via BeautifulSoup as the scraping test parses"""
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, 'html.parser', from_encoding=encoding if isinstance(content, bytes) else None)
+    links = []
+    for anchor in soup.find_all('a', href=True):
+        url = urljoin(base_url, anchor['href'].strip())
+        if urlparse(url).scheme in ("http", "https"):
+            links.append(normalize_url(url))
+    return links
+
+
+class Crawler:
+    """Breadth-first crawl from seeds with depth, page and per-host limits"""
+
+    def __init__(self, seeds, max_depth=2, max_pages=100, workers=8, per_host_concurrency=2,
+                 politeness_interval=0.5, same_host=True, timeout=15, client=None, on_page=None):
+        self.seeds = [normalize_url(url) for url in seeds]
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.workers = workers
+        # Requests in flight per host, and the minimum gap between their starts
+        self.per_host_concurrency = per_host_concurrency
+        self.politeness = HostPoliteness(politeness_interval)
+        # Only follow links to the seeds' hosts
+        self.same_host = same_host
+        self.allowed_hosts = {urlparse(url).netloc for url in self.seeds}
+        self.timeout = timeout
+        self._client = client
+        # Called as on_page(url, result) as soon as each page finishes
+        self.on_page = on_page
+
+        self.seen = HashedURLSet()
+        self.frontier = {}
+        self.active = {}
+        self.in_flight = 0
+        self.started = 0
+        self.results = []
+        self.condition = threading.Condition()
+
+    @property
+    def client(self):
+        if self._client is None:
+            from http_client import PooledHTTPClient
+            self._client = PooledHTTPClient(pool_maxsize=self.per_host_concurrency, timeout=self.timeout)
+        return self._client
+
+    def _enqueue(self, url, depth):
+        """Queue url unless seen or the page budget is already spoken for"""
+        if len(self.seen) >= self.max_pages or not self.seen.add(url):
+            return False
+        self.frontier.setdefault(urlparse(url).netloc, deque()).append((url, depth))
+        return True
+
+    def _take(self):
+        """Next (host, url, depth) allowed by the limits; None once the crawl is done"""
+        with self.condition:
+            while True:
+                if self.started >= self.max_pages:
+                    return None
+                wait = None
+                for host, queue in self.frontier.items():
+                    if not queue or self.active.get(host, 0) >= self.per_host_concurrency:
+                        continue
+                    remaining = self.politeness.remaining([host])
+                    if remaining > 0:
+                        wait = remaining if wait is None else min(wait, remaining)
+                        continue
+                    url, depth = queue.popleft()
+                    self.politeness.mark([host])
+                    self.active[host] = self.active.get(host, 0) + 1
+                    self.in_flight += 1
+                    self.started += 1
+                    return host, url, depth
+                if self.in_flight == 0 and not any(self.frontier.values()):
+                    return None
+                # Woken early when a page finishes and may have queued links
+                self.condition.wait(wait)
+
+    def _fetch(self, url, depth):
+        """Fetch one page; returns (result, links)"""
+        result = {"url": url, "depth": depth}
+        links = []
+        try:
+            # Headers first: only HTML bodies are worth downloading
+            response, elapsed_ms, cold = self.client.get(url, timeout=self.timeout, stream=True)
+            try:
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                is_html = content_type in HTML_TYPES
+                if is_html:
+                    start_time = time.perf_counter()
+                    content = response.content
+                    elapsed_ms += (time.perf_counter() - start_time) * 1000
+                    size = len(content)
+                else:
+                    # PDFs, images and the like: report the advertised size, skip the body
+                    size = int(response.headers.get('Content-Length') or 0)
+                result.update({
+                    "status": "success" if response.status_code < 400 else "error",
+                    "status_code": response.status_code,
+                    "fetch_ms": round(elapsed_ms, 2),
+                    "bytes": size,
+                    "content_type": content_type,
+                    "body_skipped": not is_html,
+                    "connection": "cold" if cold else "warm"
+                })
+                if response.status_code >= 400:
+                    result["error"] = f"HTTP {response.status_code}"
+                elif depth < self.max_depth and is_html:
+                    links = extract_links(content, response.url, response.encoding)
+                    if self.same_host:
+                        links = [link for link in links if urlparse(link).netloc in self.allowed_hosts]
+                    result["links"] = len(links)
+            finally:
+                # Returns a fully read connection to the pool, drops an unread one
+                response.close()
+        except Exception as e:
+            result.update({"status": "error", "error": str(e)})
+        return result, links
+
+    def _worker(self):
+        while True:
+            task = self._take()
+            if task is None:
+                with self.condition:
+                    self.condition.notify_all()
+                return
+            host, url, depth = task
+            result, links = self._fetch(url, depth)
+
+            with self.condition:
+                result["new_links"] = sum(1 for link in links if self._enqueue(link, depth + 1))
+                self.results.append(result)
+                self.active[host] -= 1
+                self.in_flight -= 1
+                self.condition.notify_all()
+            if self.on_page is not None:
+                self.on_page(url, result)
+
+    def run(self):
+        """Crawl until the frontier is empty or max_pages were fetched; returns a report"""
+        with self.condition:
+            for url in self.seeds:
+                self._enqueue(url, 0)
+
+        start_time = time.perf_counter()
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return self.report(time.perf_counter() - start_time)
+
+    def report(self, wall_time, top=10):
+        fetched = [r for r in self.results if "fetch_ms" in r]
+        times = sorted(r["fetch_ms"] for r in fetched)
+        slowest = sorted(fetched, key=lambda r: r["fetch_ms"], reverse=True)[:top]
+        return {
+            "status": "success" if fetched else "error",
+            "pages": len(self.results),
+            "errors": sum(1 for r in self.results if r["status"] != "success"),
+            "bytes": sum(r.get("bytes", 0) for r in self.results),
+            "urls_seen": len(self.seen),
+            "max_depth_reached": max((r["depth"] for r in self.results), default=0),
+            "wall_time_seconds": round(wall_time, 2),
+            "pages_per_minute": round(len(self.results) / wall_time * 60, 2) if wall_time > 0 else None,
+            "p50_fetch_ms": round(percentile(times, 50), 2) if times else None,
+            "p90_fetch_ms": round(percentile(times, 90), 2) if times else None,
+            "slowest": [{"url": r["url"], "fetch_ms": r["fetch_ms"], "bytes": r["bytes"]} for r in slowest]
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Crawl sites from seed URLs and time every page')
+    parser.add_argument('seeds', nargs='+', help='Seed URLs')
+    parser.add_argument('--max-depth', type=int, default=2)
+    parser.add_argument('--max-pages', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--per-host', type=int, default=2, help='Concurrent requests per host')
+    parser.add_argument('--politeness', type=float, default=0.5,
+                       help='Minimum seconds between request starts on one host')
+    parser.add_argument('--any-host', action='store_true', help='Also follow links to other hosts')
+    parser.add_argument('--output', default='crawl_results.jsonl', help='JSON Lines stream of pages')
+    add_target_arguments(parser)
+    args = parser.parse_args()
+
+    target_base_url, _ = start_targets(args.local_targets, args.target_base_url)
+    seeds = [rewrite_url(url, target_base_url) for url in args.seeds]
+
+    sink = JSONLResultSink(args.output, run_info={"seeds": seeds})
+
+    def on_page(url, result):
+        sink.record("crawl", result, key=url)
+        icon = "✅" if result["status"] == "success" else "❌"
+        print(f"{icon} [d{result['depth']}] {url}: {result.get('fetch_ms', '-')} ms, {result.get('bytes', 0)} bytes")
+
+    crawler = Crawler(seeds, args.max_depth, args.max_pages, args.workers, args.per_host,
+                      args.politeness, same_host=not args.any_host, on_page=on_page)
+    report = crawler.run()
+    sink.meta("crawl_report", report)
+    sink.close()
+    write_summary(sink.path, args.output.rsplit('.', 1)[0] + '.json')
+
+    print(f"\n🕷️  {report['pages']} pages ({report['errors']} errors) in {report['wall_time_seconds']}s, "
+          f"p50 {report['p50_fetch_ms']} ms, p90 {report['p90_fetch_ms']} ms")
+    for row in report["slowest"][:5]:
+        print(f"   🐢 {row['fetch_ms']:>8} ms  {row['url']}")
+    return 0 if report["status"] == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
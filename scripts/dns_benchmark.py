@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Concurrent DNS resolution benchmark with an optional in-process TTL cache
+"""
+
+import time
+import socket
+import threading
+
+
+# Captured at import so the benchmark always measures the real resolver,
+# even while DNSCache is installed
+_system_getaddrinfo = socket.getaddrinfo
+
+
+def resolve_all_records(domain):
+    """Resolve every A/AAAA record for domain via getaddrinfo"""
+    records = _system_getaddrinfo(domain, None, socket.AF_UNSPEC, socket.SOCK_STREAM)
+    addresses = {"A": [], "AAAA": []}
+    for family, _, _, _, sockaddr in records:
+        key = "AAAA" if family == socket.AF_INET6 else "A"
+        if sockaddr[0] not in addresses[key]:
+            addresses[key].append(sockaddr[0])
+    return addresses
+
+
+class DNSCache:
+    """TTL cache that stands in for socket.getaddrinfo while installed"""
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        self._installed = False
+
+    def prime(self, domain, addresses):
+        """Store already-resolved addresses (as returned by resolve_all_records)"""
+        with self.lock:
+            self.entries[domain.lower()] = (time.monotonic() + self.ttl, addresses)
+
+    def lookup(self, domain):
+        """Cached addresses for domain, or None when missing/expired"""
+        with self.lock:
+            entry = self.entries.get(domain.lower())
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            self.entries.pop(domain.lower(), None)
+            return None
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Drop-in replacement for socket.getaddrinfo"""
+        cacheable = (
+            isinstance(host, str)
+            and (port is None or str(port).isdigit())
+            and flags == 0
+            and type in (0, socket.SOCK_STREAM)
+            and family in (0, socket.AF_INET, socket.AF_INET6)
+        )
+        if not cacheable:
+            return _system_getaddrinfo(host, port, family, type, proto, flags)
+
+        addresses = self.lookup(host)
+        hit = addresses is not None
+        if not hit:
+            addresses = resolve_all_records(host)
+            self.prime(host, addresses)
+        # Installed process-wide, so every thread opening a socket lands here
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        port = int(port) if port is not None else 0
+        results = []
+        if family in (0, socket.AF_INET6):
+            results += [(socket.AF_INET6, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (ip, port, 0, 0))
+                        for ip in addresses["AAAA"]]
+        if family in (0, socket.AF_INET):
+            results += [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', (ip, port))
+                        for ip in addresses["A"]]
+        if not results:
+            raise socket.gaierror(socket.EAI_NONAME, "No cached address for requested family")
+        # Prefer IPv4 like most mobile networks do
+        if family == 0:
+            results.sort(key=lambda r: r[0] != socket.AF_INET)
+        return results
+
+    def warm(self, domains, workers=16):
+        """Resolve and store domains not cached yet; returns how many were added"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        missing = [domain for domain in domains if self.lookup(domain) is None]
+        if not missing:
+            return 0
+
+        def resolve(domain):
+            try:
+                self.prime(domain, resolve_all_records(domain))
+                return True
+            except OSError:
+                # Left to the HTTP request to fail with the real error
+                return False
+
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(missing)))) as pool:
+            return sum(pool.map(resolve, missing))
+
+    def install(self):
+        """Route every getaddrinfo call in this process through the cache"""
+        if not self._installed:
+            socket.getaddrinfo = self.getaddrinfo
+            self._installed = True
+
+    def uninstall(self):
+        if self._installed:
+            socket.getaddrinfo = _system_getaddrinfo
+            self._installed = False
+
+    def __enter__(self):
+        self.install()
+        return self
+
+    def __exit__(self, *exc):
+        self.uninstall()
+
+    def stats(self):
+        with self.lock:
+            return {
+                "ttl_seconds": self.ttl,
+                "entries": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+class DNSBenchmark:
+    """Resolve many domains concurrently, timing cold and repeated lookups"""
+
+    def __init__(self, workers=16, repeats=3, cache=None):
+        self.workers = workers
+        self.repeats = repeats
+        # Resolved addresses are handed to this cache for the HTTP tests
+        self.cache = cache
+
+    def run(self, domains):
+        """Benchmark every domain; returns a dict keyed by domain"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(domains)))) as pool:
+            results = dict(zip(domains, pool.map(self._benchmark_domain, domains)))
+        wall_time = time.perf_counter() - start_time
+
+        summary = {
+            "domains": len(domains),
+            "resolved": sum(1 for r in results.values() if r["status"] == "success"),
+            "wall_time_ms": round(wall_time * 1000, 2),
+            "workers": self.workers
+        }
+        return results, summary
+
+    def _benchmark_domain(self, domain):
+        try:
+            start_time = time.perf_counter()
+            addresses = resolve_all_records(domain)
+            cold_ms = (time.perf_counter() - start_time) * 1000
+
+            repeat_times = []
+            for _ in range(self.repeats):
+                start_time = time.perf_counter()
+                resolve_all_records(domain)
+                repeat_times.append((time.perf_counter() - start_time) * 1000)
+
+            if self.cache is not None:
+                self.cache.prime(domain, addresses)
+
+            first_ip = (addresses["A"] or addresses["AAAA"] or [None])[0]
+            return {
+                "ip_address": first_ip,
+                "addresses": addresses,
+                "resolve_time_ms": round(cold_ms, 2),
+                "cold_resolve_ms": round(cold_ms, 2),
+                "repeat_resolve_ms": round(sorted(repeat_times)[len(repeat_times) // 2], 2) if repeat_times else None,
+                # Raw repeat lookups for the regression gate
+                "samples_ms": [round(sample, 2) for sample in repeat_times],
+                "status": "success"
+            }
+
+        except Exception as e:
+            return {
+                "status": "error",
+                "error": str(e)
+            }
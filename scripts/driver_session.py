@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Warm WebDriver session manager - keeps one Firefox alive for a whole run
+"""
+
+import atexit
+import time
+from urllib.parse import urlparse
+
+from step_scheduler import wait_until
+
+
+# Clears per-origin storage in the current document
+RESET_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+# Cheap same-origin document to clear an origin's cookies and storage from
+RESET_PATH = "/robots.txt"
+
+
+def origin_of(url):
+    """scheme://host[:port] for http(s) URLs, None for about:, data: and the like"""
+    parsed = urlparse(url or "")
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+class DriverSessionManager:
+    """Hands out one shared driver and resets its state between tests"""
+
+    def __init__(self):
+        self.driver = None
+        self.cold_start_seconds = None
+        self.acquisitions = 0
+        self.reuses = 0
+        self.resets = 0
+        self.reset_seconds = 0.0
+        self.cold_starts = 0
+        # Origins the shared driver has loaded since its last reset
+        self.origins = set()
+        # Run after the driver quits, e.g. removing the profile it ran on
+        self.shutdown_hooks = []
+
+    def acquire(self, factory):
+        """Return the warm driver, starting one with factory() if needed"""
+        self.acquisitions += 1
+
+        if self.driver is not None and self.is_alive():
+            self.reset()
+            self.reuses += 1
+            print(f"♻️  Reusing warm driver (saved ~{self.cold_start_seconds:.1f}s)")
+            return self.driver
+
+        self.driver = None
+        self.origins = set()
+        start_time = time.perf_counter()
+        driver = factory()
+        elapsed = time.perf_counter() - start_time
+
+        if driver is None:
+            return None
+
+        self.driver = driver
+        self.cold_starts += 1
+        # Keep the first measurement - it is the one later acquires avoid
+        if self.cold_start_seconds is None:
+            self.cold_start_seconds = elapsed
+        print(f"🥶 Cold driver start took {elapsed:.2f}s")
+        return driver
+
+    def release(self, driver=None):
+        """Give the driver back without quitting it"""
+        # State is reset lazily on the next acquire so a crashed test
+        # cannot leave its cookies behind for the next one
+        return None
+
+    def is_alive(self):
+        """Check the driver process still answers commands"""
+        try:
+            self.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def visited(self, driver, url):
+        """Note an origin the shared driver loaded, so reset() can clear it"""
+        origin = origin_of(url)
+        if driver is self.driver and origin:
+            self.origins.add(origin)
+
+    def reset(self):
+        """Reset cookies, storage and windows instead of restarting Firefox"""
+        driver = self.driver
+        if driver is None:
+            return
+        start_time = time.perf_counter()
+
+        # Close every window except the first one
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception:
+            pass
+
+        # WebDriver only reaches the current document's cookies and storage,
+        # so visit each origin in turn; the current one needs no navigation
+        try:
+            current = origin_of(driver.current_url)
+        except Exception:
+            current = None
+        origins = sorted(self.origins - {current})
+        for origin in ([current] if current else []) + origins:
+            try:
+                if origin != current:
+                    driver.get(origin + RESET_PATH)
+                    # A "none" session returns from get() before the document changes
+                    wait_until(lambda: driver.execute_script("return location.origin") == origin, timeout=5)
+                driver.delete_all_cookies()
+                driver.execute_script(RESET_STORAGE_SCRIPT)
+            except Exception:
+                pass
+        self.origins = set()
+
+        try:
+            driver.get("about:blank")
+        except Exception:
+            pass
+
+        self.resets += 1
+        self.reset_seconds += time.perf_counter() - start_time
+
+    def on_shutdown(self, callback):
+        """Call callback from shutdown(), once the shared driver has quit"""
+        self.shutdown_hooks.append(callback)
+
+    def shutdown(self):
+        """Quit the shared driver for good"""
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+                print("✅ Shared driver closed")
+            except Exception:
+                print("⚠️  Error closing shared driver")
+            finally:
+                self.driver = None
+        for hook in self.shutdown_hooks:
+            try:
+                hook()
+            except Exception:
+                pass
+
+    def report(self):
+        """Summarise how much startup time reuse saved"""
+        cold_start = self.cold_start_seconds or 0.0
+        saved = cold_start * self.reuses - self.reset_seconds
+        return {
+            "cold_starts": self.cold_starts,
+            "acquisitions": self.acquisitions,
+            "reuses": self.reuses,
+            "resets": self.resets,
+            "cold_start_seconds": round(cold_start, 2),
+            "reset_seconds_total": round(self.reset_seconds, 3),
+            "estimated_seconds_saved": round(max(saved, 0.0), 2)
+        }
+
+
+# One manager per process so every runner shares the same browser
+shared_session = DriverSessionManager()
+atexit.register(shared_session.shutdown)
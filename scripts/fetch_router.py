@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Hybrid fetch router - plain HTTP first, a pooled browser only for pages that need one
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from urllib.parse import urlparse
+
+from driver_session import shared_session
+from latency_prober import percentile
+from readiness import DocumentReady, ElementPresent, navigate
+from target_urls import add_target_arguments, rewrite_url, start_targets
+
+
+NOSCRIPT_PHRASES = (
+    "enable javascript",
+    "javascript is disabled",
+    "javascript is required",
+    "requires javascript",
+    "turn on javascript",
+    "javascript to run this app"
+)
+
+# Elements whose strings are not visible page text
+NON_TEXT_TAGS = ["script", "style", "noscript", "template"]
+
+# Path segments that vary between pages of the same kind
+_VARIABLE_SEGMENT = re.compile(
+    r"^(\d+|[0-9a-f]{8,}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$", re.I
+)
+
+
+class MissingSelector:
+    """The element the caller wants is not in the server-rendered HTML"""
+
+    def __init__(self, selector):
+        self.selector = selector
+        self.name = f"missing_selector({selector})"
+
+    def __call__(self, soup):
+        if soup.select_one(self.selector) is None:
+            return f"{self.selector} not in HTML"
+        return None
+
+
+class NoscriptWall:
+    """A <noscript> block telling the visitor to enable JavaScript"""
+
+    name = "noscript_wall"
+
+    def __init__(self, phrases=NOSCRIPT_PHRASES):
+        self.phrases = tuple(phrase.lower() for phrase in phrases)
+
+    def __call__(self, soup):
+        for block in soup.find_all("noscript"):
+            text = block.get_text(" ", strip=True).lower()
+            if any(phrase in text for phrase in self.phrases):
+                return "noscript wall"
+        return None
+
+
+class ScriptOnlyBody:
+    """Scripts but almost no text: an app shell rendered client-side"""
+
+    name = "script_only_body"
+
+    def __init__(self, min_text_chars=200):
+        self.min_text_chars = min_text_chars
+
+    def __call__(self, soup):
+        body = soup.body
+        if body is None:
+            return None
+        scripts = len(soup.find_all("script"))
+        if not scripts:
+            return None
+        from bs4 import Comment
+        # Read-only: the same tree is shared with the other heuristics
+        text = " ".join(string.strip() for string in body.find_all(string=True)
+                        if string.strip() and not isinstance(string, Comment)
+                        and string.find_parent(NON_TEXT_TAGS) is None)
+        text_chars = len(text)
+        if text_chars < self.min_text_chars:
+            return f"script-only body ({text_chars} chars of text, {scripts} scripts)"
+        return None
+
+
+DEFAULT_HEURISTICS = (NoscriptWall(), ScriptOnlyBody())
+
+
+def url_pattern(url):
+    """Host plus path with ids, hashes and UUIDs wildcarded; the decision cache key"""
+    parsed = urlparse(url)
+    segments = ["*" if _VARIABLE_SEGMENT.match(segment) else segment
+                for segment in parsed.path.split("/")]
+    return f"{parsed.netloc}{'/'.join(segments) or '/'}"
+
+
+class FetchRouter:
+    """Fetch pages over HTTP and fall back to the shared browser when heuristics say so"""
+
+    def __init__(self, driver_factory=None, heuristics=DEFAULT_HEURISTICS, client=None,
+                 ready=None, cache_file=None, browser_estimate_ms=None, timeout=15, driver=None):
+        # Starts a driver if the shared session has none; None means HTTP only
+        self.driver_factory = driver_factory
+        self.heuristics = list(heuristics)
+        self._client = client
+        self.ready = ready or DocumentReady("complete")
+        # Optional JSON file so decisions survive between runs
+        self.cache_file = cache_file
+        self.decisions = self._load()
+        # Assumed browser cost for savings until a browser load is measured
+        self.browser_estimate_ms = browser_estimate_ms
+        self.timeout = timeout
+        # A caller's running driver is borrowed: used as is, never released here
+        self.driver = driver
+        self.borrowed = driver is not None
+        self.pages = []
+
+    @property
+    def client(self):
+        if self._client is None:
+            from http_client import PooledHTTPClient
+            self._client = PooledHTTPClient(timeout=self.timeout)
+        return self._client
+
+    def _load(self):
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        if not self.cache_file:
+            return
+        tmp = self.cache_file + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.decisions, f, indent=2)
+        os.replace(tmp, self.cache_file)
+
+    def needs_browser(self, content, selector=None):
+        """First heuristic that fires for an HTML body, or None"""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(content, 'html.parser')
+        checks = self.heuristics + ([MissingSelector(selector)] if selector else [])
+        for check in checks:
+            reason = check(soup)
+            if reason:
+                return reason
+        return None
+
+    def _http(self, url, selector):
+        """(page, reason, text); reason says why a browser is needed, None if not"""
+        response, elapsed_ms, _ = self.client.get(url, timeout=self.timeout)
+        page = {
+            "http_ms": round(elapsed_ms, 2),
+            "status_code": response.status_code,
+            "bytes": len(response.content)
+        }
+        if response.status_code >= 400:
+            # Blocked or failing over HTTP; the browser may still get through
+            return page, f"HTTP {response.status_code}", response.text
+        content_type = response.headers.get('Content-Type', '')
+        if 'html' not in content_type:
+            # JSON, images and the like never need rendering
+            return page, None, response.text
+        start_time = time.perf_counter()
+        reason = self.needs_browser(response.content, selector)
+        page["heuristics_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+        return page, reason, response.text
+
+    def _browser(self, url, selector):
+        if self.driver is None:
+            if self.driver_factory is None:
+                raise RuntimeError("page needs a browser but no driver factory was given")
+            self.driver = shared_session.acquire(self.driver_factory)
+            if self.driver is None:
+                raise RuntimeError("browser failed to start")
+        ready = ElementPresent("css selector", selector) if selector else self.ready
+        start_time = time.perf_counter()
+        navigate(self.driver, url, ready, self.timeout)
+        content = self.driver.page_source
+        return round((time.perf_counter() - start_time) * 1000, 2), content
+
+    def fetch(self, url, selector=None):
+        """Fetch one URL by the cheapest route that works; returns (result, content)"""
+        pattern = url_pattern(url)
+        cached = self.decisions.get(pattern)
+        result = {"url": url, "pattern": pattern, "cached_decision": cached is not None}
+        content = None
+        start_time = time.perf_counter()
+
+        try:
+            reason = cached["reason"] if cached and cached["route"] == "browser" else None
+            if reason is None:
+                page, reason, content = self._http(url, selector)
+                result.update(page)
+            if reason is None:
+                result["route"] = "http"
+            else:
+                # Known browser patterns skip the HTTP attempt entirely
+                result["browser_ms"], content = self._browser(url, selector)
+                result["route"] = "browser"
+                result["reason"] = reason
+            # An HTTP error says nothing lasting about the pattern
+            if result.get("status_code", 200) < 400:
+                self.decisions[pattern] = {"route": result["route"], "reason": result.get("reason")}
+            result["status"] = "success"
+        except Exception as e:
+            result.update({"status": "error", "error": str(e)})
+
+        result["total_ms"] = round((time.perf_counter() - start_time) * 1000, 2)
+        self.pages.append(result)
+        return result, content
+
+    def report(self):
+        """Share of pages served without a browser and the time that saved"""
+        served = [page for page in self.pages if page["status"] == "success"]
+        http_pages = [page for page in served if page["route"] == "http"]
+        browser_pages = [page for page in served if page["route"] == "browser"]
+
+        browser_times = sorted(page["browser_ms"] for page in browser_pages)
+        estimate = percentile(browser_times, 50) if browser_times else self.browser_estimate_ms
+        # HTTP attempts that ended in a fallback are the price of routing
+        wasted_ms = sum(page.get("http_ms", 0) + page.get("heuristics_ms", 0) for page in browser_pages)
+        saved_ms = None
+        if estimate is not None:
+            saved_ms = sum(estimate - page["total_ms"] for page in http_pages) - wasted_ms
+
+        reasons = {}
+        for page in browser_pages:
+            reasons[page["reason"]] = reasons.get(page["reason"], 0) + 1
+        return {
+            "status": "success" if served else "error",
+            "pages": len(self.pages),
+            "http_pages": len(http_pages),
+            "browser_pages": len(browser_pages),
+            "errors": len(self.pages) - len(served),
+            "no_browser_share": round(len(http_pages) / len(served), 3) if served else None,
+            "browser_estimate_ms": round(estimate, 2) if estimate is not None else None,
+            "wasted_http_ms": round(wasted_ms, 2),
+            "time_saved_ms": round(saved_ms, 2) if saved_ms is not None else None,
+            "cached_decisions": sum(1 for page in self.pages if page["cached_decision"]),
+            "patterns": len(self.decisions),
+            "browser_reasons": reasons
+        }
+
+    def close(self):
+        """Hand the browser back to the shared session and persist decisions"""
+        if self.driver is not None and not self.borrowed:
+            shared_session.release(self.driver)
+            self.driver = None
+        self.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch URLs over HTTP, using a browser only when needed')
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--selector', help='CSS selector the page must contain')
+    parser.add_argument('--min-text-chars', type=int, default=200,
+                       help='Bodies with scripts and less text than this need a browser')
+    parser.add_argument('--cache-file', help='Persist routing decisions per URL pattern here')
+    parser.add_argument('--no-browser', action='store_true', help='Report decisions without starting a browser')
+    add_target_arguments(parser)
+    args = parser.parse_args()
+
+    target_base_url, _ = start_targets(args.local_targets, args.target_base_url)
+    driver_factory = None
+    if not args.no_browser:
+        from selenium_ci import GitHubSeleniumRunner
+        driver_factory = GitHubSeleniumRunner(headless=True).create_driver
+
+    router = FetchRouter(driver_factory, heuristics=(NoscriptWall(), ScriptOnlyBody(args.min_text_chars)),
+                         cache_file=args.cache_file)
+    try:
+        for url in args.urls:
+            result, _ = router.fetch(rewrite_url(url, target_base_url), args.selector)
+            if result["status"] == "success":
+                detail = f" ({result['reason']})" if result["route"] == "browser" else ""
+                print(f"✅ {result['url']}: {result['route']}{detail} in {result['total_ms']} ms")
+            else:
+                print(f"❌ {result['url']}: {result['error']}")
+    finally:
+        router.close()
+
+    report = router.report()
+    print(json.dumps(report, indent=2))
+    return 0 if report["status"] == "success" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Pluggable HTML field extraction - early-exit streaming parser, BeautifulSoup or lxml
+"""
+
+import sys
+import time
+import codecs
+import argparse
+import tracemalloc
+from html.parser import HTMLParser
+
+
+DEFAULT_FIELDS = ("title",)
+SUPPORTED_FIELDS = ("title", "h1", "description")
+
+# Remaining body we are willing to read just to keep the connection warm
+DRAIN_LIMIT_BYTES = 64 * 1024
+
+
+class _FieldsFound(Exception):
+    """Raised from inside the parser once every requested field is known"""
+
+
+class _EarlyExitParser(HTMLParser):
+    def __init__(self, fields):
+        super().__init__(convert_charrefs=True)
+        self.wanted = set(fields)
+        self.found = {}
+        self.capturing = None
+        self.buffer = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("title", "h1") and tag in self.wanted and tag not in self.found:
+            self.capturing = tag
+            self.buffer = []
+        elif tag == "meta" and "description" in self.wanted and "description" not in self.found:
+            attrs = dict(attrs)
+            if (attrs.get("name") or "").lower() == "description":
+                self._store("description", attrs.get("content") or "")
+        elif tag == "body" and "description" in self.wanted and "description" not in self.found:
+            # Meta tags only live in <head>
+            self._store("description", None)
+
+    def handle_endtag(self, tag):
+        if tag == self.capturing:
+            self.capturing = None
+            self._store(tag, "".join(self.buffer).strip())
+
+    def handle_data(self, data):
+        if self.capturing:
+            self.buffer.append(data)
+
+    def _store(self, field, value):
+        self.found[field] = value
+        if self.wanted.issubset(self.found):
+            raise _FieldsFound()
+
+
+class StreamingExtractor:
+    """Incremental parser that stops reading as soon as the fields are found"""
+
+    name = "streaming"
+
+    def __init__(self, fields=DEFAULT_FIELDS, chunk_size=8192):
+        self.fields = tuple(fields)
+        self.chunk_size = chunk_size
+
+    def extract_chunks(self, chunks, encoding="utf-8"):
+        """Feed byte chunks; returns (fields, bytes_read, complete)"""
+        parser = _EarlyExitParser(self.fields)
+        decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        bytes_read = 0
+        try:
+            for chunk in chunks:
+                bytes_read += len(chunk)
+                parser.feed(decoder.decode(chunk))
+            parser.feed(decoder.decode(b"", final=True))
+            parser.close()
+            complete = False
+        except _FieldsFound:
+            complete = True
+        return self._result(parser.found), bytes_read, complete
+
+    def extract(self, content, encoding="utf-8"):
+        chunks = (content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size))
+        return self.extract_chunks(chunks, encoding)[0]
+
+    def _result(self, found):
+        return {field: found.get(field) for field in self.fields}
+
+
+class SoupExtractor:
+    """Full BeautifulSoup html.parser parse (the original behaviour)"""
+
+    name = "soup"
+
+    def __init__(self, fields=DEFAULT_FIELDS):
+        self.fields = tuple(fields)
+
+    def extract(self, content, encoding="utf-8"):
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(content, 'html.parser')
+        found = {}
+        if "title" in self.fields:
+            found["title"] = soup.title.string if soup.title else None
+        if "h1" in self.fields:
+            found["h1"] = soup.h1.get_text(strip=True) if soup.h1 else None
+        if "description" in self.fields:
+            meta = soup.find("meta", attrs={"name": "description"})
+            found["description"] = meta.get("content") if meta else None
+        return {field: found.get(field) for field in self.fields}
+
+
+class LxmlExtractor:
+    """Full parse with lxml (optional dependency, much faster than html.parser)"""
+
+    name = "lxml"
+
+    def __init__(self, fields=DEFAULT_FIELDS):
+        try:
+            import lxml.html  # noqa: F401
+        except ImportError:
+            raise ImportError("lxml is not installed - run: pip install lxml")
+        self.fields = tuple(fields)
+
+    def extract(self, content, encoding="utf-8"):
+        import lxml.html
+        tree = lxml.html.fromstring(content)
+        found = {}
+        if "title" in self.fields:
+            titles = tree.xpath("//title/text()")
+            found["title"] = titles[0].strip() if titles else None
+        if "h1" in self.fields:
+            headings = tree.xpath("//h1")
+            found["h1"] = headings[0].text_content().strip() if headings else None
+        if "description" in self.fields:
+            contents = tree.xpath("//meta[@name='description']/@content")
+            found["description"] = contents[0] if contents else None
+        return {field: found.get(field) for field in self.fields}
+
+
+ENGINES = {
+    "streaming": StreamingExtractor,
+    "soup": SoupExtractor,
+    "lxml": LxmlExtractor
+}
+
+
+def get_extractor(name="streaming", fields=DEFAULT_FIELDS):
+    """Build an extraction engine by name"""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown extraction engine '{name}' (choose from {', '.join(ENGINES)})")
+    return ENGINES[name](fields=fields)
+
+
+def extract_from_response(response, extractor):
+    """Extract fields from a requests response opened with stream=True
+
+    Returns (fields, bytes_read). The streaming engine stops downloading once
+    the fields are found; the full parsers read the whole body."""
+    if not isinstance(extractor, StreamingExtractor):
+        content = response.content
+        return extractor.extract(content, response.encoding), len(content)
+
+    chunks = response.iter_content(chunk_size=extractor.chunk_size)
+    fields, bytes_read, complete = extractor.extract_chunks(chunks, response.encoding)
+
+    if complete:
+        # Small leftovers are cheaper to drain than a new TCP/TLS handshake
+        remaining = _wire_bytes_remaining(response)
+        if remaining is not None and remaining <= DRAIN_LIMIT_BYTES:
+            for chunk in chunks:
+                bytes_read += len(chunk)
+        else:
+            response.close()
+    return fields, bytes_read
+
+
+def _wire_bytes_remaining(response):
+    """Body bytes still on the wire, None when unknown
+
+    Content-Length is the encoded size, so it is compared with what urllib3
+    pulled off the socket rather than the decoded chunks we counted."""
+    length = response.headers.get('Content-Length')
+    if not length:
+        return None
+    try:
+        return int(length) - response.raw.tell()
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def synthetic_page(size):
+    """HTML page of roughly size bytes with the title near the top"""
+    head = "<!DOCTYPE html><html><head><title>Benchmark page</title>" \
+           '<meta name="description" content="synthetic"></head><body><h1>Heading</h1>'
+    paragraph = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4 + "</p>\n"
+    body = paragraph * max((size - len(head)) // len(paragraph), 1)
+    return (head + body + "</body></html>").encode("utf-8")
+
+
+def benchmark_engines(sizes, engines, fields=DEFAULT_FIELDS, repeats=5):
+    """Parse time (best of N) and peak traced memory per engine and page size"""
+    results = {}
+    for size in sizes:
+        page = synthetic_page(size)
+        results[size] = {}
+        for name in engines:
+            try:
+                extractor = get_extractor(name, fields)
+            except ImportError as e:
+                results[size][name] = {"status": "skipped", "reason": str(e)}
+                continue
+
+            best = None
+            for _ in range(repeats):
+                start_time = time.perf_counter()
+                extractor.extract(page)
+                elapsed = time.perf_counter() - start_time
+                best = elapsed if best is None else min(best, elapsed)
+
+            tracemalloc.start()
+            extractor.extract(page)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            results[size][name] = {
+                "status": "success",
+                "parse_ms": round(best * 1000, 3),
+                "peak_kib": round(peak / 1024, 1)
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTML extraction micro-benchmark')
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                       help='Comma-separated page sizes in bytes')
+    parser.add_argument('--engines', default=','.join(ENGINES),
+                       help='Comma-separated engines to compare')
+    parser.add_argument('--fields', default=','.join(DEFAULT_FIELDS),
+                       help=f"Fields to extract ({', '.join(SUPPORTED_FIELDS)})")
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    engines = args.engines.split(',')
+    results = benchmark_engines(sizes, engines, args.fields.split(','), args.repeats)
+
+    print("🧪 HTML Extraction Benchmark")
+    print("=" * 60)
+    print(f"{'size':>10} {'engine':>10} {'parse ms':>12} {'peak KiB':>12}")
+    for size, by_engine in results.items():
+        for name, result in by_engine.items():
+            if result["status"] == "success":
+                print(f"{size:>10} {name:>10} {result['parse_ms']:>12} {result['peak_kib']:>12}")
+            else:
+                print(f"{size:>10} {name:>10} {'skipped':>12}  {result['reason']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Connection-pooled HTTP client shared by the requests-based tests
+"""
+
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Linux; Android 10; Termux) AppleWebKit/537.36'
+
+# Sockets opened by the current thread - the pool connects in the caller's thread
+_connects = threading.local()
+
+
+def _count_connect():
+    _connects.count = getattr(_connects, 'count', 0) + 1
+
+
+def _connect_count():
+    return getattr(_connects, 'count', 0)
+
+
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        _count_connect()
+        super().connect()
+
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        _count_connect()
+        super().connect()
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+
+class PooledHTTPClient:
+    """Keep-alive requests.Session that tags each request as cold or warm"""
+
+    def __init__(self, pool_maxsize=10, pool_connections=10,
+                 user_agent=DEFAULT_USER_AGENT, timeout=30):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+
+        # pool_maxsize is the number of kept-alive connections per host
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        adapter.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool
+        }
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.cold_requests = 0
+        self.warm_requests = 0
+
+    def request(self, method, url, **kwargs):
+        """Send a request; returns (response, elapsed_ms, cold)"""
+        kwargs.setdefault('timeout', self.timeout)
+
+        connects_before = _connect_count()
+        start_time = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+
+        # A new socket means we paid for TCP (and TLS) setup
+        cold = _connect_count() > connects_before
+        if cold:
+            self.cold_requests += 1
+        else:
+            self.warm_requests += 1
+
+        return response, elapsed_ms, cold
+
+    def get(self, url, **kwargs):
+        """GET through the pool; returns (response, elapsed_ms, cold)"""
+        return self.request('GET', url, **kwargs)
+
+    def stats(self):
+        """Cold/warm request counts"""
+        return {
+            "cold_requests": self.cold_requests,
+            "warm_requests": self.warm_requests
+        }
+
+    def close(self):
+        """Close every pooled connection"""
+        self.session.close()
+
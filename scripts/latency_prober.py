@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Asyncio latency prober - samples many sites at once over keep-alive HTTP
+"""
+
+import ssl
+import time
+import asyncio
+from urllib.parse import urlparse
+
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Linux; Android 10; Termux) AppleWebKit/537.36'
+
+
+def percentile(sorted_values, pct):
+    """Linear-interpolated percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (len(sorted_values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize_samples(samples_ms):
+    """min/p50/p90/p99/max of a list of millisecond samples"""
+    ordered = sorted(samples_ms)
+    summary = {
+        "min_ms": ordered[0] if ordered else None,
+        "p50_ms": percentile(ordered, 50),
+        "p90_ms": percentile(ordered, 90),
+        "p99_ms": percentile(ordered, 99),
+        "max_ms": ordered[-1] if ordered else None
+    }
+    return {key: round(value, 2) if value is not None else None for key, value in summary.items()}
+
+
+class AsyncLatencyProber:
+    """Probe sites concurrently with back-to-back HEAD requests"""
+
+    def __init__(self, samples=20, warmup=2, timeout=10, concurrency=16,
+                 interval=0.0, user_agent=DEFAULT_USER_AGENT):
+        self.samples = samples
+        self.warmup = warmup
+        self.timeout = timeout
+        self.concurrency = concurrency
+        # Optional pause between samples; 0 means send as fast as replies come
+        self.interval = interval
+        self.user_agent = user_agent
+
+    def run(self, urls):
+        """Probe every URL; returns a dict keyed by URL"""
+        return asyncio.run(self.probe_all(urls))
+
+    async def probe_all(self, urls):
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url):
+            async with semaphore:
+                return url, await self.probe_site(url)
+
+        results = await asyncio.gather(*(bounded(url) for url in urls))
+        return dict(results)
+
+    async def probe_site(self, url):
+        """Take warmup + samples measurements for one site"""
+        parsed = urlparse(url)
+        host = parsed.hostname
+        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        path = parsed.path or '/'
+        if parsed.query:
+            path += '?' + parsed.query
+        request = (
+            f"HEAD {path} HTTP/1.1\r\n"
+            f"Host: {parsed.netloc}\r\n"
+            f"User-Agent: {self.user_agent}\r\n"
+            "Accept: */*\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode('ascii')
+
+        reader = writer = None
+        connect_samples = []
+        samples = []
+        cold_ms = None
+        status_code = None
+
+        try:
+            for i in range(self.warmup + self.samples):
+                request_start = time.perf_counter_ns()
+
+                if writer is None:
+                    reader, writer = await asyncio.wait_for(
+                        self._connect(parsed.scheme, host, port), self.timeout
+                    )
+                    connect_samples.append((time.perf_counter_ns() - request_start) / 1e6)
+
+                sample_start = time.perf_counter_ns()
+                writer.write(request)
+                await writer.drain()
+                status_code, keep_alive = await asyncio.wait_for(
+                    self._read_head(reader), self.timeout
+                )
+                end = time.perf_counter_ns()
+
+                if cold_ms is None:
+                    # First request pays for DNS, TCP and TLS
+                    cold_ms = (end - request_start) / 1e6
+                if i >= self.warmup:
+                    samples.append((end - sample_start) / 1e6)
+
+                if not keep_alive:
+                    writer.close()
+                    reader = writer = None
+
+                if self.interval:
+                    await asyncio.sleep(self.interval)
+
+        except Exception as e:
+            return {
+                "latency_ms": None,
+                "status": "error",
+                "error": str(e) or type(e).__name__
+            }
+        finally:
+            if writer is not None:
+                writer.close()
+
+        summary = summarize_samples(samples)
+        result = {
+            "latency_ms": summary["p50_ms"],
+            "status_code": status_code,
+            "status": "success",
+            "cold_latency_ms": round(cold_ms, 2),
+            "warm_latency_ms": summary["p50_ms"],
+            "connect_ms": round(connect_samples[0], 2),
+            "reconnects": len(connect_samples) - 1,
+            "samples": len(samples),
+            "warmup_discarded": self.warmup,
+            # Raw warm samples for the regression gate
+            "samples_ms": [round(sample, 2) for sample in samples]
+        }
+        result.update(summary)
+        return result
+
+    async def _connect(self, scheme, host, port):
+        ssl_context = ssl.create_default_context() if scheme == 'https' else None
+        return await asyncio.open_connection(host, port, ssl=ssl_context)
+
+    async def _read_head(self, reader):
+        """Read a response head; returns (status_code, keep_alive)"""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by server")
+
+        parts = status_line.decode('latin-1').split()
+        version, status_code = parts[0], int(parts[1])
+        keep_alive = version == 'HTTP/1.1'
+
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            if name.strip().lower() == 'connection':
+                keep_alive = value.strip().lower() != 'close'
+
+        return status_code, keep_alive
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Lean browser profile - Firefox preferences that skip resources our checks never look at
+"""
+
+from urllib.parse import quote
+
+from navigation_timing import collect_transfer_bytes
+from page_load_benchmark import measure_page_load
+
+
+# Preferences per resource type we can switch off
+RESOURCE_PREFERENCES = {
+    "images": {
+        # 2 = block all images
+        "permissions.default.image": 2,
+        "image.animation_mode": "none"
+    },
+    "fonts": {
+        "gfx.downloadable_fonts.enabled": False,
+        "browser.display.use_document_fonts": 0
+    },
+    "media": {
+        # 5 = block audible and inaudible autoplay
+        "media.autoplay.default": 5,
+        "media.autoplay.blocking_policy": 2,
+        "media.preload.default": 0,
+        "media.preload.auto": 0
+    },
+    "prefetch": {
+        "network.prefetch-next": False,
+        "network.dns.disablePrefetch": True,
+        "network.http.speculative-parallel-limit": 0
+    }
+}
+
+DEFAULT_BLOCK = ("images", "fonts", "media", "prefetch")
+
+# Third-party hosts (shell patterns) that only add weight to our pages
+DEFAULT_BLOCKLIST = (
+    "*.google-analytics.com",
+    "*.googletagmanager.com",
+    "*.doubleclick.net",
+    "*.googlesyndication.com",
+    "*.facebook.net",
+    "*.hotjar.com"
+)
+
+# Discard port on loopback: blocked requests fail immediately
+BLACKHOLE_PROXY = "PROXY 127.0.0.1:9"
+
+
+def blocklist_pac(patterns):
+    """Proxy auto-config script sending blocked hosts to a dead proxy"""
+    checks = " || ".join(f'shExpMatch(host, "{pattern}")' for pattern in patterns)
+    return (
+        "function FindProxyForURL(url, host) {"
+        f" if ({checks}) return \"{BLACKHOLE_PROXY}\";"
+        " return \"DIRECT\"; }"
+    )
+
+
+class LeanProfile:
+    """Preference set that blocks selected resource types and hosts"""
+
+    def __init__(self, block=DEFAULT_BLOCK, blocklist=DEFAULT_BLOCKLIST):
+        unknown = set(block) - set(RESOURCE_PREFERENCES)
+        if unknown:
+            raise ValueError(f"Unknown resource types: {', '.join(sorted(unknown))}")
+        self.block = tuple(block)
+        self.blocklist = tuple(blocklist)
+
+    def preferences(self):
+        """Firefox preferences for this profile"""
+        prefs = {}
+        for resource in self.block:
+            prefs.update(RESOURCE_PREFERENCES[resource])
+        if self.blocklist:
+            # 2 = proxy auto-config; a data: URL keeps it self-contained
+            prefs["network.proxy.type"] = 2
+            prefs["network.proxy.autoconfig_url"] = (
+                "data:application/x-ns-proxy-autoconfig," + quote(blocklist_pac(self.blocklist))
+            )
+            # Otherwise Firefox retries a failed proxy directly and the block is lost
+            prefs["network.proxy.failover_direct"] = False
+        return prefs
+
+    def apply(self, options):
+        """Set the preferences on a selenium Firefox Options object"""
+        for name, value in self.preferences().items():
+            options.set_preference(name, value)
+        return options
+
+    def to_dict(self):
+        return {"block": list(self.block), "blocklist": list(self.blocklist)}
+
+
+def _load(driver, url, timeout):
+    result = measure_page_load(driver, url, timeout)
+    if result["status"] == "success":
+        result["transfer_bytes"] = collect_transfer_bytes(driver)
+    return result
+
+
+def compare_profiles(full_driver, lean_driver, urls, timeout=15):
+    """Load each URL with both drivers; returns (per-URL results, totals)"""
+    comparison = {}
+    totals = {"full_seconds": 0, "lean_seconds": 0, "full_bytes": 0, "lean_bytes": 0, "pages": 0}
+
+    for index, url in enumerate(urls):
+        # Alternate which profile loads first so neither always gets the
+        # warm DNS/server caches left by the other
+        if index % 2 == 0:
+            full = _load(full_driver, url, timeout)
+            lean = _load(lean_driver, url, timeout)
+        else:
+            lean = _load(lean_driver, url, timeout)
+            full = _load(full_driver, url, timeout)
+        entry = {"full": full, "lean": lean, "first": "full" if index % 2 == 0 else "lean"}
+
+        if full["status"] == "success" and lean["status"] == "success":
+            entry["status"] = "success"
+            entry["seconds_saved"] = round(full["load_time_seconds"] - lean["load_time_seconds"], 2)
+            if full["transfer_bytes"] is not None and lean["transfer_bytes"] is not None:
+                entry["bytes_saved"] = full["transfer_bytes"] - lean["transfer_bytes"]
+                totals["full_bytes"] += full["transfer_bytes"]
+                totals["lean_bytes"] += lean["transfer_bytes"]
+            totals["full_seconds"] += full["load_time_seconds"]
+            totals["lean_seconds"] += lean["load_time_seconds"]
+            totals["pages"] += 1
+        else:
+            entry["status"] = "error"
+            entry["error"] = full.get("error") or lean.get("error")
+
+        comparison[url] = entry
+
+    totals["seconds_saved"] = round(totals["full_seconds"] - totals["lean_seconds"], 2)
+    totals["bytes_saved"] = totals["full_bytes"] - totals["lean_bytes"]
+    totals["full_seconds"] = round(totals["full_seconds"], 2)
+    totals["lean_seconds"] = round(totals["lean_seconds"], 2)
+    return comparison, totals
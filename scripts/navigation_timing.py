@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Navigation Timing helpers - where a Selenium page load actually spends its time
+"""
+
+
+# Level 2 entry when available, legacy performance.timing otherwise.
+# Everything is returned relative to the navigation start in ms.
+NAVIGATION_TIMING_SCRIPT = """
+var entries = performance.getEntriesByType ? performance.getEntriesByType('navigation') : [];
+if (entries.length) { return entries[0].toJSON(); }
+var t = performance.timing, s = t.navigationStart, out = {startTime: 0};
+['redirectStart', 'redirectEnd', 'fetchStart', 'domainLookupStart', 'domainLookupEnd',
+ 'connectStart', 'connectEnd', 'secureConnectionStart', 'requestStart', 'responseStart',
+ 'responseEnd', 'domInteractive', 'domContentLoadedEventEnd', 'loadEventEnd'].forEach(function (k) {
+    out[k] = t[k] ? t[k] - s : 0;
+});
+return out;
+"""
+
+
+def _span(entry, start, end):
+    """Duration between two entry fields, None if either is missing"""
+    start_value = entry.get(start) or 0
+    end_value = entry.get(end) or 0
+    if not start_value and start != 'startTime':
+        return None
+    if not end_value:
+        return None
+    return round(max(end_value - start_value, 0), 2)
+
+
+def navigation_breakdown(entry):
+    """Turn a raw navigation entry into per-phase milliseconds"""
+    if not entry:
+        return None
+
+    tls_ms = None
+    if entry.get('secureConnectionStart'):
+        tls_ms = _span(entry, 'secureConnectionStart', 'connectEnd')
+    tcp_end = 'secureConnectionStart' if tls_ms is not None else 'connectEnd'
+
+    return {
+        "redirect_ms": _span(entry, 'redirectStart', 'redirectEnd') or 0,
+        "dns_ms": _span(entry, 'domainLookupStart', 'domainLookupEnd'),
+        "connect_ms": _span(entry, 'connectStart', tcp_end),
+        "tls_ms": tls_ms,
+        "ttfb_ms": _span(entry, 'requestStart', 'responseStart'),
+        "response_ms": _span(entry, 'responseStart', 'responseEnd'),
+        "dom_content_loaded_ms": _span(entry, 'startTime', 'domContentLoadedEventEnd'),
+        "load_ms": _span(entry, 'startTime', 'loadEventEnd'),
+        "transfer_size": entry.get('transferSize')
+    }
+
+
+def collect_navigation_timing(driver):
+    """Read the current page's navigation timing from the browser"""
+    try:
+        return navigation_breakdown(driver.execute_script(NAVIGATION_TIMING_SCRIPT))
+    except Exception:
+        return None
+
+
+# Bytes over the wire for the document and every subresource
+TRANSFER_SIZE_SCRIPT = """
+return performance.getEntries().reduce(function (total, entry) {
+    return total + (entry.transferSize || 0);
+}, 0);
+"""
+
+
+def collect_transfer_bytes(driver):
+    """Total transferSize of the current page and its resources"""
+    try:
+        return int(driver.execute_script(TRANSFER_SIZE_SCRIPT))
+    except Exception:
+        return None
@@ -4,64 +4,113 @@ Network testing module for Termux - No browser required
 """
 
 import os
-import time
 import json
-import requests
+import time
+import argparse
 from datetime import datetime
-from bs4 import BeautifulSoup
+
+# requests, bs4 and asyncio are imported by the tests that use them
+from dns_benchmark import DNSBenchmark, DNSCache
+from html_extract import ENGINES, extract_from_response, get_extractor
+from result_sink import JSONLResultSink, write_summary
+from step_scheduler import StepScheduler, hosts_of
+from target_urls import add_target_arguments, rewrite_url, start_targets
 
 class TermuxNetworkTester:
-    def __init__(self):
+    SCRAPING_URLS = [
+        "https://httpbin.org/html",
+        "https://httpbin.org/json",
+        "https://example.com"
+    ]
+    LATENCY_SITES = [
+        "https://www.google.com",
+        "https://www.github.com",
+        "https://httpbin.org"
+    ]
+    DNS_DOMAINS = ["google.com", "github.com", "example.com"]
+    
+    def __init__(self, pool_maxsize=10, dns_cache_ttl=None, target_base_url=None,
+                 extract_engine="streaming", speed_base_url=None, speed_streams=4, speed_duration=8.0,
+                 crawl_seeds=None, crawl_depth=2, crawl_max_pages=50):
+        # Rewrite live URLs to a local target server when set
+        self.target_base_url = target_base_url
+        # Throughput benchmark server (any host running target_server.py)
+        self.speed_base_url = speed_base_url
+        self.speed_streams = speed_streams
+        self.speed_duration = speed_duration
+        # Crawl mode runs only when seed URLs are given
+        self.crawl_seeds = crawl_seeds or []
+        self.crawl_depth = crawl_depth
+        self.crawl_max_pages = crawl_max_pages
+        # One keep-alive session for every request-based test
+        self.pool_maxsize = pool_maxsize
+        self._http = None
+        # Optional in-process DNS cache shared by the HTTP tests
+        self.dns_cache = DNSCache(ttl=dns_cache_ttl) if dns_cache_ttl else None
+        # Stops reading once <title> is found unless a full parser is chosen
+        self.extractor = get_extractor(extract_engine)
+        self.stream_file = "network_test_results.jsonl"
+        self.sink = None
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "environment": "Termux",
             "tests": {}
         }
     
+    @property
+    def http(self):
+        """Pooled HTTP client, created (and requests imported) on first use"""
+        if self._http is None:
+            from http_client import PooledHTTPClient
+            self._http = PooledHTTPClient(pool_maxsize=self.pool_maxsize)
+        return self._http
+    
     def test_requests_scraping(self):
-        """Test web scraping using requests + BeautifulSoup"""
+        """Test web scraping using requests + an HTML extraction engine"""
         print("\n🕸️ Testing Requests-based Scraping...")
         
-        test_urls = [
-            "https://httpbin.org/html",
-            "https://httpbin.org/json",
-            "https://example.com"
-        ]
+        test_urls = self.targets(self.SCRAPING_URLS)
         
         scraping_results = {}
         
         for url in test_urls:
             try:
-                start_time = time.time()
-                
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Linux; Android 10; Termux) AppleWebKit/537.36'
-                }
-                
-                response = requests.get(url, headers=headers, timeout=30)
-                load_time = time.time() - start_time
-                
-                # Parse with BeautifulSoup for HTML
                 if 'html' in url:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    title = soup.title.string if soup.title else "No title"
+                    # Stream the body so the parser can stop at the fields it needs
+                    response, elapsed_ms, cold = self.http.get(url, timeout=30, stream=True)
+                    parse_start = time.perf_counter()
+                    fields, bytes_read = extract_from_response(response, self.extractor)
+                    parse_ms = (time.perf_counter() - parse_start) * 1000
+                    # Wire size from the header; without it the size is unknown,
+                    # since the streaming engine may stop before the end
+                    content_length = response.headers.get('Content-Length')
+                    load_time = (elapsed_ms + parse_ms) / 1000
+                    connection = "cold" if cold else "warm"
                     scraping_results[url] = {
                         "status": "success",
                         "load_time": round(load_time, 2),
                         "status_code": response.status_code,
-                        "title": title,
-                        "content_length": len(response.content)
+                        "title": fields["title"] or "No title",
+                        "content_length": int(content_length) if content_length else None,
+                        "bytes_read": bytes_read,
+                        "extract_engine": self.extractor.name,
+                        "extract_ms": round(parse_ms, 2),
+                        "connection": connection
                     }
                 else:
+                    response, elapsed_ms, cold = self.http.get(url, timeout=30)
+                    load_time = elapsed_ms / 1000
+                    connection = "cold" if cold else "warm"
                     # For JSON responses
                     scraping_results[url] = {
                         "status": "success", 
                         "load_time": round(load_time, 2),
                         "status_code": response.status_code,
-                        "content_type": response.headers.get('content-type', 'unknown')
+                        "content_type": response.headers.get('content-type', 'unknown'),
+                        "connection": connection
                     }
                 
-                print(f"✅ {url}: {load_time:.2f}s")
+                print(f"✅ {url}: {load_time:.2f}s ({connection})")
                 
             except Exception as e:
                 scraping_results[url] = {
@@ -69,41 +118,39 @@ class TermuxNetworkTester:
                     "error": str(e)
                 }
                 print(f"❌ {url}: {e}")
+            
+            self.record_result("web_scraping", scraping_results[url], key=url)
         
-        self.results["tests"]["web_scraping"] = scraping_results
         return scraping_results
     
     def test_network_speed(self):
-        """Test network speed using speedtest-cli"""
+        """Test multi-stream throughput and latency under load"""
         print("\n🚀 Testing Network Speed...")
         
         try:
-            import speedtest
-            
-            st = speedtest.Speedtest()
-            st.get_best_server()
+            from throughput_benchmark import ThroughputBenchmark, endpoints_for
             
-            print("📡 Testing download speed...")
-            download_speed = st.download() / 1_000_000  # Convert to Mbps
+            # An explicit speed server wins, then the target server, then the public default
+            download_url, upload_url = endpoints_for(self.speed_base_url or self.target_base_url)
+            benchmark = ThroughputBenchmark(
+                download_url=download_url,
+                upload_url=upload_url,
+                streams=self.speed_streams,
+                duration=self.speed_duration
+            )
             
-            print("📡 Testing upload speed...")
-            upload_speed = st.upload() / 1_000_000  # Convert to Mbps
+            print(f"📡 {self.speed_streams} streams, {self.speed_duration:g}s per direction...")
+            speed_results = benchmark.run()
+            if speed_results["status"] != "success":
+                raise RuntimeError(speed_results["error"])
             
-            ping = st.results.ping
+            latency = speed_results["latency"]
+            print(f"✅ Download: {speed_results['download_mbps']:.2f} Mbps")
+            print(f"✅ Upload: {speed_results['upload_mbps']:.2f} Mbps")
+            print(f"✅ Ping: {speed_results['ping_ms']:.2f} ms "
+                  f"(+{latency['bufferbloat_ms']} ms under load, grade {latency['bufferbloat_grade']})")
             
-            speed_results = {
-                "download_mbps": round(download_speed, 2),
-                "upload_mbps": round(upload_speed, 2),
-                "ping_ms": round(ping, 2),
-                "server": st.results.server['name'],
-                "status": "success"
-            }
-            
-            print(f"✅ Download: {download_speed:.2f} Mbps")
-            print(f"✅ Upload: {upload_speed:.2f} Mbps") 
-            print(f"✅ Ping: {ping:.2f} ms")
-            
-            self.results["tests"]["network_speed"] = speed_results
+            self.record_result("network_speed", speed_results)
             return speed_results
             
         except Exception as e:
@@ -112,86 +159,85 @@ class TermuxNetworkTester:
                 "error": str(e)
             }
             print(f"❌ Speed test failed: {e}")
-            self.results["tests"]["network_speed"] = error_result
+            self.record_result("network_speed", error_result)
             return error_result
     
-    def test_latency(self):
+    def test_crawl(self):
+        """Crawl from the seed URLs, timing every page"""
+        print(f"\n🕷️ Crawling from {len(self.crawl_seeds)} seed(s)...")
+        
+        from crawler import Crawler
+        
+        def on_page(url, result):
+            # Streamed to the sink as each page completes
+            self.record_result("crawl", result, key=url)
+            if result["status"] == "success":
+                print(f"✅ [d{result['depth']}] {url}: {result['fetch_ms']:.0f} ms, {result['bytes']} bytes")
+            else:
+                print(f"❌ [d{result['depth']}] {url}: {result['error']}")
+        
+        crawler = Crawler(
+            self.targets(self.crawl_seeds),
+            max_depth=self.crawl_depth,
+            max_pages=self.crawl_max_pages,
+            client=self.http,
+            on_page=on_page
+        )
+        report = crawler.run()
+        self.record_result("crawl_summary", report)
+        print(f"📊 {report['pages']} pages, p50 {report['p50_fetch_ms']} ms, p90 {report['p90_fetch_ms']} ms")
+        return report
+    
+    def test_latency(self, samples=20, warmup=2):
         """Test latency to various websites"""
         print("\n📡 Testing Latency...")
         
-        test_sites = [
-            "https://www.google.com",
-            "https://www.github.com",
-            "https://httpbin.org"
-        ]
+        test_sites = self.targets(self.LATENCY_SITES)
         
-        latency_results = {}
+        # All sites are probed concurrently, samples back to back
+        from latency_prober import AsyncLatencyProber
         
-        for site in test_sites:
-            try:
-                times = []
-                for i in range(3):  # Test 3 times for average
-                    start_time = time.time()
-                    response = requests.get(site, timeout=10)
-                    end_time = time.time()
-                    latency = (end_time - start_time) * 1000  # Convert to ms
-                    times.append(latency)
-                    time.sleep(1)  # Wait between tests
-                
-                avg_latency = sum(times) / len(times)
-                latency_results[site] = {
-                    "latency_ms": round(avg_latency, 2),
-                    "status_code": response.status_code,
-                    "status": "success"
-                }
-                print(f"✅ {site}: {avg_latency:.2f} ms")
-                
-            except Exception as e:
-                latency_results[site] = {
-                    "latency_ms": None,
-                    "status": "error", 
-                    "error": str(e)
-                }
-                print(f"❌ {site}: {e}")
+        prober = AsyncLatencyProber(samples=samples, warmup=warmup)
+        latency_results = prober.run(test_sites)
+        
+        for site, result in latency_results.items():
+            self.record_result("latency", result, key=site)
+            if result["status"] == "success":
+                print(f"✅ {site}: p50 {result['p50_ms']} ms, p90 {result['p90_ms']} ms, "
+                      f"p99 {result['p99_ms']} ms (cold {result['cold_latency_ms']} ms)")
+            else:
+                print(f"❌ {site}: {result['error']}")
         
-        self.results["tests"]["latency"] = latency_results
         return latency_results
     
-    def test_dns_resolution(self):
+    def test_dns_resolution(self, domains=None):
         """Test DNS resolution times"""
         print("\n🌐 Testing DNS Resolution...")
         
-        domains = ["google.com", "github.com", "example.com"]
-        dns_results = {}
+        if domains is None:
+            domains = hosts_of(self.targets(self.DNS_DOMAINS)) if self.target_base_url else self.DNS_DOMAINS
         
-        try:
-            import socket
-            
-            for domain in domains:
-                start_time = time.time()
-                try:
-                    ip = socket.gethostbyname(domain)
-                    resolve_time = (time.time() - start_time) * 1000
-                    
-                    dns_results[domain] = {
-                        "ip_address": ip,
-                        "resolve_time_ms": round(resolve_time, 2),
-                        "status": "success"
-                    }
-                    print(f"✅ {domain} → {ip}: {resolve_time:.2f} ms")
-                    
-                except Exception as e:
-                    dns_results[domain] = {
-                        "status": "error",
-                        "error": str(e)
-                    }
-                    print(f"❌ {domain}: {e}")
-                    
-        except ImportError:
-            dns_results = {"status": "skipped", "reason": "socket not available"}
-            print("ℹ️ DNS test skipped")
+        # Cold lookup plus repeats per domain, all domains at once
+        benchmark = DNSBenchmark(cache=self.dns_cache)
+        dns_results, summary = benchmark.run(domains)
+        
+        for domain, result in dns_results.items():
+            self.record_result("dns_resolution", result, key=domain)
+            if result["status"] == "success":
+                record_count = len(result["addresses"]["A"]) + len(result["addresses"]["AAAA"])
+                print(f"✅ {domain} → {result['ip_address']} (+{record_count - 1} more): "
+                      f"cold {result['cold_resolve_ms']:.2f} ms, repeat {result['repeat_resolve_ms']} ms")
+            else:
+                print(f"❌ {domain}: {result['error']}")
+        
+        print(f"📊 Resolved {summary['resolved']}/{summary['domains']} domains in {summary['wall_time_ms']} ms")
+        
+        if self.dns_cache is not None:
+            # The benchmarked domains are primed already; add the hosts the HTTP tests hit
+            http_hosts = hosts_of(self.targets(self.SCRAPING_URLS + self.LATENCY_SITES))
+            primed = self.dns_cache.warm(http_hosts)
+            print(f"📦 DNS cache primed with {primed} more host(s) for the HTTP tests")
         
-        self.results["tests"]["dns_resolution"] = dns_results
         return dns_results
     
     def run_all_tests(self):
@@ -199,17 +245,37 @@ class TermuxNetworkTester:
         print("🎯 Starting Network Test Suite...")
         print("=" * 50)
         
+        if self.dns_cache is not None:
+            self.dns_cache.install()
+        
+        # Stream every measurement to disk as it completes
+        self.sink = JSONLResultSink(self.stream_file, run_info={
+            "timestamp": self.results["timestamp"],
+            "environment": self.results["environment"]
+        })
+        
         try:
-            self.test_requests_scraping()
-            time.sleep(2)
+            # Run tests back to back; only hosts hit twice get a politeness gap
+            scheduler = StepScheduler()
+            # DNS first so its lookups can fill the cache for the HTTP tests.
+            # The old runner slept 2s between its four tests: three pauses
+            scheduler.add("dns_resolution", self.test_dns_resolution)
+            scheduler.add("web_scraping", self.test_requests_scraping,
+                          hosts=hosts_of(self.targets(self.SCRAPING_URLS)), replaces_pause=True)
+            scheduler.add("network_speed", self.test_network_speed, replaces_pause=True)
+            scheduler.add("latency", self.test_latency, hosts=hosts_of(self.targets(self.LATENCY_SITES)),
+                          replaces_pause=True)
+            if self.crawl_seeds:
+                # The crawler keeps its own per-host politeness
+                scheduler.add("crawl", self.test_crawl)
+            scheduler.run()
             
-            self.test_network_speed() 
-            time.sleep(2)
+            self.record_meta("scheduler", scheduler.report())
             
-            self.test_latency()
-            time.sleep(2)
-            
-            self.test_dns_resolution()
+            if self._http is not None:
+                self.record_meta("connection_pool", self._http.stats())
+            if self.dns_cache is not None:
+                self.record_meta("dns_cache", self.dns_cache.stats())
             
             # Save results
             self.save_results()
@@ -223,12 +289,44 @@ class TermuxNetworkTester:
         except Exception as e:
             print(f"💥 Network test suite failed: {e}")
             return None
+        finally:
+            self.sink.close()
+            if self.dns_cache is not None:
+                self.dns_cache.uninstall()
+    
+    def targets(self, urls):
+        """Map live URLs onto the configured target server"""
+        return [rewrite_url(url, self.target_base_url) for url in urls]
+    
+    def record_result(self, test_name, result, key=None):
+        """Store a result and stream it to the JSONL sink"""
+        if key is None:
+            self.results["tests"][test_name] = result
+        else:
+            self.results["tests"].setdefault(test_name, {})[key] = result
+        if self.sink is not None:
+            self.sink.record(test_name, result, key)
+    
+    def record_meta(self, name, value):
+        """Store a run-level value and stream it to the JSONL sink"""
+        self.results[name] = value
+        if self.sink is not None:
+            self.sink.meta(name, value)
     
     def save_results(self):
         """Save results to JSON file"""
         filename = "network_test_results.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        if self.sink is not None:
+            # The summary is rebuilt from the stream written during the run
+            self.sink.close()
+            write_summary(self.sink.path, filename)
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, indent=2, ensure_ascii=False)
+        
+        # Keep a history across runs; the JSON file only holds the latest
+        from results_store import store_run
+        store_run("network", self.results, run_id=self.sink.run_id if self.sink else None)
         
         # Also print summary
         self.print_summary()
@@ -250,11 +348,42 @@ class TermuxNetworkTester:
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description='Termux Network Test Runner')
+    parser.add_argument('--dns-cache-ttl', type=int, default=None,
+                       help='Cache DNS answers in-process for this many seconds')
+    parser.add_argument('--extract-engine', choices=list(ENGINES), default='streaming',
+                       help='HTML extraction engine for the scraping test')
+    parser.add_argument('--speed-url',
+                       help='Base URL of a target server to measure throughput against')
+    parser.add_argument('--speed-streams', type=int, default=4,
+                       help='Parallel connections for the throughput test')
+    parser.add_argument('--speed-duration', type=float, default=8.0,
+                       help='Measured seconds per direction for the throughput test')
+    parser.add_argument('--crawl', nargs='+', metavar='URL',
+                       help='Also crawl from these seed URLs, timing every page')
+    parser.add_argument('--crawl-depth', type=int, default=2,
+                       help='Link depth to follow from the seeds')
+    parser.add_argument('--crawl-max-pages', type=int, default=50,
+                       help='Stop the crawl after this many pages')
+    add_target_arguments(parser)
+    args = parser.parse_args()
+    target_base_url, _ = start_targets(args.local_targets, args.target_base_url)
+    
     print("🚀 Termux Network Test Runner")
-    print("Using requests + speedtest (no browser required)")
+    print("Using requests + built-in throughput benchmark (no browser required)")
     
     try:
-        tester = TermuxNetworkTester()
+        tester = TermuxNetworkTester(
+            dns_cache_ttl=args.dns_cache_ttl,
+            target_base_url=target_base_url,
+            extract_engine=args.extract_engine,
+            speed_base_url=args.speed_url,
+            speed_streams=args.speed_streams,
+            speed_duration=args.speed_duration,
+            crawl_seeds=args.crawl,
+            crawl_depth=args.crawl_depth,
+            crawl_max_pages=args.crawl_max_pages
+        )
         results = tester.run_all_tests()
         
         if results:
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Batched page extraction - everything test_web_scraping needs in one execute_script
+"""
+
+import json
+
+
+# Content length and paragraph count are computed in the browser, so the
+# DOM never crosses the wire. Only the first 100 characters of the first
+# paragraph are returned, plus its full length for the "..." suffix.
+PAGE_INFO_SCRIPT = """
+var paragraphs = document.getElementsByTagName('p');
+var first = paragraphs.length ? (paragraphs[0].innerText || '') : null;
+var doctype = document.doctype ? new XMLSerializer().serializeToString(document.doctype) : '';
+var cookies = arguments[0] && document.cookie ? document.cookie.split('; ').slice(0, 3).map(function (pair) {
+    var i = pair.indexOf('=');
+    return {name: pair.slice(0, i), value: pair.slice(i + 1)};
+}) : [];
+return {
+    title: document.title,
+    url: location.href,
+    content_length: doctype.length + document.documentElement.outerHTML.length,
+    cookies: cookies,
+    paragraph_count: paragraphs.length,
+    sample_text: first === null ? null : first.slice(0, 100),
+    first_paragraph_length: first === null ? 0 : first.length
+};
+"""
+
+# W3C element reference as returned by find_elements:
+# {"element-6066-11e4-a52e-4f735466cecf": "<36 character uuid>"}
+ELEMENT_REFERENCE_BYTES = 84
+
+# title, current_url, page_source, get_cookies, find_elements
+LEGACY_BASE_COMMANDS = 5
+# The old code read paragraphs[0].text twice (length check, then value)
+LEGACY_TEXT_READS = 2
+
+
+def _json_size(value):
+    return len(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+
+def page_info_from_payload(payload):
+    """Build the legacy page_info dict from the script payload"""
+    page_info = {
+        "title": payload["title"],
+        "url": payload["url"],
+        "content_length": payload["content_length"],
+        "headers": payload["cookies"],
+        "paragraph_count": payload["paragraph_count"]
+    }
+    if payload["paragraph_count"]:
+        sample_text = payload["sample_text"]
+        page_info["sample_text"] = sample_text + "..." if payload["first_paragraph_length"] > 100 else sample_text
+    return page_info
+
+
+def round_trip_report(payload, commands=1):
+    """Commands and approximate response bytes saved versus the per-field calls"""
+    payload_bytes = _json_size(payload)
+
+    legacy_commands = LEGACY_BASE_COMMANDS
+    legacy_bytes = (
+        _json_size(payload["title"]) + _json_size(payload["url"]) +
+        payload["content_length"] + _json_size(payload["cookies"]) +
+        payload["paragraph_count"] * ELEMENT_REFERENCE_BYTES
+    )
+    if payload["paragraph_count"]:
+        legacy_commands += LEGACY_TEXT_READS
+        # Approximation: one byte per character of the first paragraph
+        legacy_bytes += LEGACY_TEXT_READS * (payload["first_paragraph_length"] + 2)
+
+    return {
+        "commands": commands,
+        "legacy_commands": legacy_commands,
+        "commands_saved": legacy_commands - commands,
+        "payload_bytes": payload_bytes,
+        "legacy_bytes_estimate": legacy_bytes,
+        "bytes_saved": max(legacy_bytes - payload_bytes, 0)
+    }
+
+
+def extract_page_info(driver, script_cookies=False):
+    """Collect page_info in one or two WebDriver commands; returns (page_info, report)
+
+    Cookies come from get_cookies(), which sees HttpOnly cookies and every
+    attribute. script_cookies=True reads document.cookie inside the script
+    instead: one command fewer, but names and values of script-visible
+    cookies only."""
+    payload = driver.execute_script(PAGE_INFO_SCRIPT, script_cookies)
+    commands = 1
+    if not script_cookies:
+        payload["cookies"] = list(driver.get_cookies())[:3]
+        commands += 1
+    return page_info_from_payload(payload), round_trip_report(payload, commands)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Parallel page-load benchmark - spreads a URL list over a pool of browsers
+"""
+
+import time
+import queue
+import threading
+
+from navigation_timing import collect_navigation_timing
+from readiness import DocumentReady, navigate
+
+
+# Rough resident size of one headless Firefox + geckodriver pair
+DEFAULT_MB_PER_WORKER = 400
+
+
+def available_memory_mb():
+    """Read available memory from /proc/meminfo (None if unknown)"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def max_workers_for_memory(requested, mb_per_worker=DEFAULT_MB_PER_WORKER):
+    """Cap the requested worker count by the memory we can spare"""
+    requested = max(1, int(requested))
+    memory_mb = available_memory_mb()
+    if memory_mb is None:
+        return requested
+    return max(1, min(requested, memory_mb // mb_per_worker))
+
+
+def measure_page_load(driver, url, timeout=15, ready=None, waterfall=None):
+    """Load url, wait for the ready condition (default readyState complete) and read Navigation Timing"""
+    if ready is None:
+        ready = DocumentReady("complete")
+
+    try:
+        timings = navigate(driver, url, ready, timeout)
+        load_time = timings["ready_ms"] / 1000
+        result = {
+            "load_time_seconds": round(load_time, 2),
+            "ready_condition": ready.name,
+            "status": "success"
+        }
+
+        timing = collect_navigation_timing(driver)
+        if timing:
+            result["navigation_timing"] = timing
+            # What we add on top of the browser's own load: WebDriver
+            # round trips plus the readyState poll. Conditions short of the
+            # load event finish before loadEventEnd fires, so compare
+            # against DOMContentLoaded then, and report nothing without either
+            milestone = "load_ms" if timing["load_ms"] else "dom_content_loaded_ms"
+            browser_ms = timing[milestone]
+            result["harness_overhead"] = {
+                "webdriver_get_ms": timings["get_ms"],
+                "ready_poll_ms": round(timings["ready_ms"] - timings["get_ms"], 2),
+                "browser_milestone": milestone if browser_ms else None,
+                "overhead_ms": round(load_time * 1000 - browser_ms, 2) if browser_ms else None
+            }
+        if waterfall is not None:
+            # Per-resource breakdown; the full waterfall goes to the recorder's HAR.
+            # A failed capture must not turn a good load into an error
+            try:
+                result["waterfall"] = waterfall.capture(driver)
+            except Exception as e:
+                result["waterfall_error"] = str(e)
+        return result
+
+    except Exception as e:
+        return {
+            "load_time_seconds": None,
+            "status": "error",
+            "error": str(e)
+        }
+
+
+def throughput_summary(speed_results, wall_time, workers):
+    """Pages per minute over the whole benchmark wall time"""
+    loaded = sum(1 for r in speed_results.values() if r.get("status") == "success")
+    return {
+        "status": "success",
+        "workers": workers,
+        "pages": len(speed_results),
+        "pages_loaded": loaded,
+        "wall_time_seconds": round(wall_time, 2),
+        "pages_per_minute": round(loaded / wall_time * 60, 2) if wall_time > 0 else None
+    }
+
+
+class ParallelPageLoadBenchmark:
+    """Benchmark page loads across N browser workers sharing one URL queue"""
+
+    def __init__(self, driver_factory, workers=2, timeout=15,
+                 mb_per_worker=DEFAULT_MB_PER_WORKER, primary_driver=None,
+                 on_result=None, ready=None, waterfall=None):
+        self.driver_factory = driver_factory
+        self.requested_workers = workers
+        self.workers = max_workers_for_memory(workers, mb_per_worker)
+        self.timeout = timeout
+        # An already-running driver (e.g. the warm session) can be worker 0
+        self.primary_driver = primary_driver
+        # Called as on_result(url, result) as soon as each page finishes
+        self.on_result = on_result
+        # Readiness condition per page, readyState complete when None
+        self.ready = ready
+        # Optional WaterfallRecorder shared by every worker
+        self.waterfall = waterfall
+        self.lock = threading.Lock()
+
+    def run(self, urls):
+        """Load every URL once; returns (speed_results, throughput)"""
+        url_queue = queue.Queue()
+        for url in urls:
+            url_queue.put(url)
+
+        speed_results = {}
+        worker_count = min(self.workers, len(urls)) or 1
+        if worker_count < self.requested_workers:
+            print(f"ℹ️ Using {worker_count}/{self.requested_workers} workers (memory/URL cap)")
+
+        start_time = time.time()
+        threads = [
+            threading.Thread(target=self._worker, args=(i, url_queue, speed_results), daemon=True)
+            for i in range(worker_count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wall_time = time.time() - start_time
+
+        # URLs left over mean every worker failed to start a browser
+        while not url_queue.empty():
+            url = url_queue.get_nowait()
+            speed_results[url] = {
+                "load_time_seconds": None,
+                "status": "error",
+                "error": "No browser worker available"
+            }
+            if self.on_result is not None:
+                self.on_result(url, speed_results[url])
+
+        # Report in input order rather than completion order
+        speed_results = {url: speed_results[url] for url in urls}
+        return speed_results, throughput_summary(speed_results, wall_time, worker_count)
+
+    def _worker(self, index, url_queue, speed_results):
+        """Drain the queue with one driver"""
+        owns_driver = not (index == 0 and self.primary_driver is not None)
+        try:
+            driver = self.driver_factory() if owns_driver else self.primary_driver
+        except Exception as e:
+            driver = None
+            print(f"❌ Worker {index}: driver failed to start - {e}")
+
+        # A worker without a browser leaves its share to the others
+        if driver is None:
+            return
+
+        try:
+            while True:
+                try:
+                    url = url_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                result = measure_page_load(driver, url, self.timeout, self.ready, self.waterfall)
+                result["worker"] = index
+                with self.lock:
+                    speed_results[url] = result
+                    if self.on_result is not None:
+                        self.on_result(url, result)
+
+                if result["status"] == "success":
+                    print(f"✅ [w{index}] {url}: {result['load_time_seconds']:.2f}s")
+                else:
+                    print(f"❌ [w{index}] {url}: Failed - {result['error']}")
+        finally:
+            if owns_driver:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
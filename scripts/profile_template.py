@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Firefox profile template - build a tuned profile once, start every session from a cheap copy
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import tempfile
+import threading
+import subprocess
+
+from driver_session import shared_session
+from user_dirs import CACHE_DIR
+
+
+DEFAULT_TEMPLATE_DIR = os.path.join(CACHE_DIR, "firefox-profile-template")
+STAMP_FILE = "template.json"
+
+# Everything Firefox would otherwise do on the first start of a fresh profile
+TEMPLATE_PREFERENCES = {
+    # First-run and welcome pages
+    "browser.startup.homepage_override.mstone": "ignore",
+    "startup.homepage_welcome_url": "about:blank",
+    "startup.homepage_welcome_url.additional": "",
+    "browser.aboutwelcome.enabled": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.newtabpage.enabled": False,
+    "trailhead.firstrun.didSeeAboutWelcome": True,
+    # Telemetry and studies
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "toolkit.telemetry.unified": False,
+    "toolkit.telemetry.archive.enabled": False,
+    "app.normandy.enabled": False,
+    "app.shield.optoutstudies.enabled": False,
+    # Updates
+    "app.update.auto": False,
+    "app.update.enabled": False,
+    "extensions.update.enabled": False,
+    "browser.search.update": False,
+    # Safe-browsing list downloads
+    "browser.safebrowsing.downloads.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.safebrowsing.blockedURIs.enabled": False,
+    "browser.safebrowsing.update.enabled": False,
+    # Background connections
+    "network.captive-portal-service.enabled": False,
+    "network.connectivity-service.enabled": False,
+    "extensions.pocket.enabled": False,
+    "browser.ping-centre.telemetry": False
+}
+
+# Files rewritten in place (by Firefox, or by geckodriver for the prefs
+# files); everything else is replaced atomically (write-then-rename), so
+# hardlinking it into a session copy cannot touch the template
+IN_PLACE_SUFFIXES = (".sqlite", ".sqlite-wal", ".sqlite-shm", ".db", ".ini")
+IN_PLACE_FILES = ("user.js", "prefs.js")
+
+# Benchmark workers start their drivers from threads; one build or copy at a time
+_template_lock = threading.Lock()
+
+
+def _js_value(value):
+    return json.dumps(value)
+
+
+def write_user_js(path, prefs):
+    """Write prefs as user_pref() lines"""
+    with open(os.path.join(path, "user.js"), 'w', encoding='utf-8') as f:
+        for name, value in sorted(prefs.items()):
+            f.write(f'user_pref("{name}", {_js_value(value)});\n')
+
+
+def preferences_digest(prefs):
+    return hashlib.sha256(json.dumps(prefs, sort_keys=True).encode('utf-8')).hexdigest()[:16]
+
+
+def _link_or_copy(src, dst):
+    if src.endswith(IN_PLACE_SUFFIXES) or os.path.basename(src) in IN_PLACE_FILES:
+        return shutil.copy2(src, dst)
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem or no hardlink support (e.g. some Android storage)
+        shutil.copy2(src, dst)
+    return dst
+
+
+class ProfileTemplate:
+    """A tuned profile directory plus per-session copies of it"""
+
+    def __init__(self, path=DEFAULT_TEMPLATE_DIR, extra_prefs=None, firefox_binary="firefox"):
+        self.path = path
+        self.prefs = dict(TEMPLATE_PREFERENCES, **(extra_prefs or {}))
+        self.firefox_binary = firefox_binary
+        self.clones = []
+        # The shared Firefox runs on one of the clones, so remove them only
+        # after the session has quit it (this also runs at exit)
+        shared_session.on_shutdown(self.cleanup)
+
+    def is_current(self):
+        """True if the template exists and was built from these prefs"""
+        try:
+            with open(os.path.join(self.path, STAMP_FILE), encoding='utf-8') as f:
+                return json.load(f).get("digest") == preferences_digest(self.prefs)
+        except (OSError, ValueError):
+            return False
+
+    def build(self, warm=True, timeout=60):
+        """Create the template from scratch; returns build seconds"""
+        start_time = time.perf_counter()
+        parent = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(parent, exist_ok=True)
+        # Built next to its final place and renamed in, so no other
+        # process ever copies a half-written template
+        staging = tempfile.mkdtemp(prefix=".template-", dir=parent)
+        try:
+            write_user_js(staging, self.prefs)
+
+            warmed = False
+            if warm:
+                warmed = self.warm(timeout, staging)
+
+            with open(os.path.join(staging, STAMP_FILE), 'w', encoding='utf-8') as f:
+                json.dump({
+                    "digest": preferences_digest(self.prefs),
+                    "warmed": warmed,
+                    "built": time.time()
+                }, f)
+
+            # Directories only rename over empty ones: move the old template aside first
+            retired = staging + "-old"
+            try:
+                os.replace(self.path, retired)
+            except FileNotFoundError:
+                pass
+            try:
+                os.replace(staging, self.path)
+            except OSError:
+                # Another process put its own build in place meanwhile
+                pass
+            shutil.rmtree(retired, ignore_errors=True)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        return time.perf_counter() - start_time
+
+    def warm(self, timeout=60, path=None):
+        """Start Firefox once on the template so its databases already exist"""
+        screenshot = os.path.join(tempfile.gettempdir(), "profile-template-warmup.png")
+        try:
+            subprocess.run(
+                [self.firefox_binary, "--headless", "--no-remote", "--profile", path or self.path,
+                 "--screenshot", screenshot, "about:blank"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=timeout, check=True
+            )
+            return True
+        except (OSError, subprocess.SubprocessError):
+            return False
+        finally:
+            if os.path.exists(screenshot):
+                os.remove(screenshot)
+
+    def ensure(self, warm=True):
+        """Build the template unless an up-to-date one is already on disk"""
+        with _template_lock:
+            if not self.is_current():
+                self.build(warm=warm)
+        return self.path
+
+    def clone(self):
+        """Cheap per-session copy of the template"""
+        session_dir = tempfile.mkdtemp(prefix="selenium-profile-")
+        os.rmdir(session_dir)
+        with _template_lock:
+            if not self.is_current():
+                self.build()
+            shutil.copytree(self.path, session_dir, copy_function=_link_or_copy,
+                            ignore=shutil.ignore_patterns(STAMP_FILE, "lock", ".parentlock"))
+        self.clones.append(session_dir)
+        return session_dir
+
+    def apply(self, options):
+        """Point a selenium Firefox Options object at a fresh clone"""
+        # -profile is used in place; options.profile would zip and upload it
+        options.add_argument("-profile")
+        options.add_argument(self.clone())
+        return options
+
+    def cleanup(self):
+        """Remove every session copy made by this process"""
+        while self.clones:
+            shutil.rmtree(self.clones.pop(), ignore_errors=True)
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def startup_comparison(default_factory, template_factory, runs=3):
+    """Median driver start time with a fresh geckodriver profile vs the template"""
+    timings = {"default": [], "template": []}
+    for _ in range(runs):
+        for name, factory in (("default", default_factory), ("template", template_factory)):
+            start_time = time.perf_counter()
+            driver = factory()
+            timings[name].append((time.perf_counter() - start_time) * 1000)
+            driver.quit()
+
+    default_ms = _median(timings["default"])
+    template_ms = _median(timings["template"])
+    return {
+        "status": "success",
+        "runs": runs,
+        "default_startup_ms": round(default_ms, 1),
+        "template_startup_ms": round(template_ms, 1),
+        "saved_ms": round(default_ms - template_ms, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the cached Firefox profile template')
+    parser.add_argument('--path', default=DEFAULT_TEMPLATE_DIR)
+    parser.add_argument('--firefox', default='firefox', help='Firefox binary used to warm the template')
+    parser.add_argument('--no-warm', action='store_true', help='Only write user.js')
+    parser.add_argument('--force', action='store_true', help='Rebuild even if the template is current')
+    args = parser.parse_args()
+
+    template = ProfileTemplate(args.path, firefox_binary=args.firefox)
+    if template.is_current() and not args.force:
+        print(f"✅ Profile template is up to date: {template.path}")
+        return 0
+
+    seconds = template.build(warm=not args.no_warm)
+    with open(os.path.join(template.path, STAMP_FILE), encoding='utf-8') as f:
+        warmed = json.load(f)["warmed"]
+    print(f"✅ Built profile template in {seconds:.1f}s: {template.path}")
+    if not args.no_warm and not warmed:
+        print("⚠️  Could not start Firefox to warm the template; sessions will populate it on first start")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Page readiness conditions - wait for what a test needs instead of the full load event
+"""
+
+import time
+
+from driver_session import shared_session
+from step_scheduler import wait_until
+
+
+PAGE_LOAD_STRATEGIES = ("normal", "eager", "none")
+
+# Set on the outgoing document so a "none" session never mistakes the
+# previous page (already complete) for the new one
+OLD_DOCUMENT_MARKER = "__seleniumTestsOldDocument"
+
+
+class DocumentReady:
+    """document.readyState has reached 'interactive' or 'complete'"""
+
+    def __init__(self, state="complete"):
+        self.states = ("interactive", "complete") if state == "interactive" else ("complete",)
+        self.name = f"document_{state}"
+
+    def __call__(self, driver):
+        return driver.execute_script("return document.readyState") in self.states
+
+
+class ElementPresent:
+    """At least one element matches the locator"""
+
+    def __init__(self, by, value):
+        # By constants are plain strings ("name", "css selector", ...)
+        self.by = by
+        self.value = value
+        self.name = f"element_present({by}={value})"
+
+    def __call__(self, driver):
+        return len(driver.find_elements(self.by, self.value)) > 0
+
+
+class NetworkIdle:
+    """No resource has finished loading for idle_ms and the DOM is parsed
+
+    Resource Timing only lists finished requests, so this is a quiet-period
+    heuristic rather than an in-flight request count."""
+
+    # Entries are ordered by startTime, so an earlier request can finish last
+    SCRIPT = """
+    if (document.readyState === 'loading') { return false; }
+    var last = performance.getEntriesByType('resource').reduce(function (latest, entry) {
+        return Math.max(latest, entry.responseEnd);
+    }, 0);
+    var navigation = performance.getEntriesByType('navigation')[0];
+    var domReady = navigation ? navigation.domContentLoadedEventEnd : 0;
+    return performance.now() - Math.max(last, domReady) >= arguments[0];
+    """
+
+    def __init__(self, idle_ms=500):
+        self.idle_ms = idle_ms
+        self.name = f"network_idle({idle_ms}ms)"
+
+    def __call__(self, driver):
+        return bool(driver.execute_script(self.SCRIPT, self.idle_ms))
+
+
+class JSPredicate:
+    """Custom JavaScript expression evaluates truthy"""
+
+    def __init__(self, expression, name=None):
+        self.expression = expression
+        self.name = name or f"js({expression})"
+
+    def __call__(self, driver):
+        return bool(driver.execute_script(f"return Boolean({self.expression});"))
+
+
+# What the browser itself waits for under each strategy
+STRATEGY_CONDITIONS = {
+    "normal": DocumentReady("complete"),
+    "eager": DocumentReady("interactive"),
+    "none": None
+}
+
+
+def strategy_condition(strategy):
+    """Readiness condition that emulates a page load strategy"""
+    if strategy not in STRATEGY_CONDITIONS:
+        raise ValueError(f"Unknown page load strategy '{strategy}' (choose from {', '.join(PAGE_LOAD_STRATEGIES)})")
+    return STRATEGY_CONDITIONS[strategy]
+
+
+def _new_document(driver):
+    return not driver.execute_script(f"return window.{OLD_DOCUMENT_MARKER} === true;")
+
+
+def navigate(driver, url, ready=None, timeout=10, poll=0.05):
+    """Load url and wait for the ready condition; returns timings in ms
+
+    On a "none" session driver.get returns as soon as navigation starts, so
+    ready decides how long we wait. On "normal"/"eager" sessions the browser
+    already waited and the condition usually passes on the first poll."""
+    try:
+        driver.execute_script(f"window.{OLD_DOCUMENT_MARKER} = true;")
+    except Exception:
+        pass
+
+    start_time = time.perf_counter()
+    driver.get(url)
+    get_done = time.perf_counter()
+    # The shared session clears every origin it loaded on its next reset
+    shared_session.visited(driver, url)
+
+    def condition():
+        return _new_document(driver) and (ready is None or ready(driver))
+
+    if not wait_until(condition, timeout, poll):
+        name = getattr(ready, "name", "new document")
+        raise TimeoutError(f"{url} not ready ({name}) after {timeout}s")
+    ready_done = time.perf_counter()
+
+    return {
+        "get_ms": round((get_done - start_time) * 1000, 2),
+        "ready_ms": round((ready_done - start_time) * 1000, 2)
+    }
+
+
+def measure_readiness_savings(driver, url, ready, timeout=15, poll=0.05):
+    """On a "none" session: time to ready versus time to the full load event"""
+    try:
+        timings = navigate(driver, url, ready, timeout, poll)
+        complete = DocumentReady("complete")
+        complete_start = time.perf_counter()
+        if not wait_until(lambda: complete(driver), timeout, poll):
+            raise TimeoutError(f"{url} never reached readyState complete")
+        complete_ms = timings["ready_ms"] + (time.perf_counter() - complete_start) * 1000
+
+        return {
+            "status": "success",
+            "condition": ready.name,
+            "ready_ms": timings["ready_ms"],
+            "complete_ms": round(complete_ms, 2),
+            "saved_ms": round(complete_ms - timings["ready_ms"], 2)
+        }
+    except Exception as e:
+        return {"status": "error", "condition": ready.name, "error": str(e)}
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Performance regression gate - Mann-Whitney U against a stored baseline, fails CI on slowdowns
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+from datetime import datetime
+from urllib.parse import urlparse
+
+from results_store import headline_timing
+
+
+DEFAULT_BASELINE = "perf_baseline.json"
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+# Above this many (n1 * n2) pairs, or with ties, use the normal approximation
+EXACT_PAIRS_LIMIT = 400
+
+
+def metric_key(test, target):
+    """Stable baseline key; local target servers get a random port each run"""
+    if target and "://" in target:
+        parsed = urlparse(target)
+        if parsed.hostname in LOOPBACK_HOSTS:
+            target = parsed._replace(scheme="local", netloc="target").geturl()
+    return f"{test}|{target}" if target else test
+
+
+def _walk(test, target, value):
+    if not isinstance(value, dict):
+        return
+    if "status" not in value:
+        for key, nested in value.items():
+            yield from _walk(test, key, nested)
+        return
+    if value.get("status") != "success":
+        return
+
+    samples = value.get("samples_ms")
+    if samples:
+        yield metric_key(test, target), list(samples)
+    else:
+        _, value_ms = headline_timing(value)
+        if value_ms is not None:
+            yield metric_key(test, target), [value_ms]
+
+    # The simple runner wraps a whole test's per-target results in "result"
+    if isinstance(value.get("result"), dict):
+        for key, nested in value["result"].items():
+            yield from _walk(test, key, nested)
+
+
+def collect_samples(results):
+    """Timing samples per metric key from one results file (legacy layout)"""
+    samples = {}
+    for test, value in results.get("tests", {}).items():
+        for key, values in _walk(test, None, value):
+            samples.setdefault(key, []).extend(values)
+    return samples
+
+
+def _ranks(values):
+    """Average ranks (1-based) with ties sharing the mean rank"""
+    order = sorted(range(len(values)), key=lambda i: values[i])
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def _exact_upper_tail(u, n1, n2):
+    """P(U >= u) from the exact null distribution (no ties)"""
+    # counts[i][j] = frequency of each U value for sample sizes (i, j)
+    counts = [[None] * (n2 + 1) for _ in range(n1 + 1)]
+    for i in range(n1 + 1):
+        counts[i][0] = [1]
+    for j in range(n2 + 1):
+        counts[0][j] = [1]
+    for i in range(1, n1 + 1):
+        for j in range(1, n2 + 1):
+            # The largest value comes from sample 1 (beats all j) or sample 2
+            shifted = [0] * j + counts[i - 1][j]
+            other = counts[i][j - 1]
+            size = max(len(shifted), len(other))
+            counts[i][j] = [
+                (shifted[k] if k < len(shifted) else 0) + (other[k] if k < len(other) else 0)
+                for k in range(size)
+            ]
+    distribution = counts[n1][n2]
+    total = sum(distribution)
+    return sum(distribution[math.ceil(u):]) / total
+
+
+def mann_whitney_u(current, baseline):
+    """One-sided test that current is stochastically larger; returns (U, p)"""
+    n1, n2 = len(current), len(baseline)
+    combined = list(current) + list(baseline)
+    ranks = _ranks(combined)
+    u = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+
+    ties = len(set(combined)) < len(combined)
+    if not ties and n1 * n2 <= EXACT_PAIRS_LIMIT:
+        return u, _exact_upper_tail(u, n1, n2)
+
+    n = n1 + n2
+    tie_term = 0
+    for value in set(combined):
+        t = combined.count(value)
+        tie_term += t ** 3 - t
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    # Continuity correction towards the mean
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def compare_metric(current, baseline, alpha=0.05, min_slowdown=0.2, min_delta_ms=5.0, min_baseline=3):
+    """Verdict for one metric: regression, ok or insufficient"""
+    if len(baseline) < min_baseline or not current:
+        return {
+            "verdict": "insufficient",
+            "current_n": len(current),
+            "baseline_n": len(baseline)
+        }
+
+    u, p_value = mann_whitney_u(current, baseline)
+    current_median = _median(current)
+    baseline_median = _median(baseline)
+    delta_ms = current_median - baseline_median
+    slowdown = delta_ms / baseline_median if baseline_median > 0 else (math.inf if delta_ms > 0 else 0.0)
+
+    regression = p_value < alpha and slowdown >= min_slowdown and delta_ms >= min_delta_ms
+    return {
+        "verdict": "regression" if regression else "ok",
+        "current_n": len(current),
+        "baseline_n": len(baseline),
+        "current_median_ms": round(current_median, 2),
+        "baseline_median_ms": round(baseline_median, 2),
+        "delta_ms": round(delta_ms, 2),
+        "slowdown": round(slowdown, 3) if math.isfinite(slowdown) else None,
+        # Probability a current sample is slower than a baseline sample
+        "effect_size": round(u / (len(current) * len(baseline)), 3),
+        "u": u,
+        "p_value": round(p_value, 5)
+    }
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def update_baseline(path, baseline, samples, max_samples=200):
+    """Append the current samples, keeping the most recent max_samples per metric"""
+    metrics = dict((baseline or {}).get("metrics", {}))
+    for key, values in samples.items():
+        metrics[key] = (metrics.get(key, []) + values)[-max_samples:]
+    data = {"updated": datetime.now().isoformat(), "metrics": metrics}
+    tmp = path + ".tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+    return data
+
+
+def run_gate(samples, baseline, alpha=0.05, min_slowdown=0.2, min_delta_ms=5.0, min_baseline=3):
+    """Compare every metric present in both; returns {key: verdict dict}"""
+    reference = (baseline or {}).get("metrics", {})
+    return {
+        key: compare_metric(values, reference.get(key, []), alpha, min_slowdown, min_delta_ms, min_baseline)
+        for key, values in sorted(samples.items())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fail on statistically significant slowdowns')
+    parser.add_argument('results', nargs='+', help='Results JSON files from this run (missing ones are skipped)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--alpha', type=float, default=0.05, help='One-sided significance level')
+    parser.add_argument('--min-slowdown', type=float, default=0.2,
+                       help='Minimum relative median slowdown to count (0.2 = 20%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                       help='Ignore slowdowns smaller than this many ms')
+    parser.add_argument('--min-baseline', type=int, default=3,
+                       help='Baseline samples needed before a metric is gated')
+    parser.add_argument('--update-baseline', action='store_true',
+                       help='Add this run to the baseline when it passes')
+    parser.add_argument('--force-update', action='store_true',
+                       help='Add this run to the baseline even with regressions')
+    parser.add_argument('--report', help='Write the verdicts to this JSON file')
+    args = parser.parse_args()
+
+    samples = {}
+    for path in args.results:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            for key, values in collect_samples(json.load(f)).items():
+                samples.setdefault(key, []).extend(values)
+
+    print("📉 Performance Regression Gate")
+    print("=" * 50)
+    if not samples:
+        print("ℹ️  No timing samples found, nothing to gate")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"ℹ️  No baseline at {args.baseline}")
+
+    verdicts = run_gate(samples, baseline, args.alpha, args.min_slowdown, args.min_delta_ms, args.min_baseline)
+    regressions = [key for key, verdict in verdicts.items() if verdict["verdict"] == "regression"]
+
+    for key, verdict in verdicts.items():
+        if verdict["verdict"] == "insufficient":
+            print(f"⏭️  {key}: {verdict['baseline_n']} baseline samples, not gated")
+            continue
+        icon = "❌" if verdict["verdict"] == "regression" else "✅"
+        print(f"{icon} {key}: median {verdict['baseline_median_ms']} → {verdict['current_median_ms']} ms "
+              f"(p={verdict['p_value']}, effect {verdict['effect_size']})")
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(verdicts, f, indent=2)
+
+    if args.update_baseline and (not regressions or args.force_update):
+        update_baseline(args.baseline, baseline, samples)
+        print(f"💾 Baseline updated: {args.baseline}")
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} significant slowdown(s): {', '.join(regressions)}")
+        return 1
+    print("\n✅ No significant slowdowns")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
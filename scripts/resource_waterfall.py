@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Resource waterfall - per-resource Resource Timing from a page load, exported as HAR
+"""
+
+import os
+import sys
+import json
+import argparse
+import threading
+from datetime import datetime, timezone
+
+
+# Resource Timing fields we read, in row order. Rows instead of objects
+# keep the WebDriver response small on pages with hundreds of resources.
+RESOURCE_FIELDS = [
+    "name", "initiatorType", "startTime", "duration",
+    "redirectStart", "redirectEnd", "fetchStart",
+    "domainLookupStart", "domainLookupEnd", "connectStart", "connectEnd", "secureConnectionStart",
+    "requestStart", "responseStart", "responseEnd",
+    "transferSize", "encodedBodySize", "decodedBodySize", "nextHopProtocol", "responseStatus"
+]
+
+RESOURCE_TIMING_SCRIPT = """
+var fields = arguments[0];
+var rows = function (entries) {
+    return entries.map(function (entry) {
+        return fields.map(function (field) {
+            var value = entry[field];
+            return value === undefined ? null : value;
+        });
+    });
+};
+var navigation = performance.getEntriesByType('navigation');
+return {
+    url: location.href,
+    title: document.title,
+    timeOrigin: performance.timeOrigin || performance.timing.navigationStart,
+    navigation: rows(navigation),
+    resources: rows(performance.getEntriesByType('resource'))
+};
+"""
+
+# Browsers stop recording resources once their buffer fills. 250 is the
+# default Firefox and Chrome ship; a page can only raise it from its own
+# scripts, too late for the resources that loaded before them
+BROWSER_BUFFER_SIZE = 250
+
+CREATOR = {"name": "selenium_tests", "version": "1.0"}
+
+
+def _rows_to_entries(rows):
+    return [dict(zip(RESOURCE_FIELDS, row)) for row in rows or []]
+
+
+def _phase(entry, start, end):
+    """Milliseconds between two fields, -1 (HAR "not applicable") if either is missing"""
+    start_value, end_value = entry.get(start) or 0, entry.get(end) or 0
+    if not start_value or not end_value:
+        return -1
+    return round(max(end_value - start_value, 0), 2)
+
+
+def har_timings(entry):
+    """HAR timings for one Resource Timing entry"""
+    total = round(entry.get("duration") or 0, 2)
+    if not entry.get("requestStart"):
+        # Cross-origin without Timing-Allow-Origin: only the total is exposed
+        return {"blocked": -1, "dns": -1, "connect": -1, "ssl": -1, "send": 0, "wait": total, "receive": 0}, True
+
+    dns = _phase(entry, "domainLookupStart", "domainLookupEnd")
+    connect = _phase(entry, "connectStart", "connectEnd")
+    ssl = _phase(entry, "secureConnectionStart", "connectEnd")
+    wait = _phase(entry, "requestStart", "responseStart")
+    receive = _phase(entry, "responseStart", "responseEnd")
+    # Queueing and redirects: whatever precedes the request not spent on DNS/connect
+    blocked = round(max(entry["requestStart"] - entry["startTime"] - max(dns, 0) - max(connect, 0), 0), 2)
+    return {
+        "blocked": blocked,
+        "dns": dns,
+        # HAR's connect includes the TLS handshake, reported again under ssl
+        "connect": connect,
+        "ssl": ssl,
+        "send": 0,
+        "wait": max(wait, 0),
+        "receive": max(receive, 0)
+    }, False
+
+
+def resource_row(entry):
+    """Flat per-resource record used by the summary and the HAR entry"""
+    timings, opaque = har_timings(entry)
+    return {
+        "url": entry["name"],
+        "initiator_type": entry.get("initiatorType") or "other",
+        "start_ms": round(entry.get("startTime") or 0, 2),
+        "duration_ms": round(entry.get("duration") or 0, 2),
+        # 0 transfer with a body means a cache hit (or a hidden cross-origin size)
+        "transfer_size": entry.get("transferSize") or 0,
+        "encoded_size": entry.get("encodedBodySize") or 0,
+        "decoded_size": entry.get("decodedBodySize") or 0,
+        "protocol": entry.get("nextHopProtocol") or "",
+        "status": entry.get("responseStatus") or 0,
+        "timings": timings,
+        "opaque": opaque
+    }
+
+
+def _iso(epoch_ms):
+    return datetime.fromtimestamp(epoch_ms / 1000, tz=timezone.utc).isoformat(timespec="milliseconds")
+
+
+def har_entry(row, page_id, time_origin):
+    return {
+        "pageref": page_id,
+        "startedDateTime": _iso(time_origin + row["start_ms"]),
+        "time": row["duration_ms"],
+        "request": {
+            "method": "GET",
+            "url": row["url"],
+            "httpVersion": row["protocol"],
+            "cookies": [],
+            "headers": [],
+            "queryString": [],
+            "headersSize": -1,
+            "bodySize": -1
+        },
+        "response": {
+            "status": row["status"],
+            "statusText": "",
+            "httpVersion": row["protocol"],
+            "cookies": [],
+            "headers": [],
+            "content": {"size": row["decoded_size"], "mimeType": ""},
+            "redirectURL": "",
+            "headersSize": -1,
+            "bodySize": row["encoded_size"]
+        },
+        "cache": {},
+        "timings": row["timings"],
+        # Custom fields carry what HAR has no slot for
+        "_initiatorType": row["initiator_type"],
+        "_transferSize": row["transfer_size"]
+    }
+
+
+def summarize(rows, top=5):
+    """Top-N slowest and heaviest resources plus per-type totals"""
+    by_type = {}
+    for row in rows:
+        totals = by_type.setdefault(row["initiator_type"], {"count": 0, "transfer_size": 0})
+        totals["count"] += 1
+        totals["transfer_size"] += row["transfer_size"]
+
+    def brief(row):
+        return {
+            "url": row["url"],
+            "initiator_type": row["initiator_type"],
+            "duration_ms": row["duration_ms"],
+            "transfer_size": row["transfer_size"]
+        }
+
+    slowest = sorted(rows, key=lambda row: row["duration_ms"], reverse=True)[:top]
+    heaviest = sorted(rows, key=lambda row: row["transfer_size"] or row["encoded_size"], reverse=True)[:top]
+    return {
+        "resources": len(rows),
+        "transfer_size": sum(row["transfer_size"] for row in rows),
+        "by_type": by_type,
+        "slowest": [brief(row) for row in slowest],
+        "heaviest": [brief(row) for row in heaviest if (row["transfer_size"] or row["encoded_size"])]
+    }
+
+
+class WaterfallRecorder:
+    """Collect one waterfall per navigation and write them all to a single HAR file"""
+
+    def __init__(self, path="selenium_waterfall.har", top=5):
+        self.path = path
+        self.top = top
+        self.pages = []
+        self.entries = []
+        # Parallel page-load workers share one recorder
+        self.lock = threading.Lock()
+
+    def capture(self, driver, label=None):
+        """Read the current page's resources; returns its summary"""
+        data = driver.execute_script(RESOURCE_TIMING_SCRIPT, RESOURCE_FIELDS)
+        return self.add_page(data, label)
+
+    def add_page(self, data, label=None):
+        """Record one page from RESOURCE_TIMING_SCRIPT's result"""
+        navigation = _rows_to_entries(data.get("navigation"))
+        rows = [resource_row(entry) for entry in _rows_to_entries(data.get("resources"))]
+        time_origin = data.get("timeOrigin") or 0
+
+        with self.lock:
+            page_id = f"page_{len(self.pages) + 1}"
+            page_timings = {"onContentLoad": -1, "onLoad": -1}
+            if navigation:
+                document = navigation[0]
+                page_timings["onLoad"] = round(document.get("duration") or 0, 2) or -1
+                # The document itself is the first entry of the waterfall
+                rows.insert(0, dict(resource_row(document), initiator_type="document"))
+            self.pages.append({
+                "startedDateTime": _iso(time_origin),
+                "id": page_id,
+                "title": label or data.get("title") or data.get("url", ""),
+                "pageTimings": page_timings
+            })
+            self.entries.extend(har_entry(row, page_id, time_origin) for row in rows)
+
+        summary = summarize(rows, self.top)
+        summary["page"] = page_id
+        summary["url"] = data.get("url")
+        # A full buffer means later resources were silently dropped
+        summary["truncated"] = len(data.get("resources") or []) >= BROWSER_BUFFER_SIZE
+        return summary
+
+    def har(self):
+        with self.lock:
+            return {"log": {
+                "version": "1.2",
+                "creator": CREATOR,
+                "pages": list(self.pages),
+                "entries": list(self.entries)
+            }}
+
+    def save(self, path=None):
+        """Write the HAR compactly; returns the path or None when nothing was captured"""
+        path = path or self.path
+        if not self.pages:
+            return None
+        tmp = path + ".tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.har(), f, separators=(',', ':'))
+        os.replace(tmp, path)
+        return path
+
+
+def print_summary(summary):
+    print(f"🌊 {summary['url']}: {summary['resources']} resources, {summary['transfer_size']} bytes")
+    for row in summary["slowest"]:
+        print(f"   🐢 {row['duration_ms']:>8} ms  {row['initiator_type']:10} {row['url']}")
+    for row in summary["heaviest"]:
+        print(f"   🏋️  {row['transfer_size']:>8} B   {row['initiator_type']:10} {row['url']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize a HAR file written by WaterfallRecorder')
+    parser.add_argument('har', help='HAR file')
+    parser.add_argument('--top', type=int, default=5)
+    args = parser.parse_args()
+
+    with open(args.har, encoding='utf-8') as f:
+        log = json.load(f)["log"]
+    for page in log["pages"]:
+        rows = [
+            {
+                "url": entry["request"]["url"],
+                "initiator_type": entry.get("_initiatorType", "other"),
+                "duration_ms": entry["time"],
+                "transfer_size": entry.get("_transferSize", 0),
+                "encoded_size": entry["response"].get("bodySize", 0)
+            }
+            for entry in log["entries"] if entry["pageref"] == page["id"]
+        ]
+        summary = summarize(rows, args.top)
+        summary["url"] = page["title"]
+        print_summary(summary)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
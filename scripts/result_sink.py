@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Streaming JSON Lines result sink - one record per measurement, written as it completes
+"""
+
+import os
+import sys
+import json
+import uuid
+import queue
+import argparse
+import threading
+from datetime import datetime
+
+
+_STOP = object()
+
+
+class JSONLResultSink:
+    """Write measurement records to a .jsonl file from a background writer"""
+
+    def __init__(self, path, run_info=None):
+        self.path = path
+        # One run per stream so the file cannot grow without bound; the
+        # previous run is kept as <path>.1 and older ones are dropped
+        if os.path.exists(path):
+            os.replace(path, path + ".1")
+        self.run_id = uuid.uuid4().hex[:12]
+        self.records = 0
+        self.queue = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+        self._closed = False
+
+        header = {"type": "run", "run_id": self.run_id}
+        header.update(run_info or {})
+        self.queue.put(header)
+
+    def record(self, test, result, key=None):
+        """Queue one measurement; never blocks on disk"""
+        self.queue.put({
+            "type": "measurement",
+            "run_id": self.run_id,
+            "ts": datetime.now().isoformat(),
+            "test": test,
+            "key": key,
+            "result": result
+        })
+        self.records += 1
+
+    def meta(self, name, value):
+        """Queue a run-level value (e.g. session or pool stats)"""
+        self.queue.put({"type": "meta", "run_id": self.run_id, "name": name, "value": value})
+
+    def close(self):
+        """Flush everything queued so far and stop the writer"""
+        if self._closed:
+            return
+        self._closed = True
+        self.queue.put(_STOP)
+        self.writer.join()
+
+    def _write_loop(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            while True:
+                item = self.queue.get()
+                if item is _STOP:
+                    break
+                f.write(json.dumps(item, ensure_ascii=False, default=str) + "\n")
+                # Flush once the burst is drained so a crash loses at most
+                # the records still in the queue
+                if self.queue.empty():
+                    f.flush()
+            f.flush()
+
+
+def read_records(path, run_id=None):
+    """Return the records of one run (the last one by default)"""
+    runs = {}
+    last_run = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A crash can leave a half-written last line
+                continue
+            runs.setdefault(record.get("run_id"), []).append(record)
+            if record.get("type") == "run":
+                last_run = record.get("run_id")
+
+    return runs.get(run_id or last_run, [])
+
+
+def build_summary(path, run_id=None):
+    """Rebuild the legacy {timestamp, ..., tests: {...}} summary from a stream"""
+    summary = {}
+    for record in read_records(path, run_id):
+        kind = record.get("type")
+        if kind == "run":
+            summary.update({k: v for k, v in record.items() if k != "type"})
+        elif kind == "meta":
+            summary[record["name"]] = record["value"]
+        elif kind == "measurement":
+            tests = summary.setdefault("tests", {})
+            if record.get("key") is None:
+                tests[record["test"]] = record["result"]
+            else:
+                # Per-URL/per-domain results nest under the test name
+                tests.setdefault(record["test"], {})[record["key"]] = record["result"]
+    summary.pop("run_id", None)
+    summary.setdefault("tests", {})
+    return summary
+
+
+def write_summary(jsonl_path, json_path, run_id=None, ensure_ascii=False):
+    """Write the legacy summary JSON for a stream"""
+    summary = build_summary(jsonl_path, run_id)
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=ensure_ascii)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a summary JSON from a results stream')
+    parser.add_argument('stream', help='Path to a *.jsonl results stream')
+    parser.add_argument('-o', '--output', help='Summary JSON path (default: stream name with .json)')
+    parser.add_argument('--run-id', help='Run to summarise (default: the last one)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.stream):
+        print(f"❌ No such stream: {args.stream}")
+        return 1
+
+    output = args.output or os.path.splitext(args.stream)[0] + '.json'
+    summary = write_summary(args.stream, output, args.run_id)
+    print(f"📊 {len(summary['tests'])} tests summarised to: {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
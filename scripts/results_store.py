@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Historical results store - every run appended to SQLite, with trend queries
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+from datetime import datetime, timedelta
+
+from latency_prober import percentile
+from user_dirs import DATA_DIR
+
+
+DEFAULT_DB = os.path.join(DATA_DIR, "results.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT UNIQUE,
+    suite TEXT NOT NULL,
+    environment TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    info TEXT
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    run INTEGER NOT NULL REFERENCES runs(id),
+    suite TEXT NOT NULL,
+    test TEXT NOT NULL,
+    target TEXT,
+    environment TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    status TEXT,
+    metric TEXT,
+    value_ms REAL,
+    result TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_measurements_test_target_time ON measurements(test, target, timestamp);
+CREATE INDEX IF NOT EXISTS idx_measurements_environment_time ON measurements(environment, timestamp);
+CREATE INDEX IF NOT EXISTS idx_measurements_time ON measurements(timestamp);
+CREATE INDEX IF NOT EXISTS idx_runs_suite_time ON runs(suite, timestamp);
+"""
+
+# The headline timing of each result type and its scale to milliseconds,
+# in priority order
+TIMING_METRICS = [
+    ("load_time_seconds", 1000),
+    ("latency_ms", 1),
+    ("resolve_time_ms", 1),
+    ("ready_ms", 1),
+    ("load_time", 1000),
+    ("wall_time_seconds", 1000)
+]
+
+
+def detect_environment():
+    """github_actions, termux or local (as GitHubSeleniumRunner.detect_environment)"""
+    if os.getenv('GITHUB_ACTIONS') == 'true':
+        return "github_actions"
+    elif os.path.exists('/data/data/com.termux/files/home'):
+        return "termux"
+    else:
+        return "local"
+
+
+def headline_timing(result):
+    """(metric, value_ms) for a result dict, (None, None) if it has no timing"""
+    for metric, scale in TIMING_METRICS:
+        value = result.get(metric)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return metric, value * scale
+    return None, None
+
+
+def flatten_tests(tests):
+    """Yield (test, target, result) from the legacy tests layout"""
+    for test, value in tests.items():
+        if not isinstance(value, dict):
+            continue
+        if "status" in value:
+            yield test, None, value
+        else:
+            for target, result in value.items():
+                if isinstance(result, dict):
+                    yield test, target, result
+
+
+def default_db():
+    """History path: SELENIUM_TESTS_DB if set (read per call), else DEFAULT_DB"""
+    return os.environ.get("SELENIUM_TESTS_DB") or DEFAULT_DB
+
+
+class ResultsStore:
+    """SQLite history of runs and their per-target measurements"""
+
+    def __init__(self, path=None):
+        path = path or default_db()
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets a query CLI read while a runner appends
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def append_run(self, suite, results, environment=None, run_id=None):
+        """Store one run in the legacy results layout; returns measurements stored"""
+        environment = environment or detect_environment()
+        timestamp = results.get("timestamp") or datetime.now().isoformat()
+        info = {key: value for key, value in results.items() if key not in ("tests", "timestamp")}
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (run_id, suite, environment, timestamp, info) VALUES (?, ?, ?, ?, ?)",
+                (run_id, suite, environment, timestamp, json.dumps(info, default=str))
+            )
+            run = cursor.lastrowid
+            rows = []
+            for test, target, result in flatten_tests(results.get("tests", {})):
+                metric, value_ms = headline_timing(result)
+                rows.append((run, suite, test, target, environment, timestamp,
+                             result.get("status"), metric, value_ms, json.dumps(result, default=str)))
+            self.conn.executemany(
+                "INSERT INTO measurements (run, suite, test, target, environment, timestamp, "
+                "status, metric, value_ms, result) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return len(rows)
+
+    def _where(self, test=None, target=None, environment=None, days=None):
+        clauses = ["value_ms IS NOT NULL", "status = 'success'"]
+        params = []
+        for column, value in (("test", test), ("target", target), ("environment", environment)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if days is not None:
+            clauses.append("timestamp >= ?")
+            params.append((datetime.now() - timedelta(days=days)).isoformat())
+        return " AND ".join(clauses), params
+
+    def samples(self, test=None, target=None, environment=None, days=None):
+        """(timestamp, target, value_ms) rows, oldest first"""
+        where, params = self._where(test, target, environment, days)
+        return self.conn.execute(
+            f"SELECT timestamp, target, value_ms FROM measurements WHERE {where} ORDER BY timestamp",
+            params
+        ).fetchall()
+
+    def trend(self, test=None, target=None, environment=None, days=30, bucket="day"):
+        """Count/p50/p90 per day (or hour) bucket"""
+        width = 13 if bucket == "hour" else 10
+        buckets = {}
+        for row in self.samples(test, target, environment, days):
+            buckets.setdefault(row["timestamp"][:width], []).append(row["value_ms"])
+        return [
+            {
+                "bucket": key,
+                "count": len(values),
+                "p50_ms": round(percentile(sorted(values), 50), 2),
+                "p90_ms": round(percentile(sorted(values), 90), 2)
+            }
+            for key, values in sorted(buckets.items())
+        ]
+
+    def moving_percentiles(self, test=None, target=None, environment=None, days=30, window=20):
+        """p50/p90 over a sliding window of the most recent samples"""
+        rows = self.samples(test, target, environment, days)
+        values = [row["value_ms"] for row in rows]
+        moving = []
+        for i in range(len(values)):
+            recent = sorted(values[max(0, i - window + 1):i + 1])
+            moving.append({
+                "timestamp": rows[i]["timestamp"],
+                "value_ms": round(values[i], 2),
+                "p50_ms": round(percentile(recent, 50), 2),
+                "p90_ms": round(percentile(recent, 90), 2)
+            })
+        return moving
+
+    def slowest(self, test=None, environment=None, days=7, top=10):
+        """Targets ranked by median timing over the window"""
+        by_target = {}
+        for row in self.samples(test, None, environment, days):
+            by_target.setdefault(row["target"] or "(suite)", []).append(row["value_ms"])
+        ranked = [
+            {
+                "target": target,
+                "count": len(values),
+                "p50_ms": round(percentile(sorted(values), 50), 2),
+                "max_ms": round(max(values), 2)
+            }
+            for target, values in by_target.items()
+        ]
+        ranked.sort(key=lambda entry: entry["p50_ms"], reverse=True)
+        return ranked[:top]
+
+    def close(self):
+        self.conn.close()
+
+
+def store_run(suite, results, run_id=None, path=None):
+    """Append a run to the history; never lets history break a test run"""
+    if os.environ.get("SELENIUM_TESTS_NO_HISTORY"):
+        return None
+    try:
+        store = ResultsStore(path)
+        try:
+            return store.append_run(suite, results, run_id=run_id)
+        finally:
+            store.close()
+    except (sqlite3.Error, OSError) as e:
+        print(f"⚠️  Could not append results to history: {e}")
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the historical results store')
+    parser.add_argument('query', choices=['trend', 'percentiles', 'slowest'])
+    parser.add_argument('--db', default=None, help=f'History database (default: $SELENIUM_TESTS_DB or {DEFAULT_DB})')
+    parser.add_argument('--test', help='Test name, e.g. network_speed or latency')
+    parser.add_argument('--target', help='URL, domain or other result key')
+    parser.add_argument('--environment', choices=['github_actions', 'termux', 'local'])
+    parser.add_argument('--days', type=float, default=7, help='Time window in days')
+    parser.add_argument('--bucket', choices=['day', 'hour'], default='day')
+    parser.add_argument('--window', type=int, default=20, help='Samples per moving percentile')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    store = ResultsStore(args.db)
+    try:
+        if args.query == 'trend':
+            rows = store.trend(args.test, args.target, args.environment, args.days, args.bucket)
+            print(f"{'bucket':14} {'count':>6} {'p50 ms':>10} {'p90 ms':>10}")
+            for row in rows:
+                print(f"{row['bucket']:14} {row['count']:>6} {row['p50_ms']:>10} {row['p90_ms']:>10}")
+        elif args.query == 'percentiles':
+            rows = store.moving_percentiles(args.test, args.target, args.environment, args.days, args.window)
+            print(f"{'timestamp':26} {'value ms':>10} {'p50 ms':>10} {'p90 ms':>10}")
+            for row in rows:
+                print(f"{row['timestamp']:26} {row['value_ms']:>10} {row['p50_ms']:>10} {row['p90_ms']:>10}")
+        else:
+            rows = store.slowest(args.test, args.environment, args.days, args.top)
+            print(f"{'p50 ms':>10} {'max ms':>10} {'count':>6}  target")
+            for row in rows:
+                print(f"{row['p50_ms']:>10} {row['max_ms']:>10} {row['count']:>6}  {row['target']}")
+        if not rows:
+            print("(no matching measurements)")
+    finally:
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
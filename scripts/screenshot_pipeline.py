@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Screenshot pipeline - capture on the test thread, decode/resize/store on a worker
+"""
+
+import io
+import os
+import time
+import base64
+import hashlib
+
+
+DEFAULT_DIR = "screenshots"
+
+# Document size, for browsers without a native full-page capture
+PAGE_SIZE_SCRIPT = """
+return [
+    Math.max(document.documentElement.scrollWidth, document.body ? document.body.scrollWidth : 0),
+    Math.max(document.documentElement.scrollHeight, document.body ? document.body.scrollHeight : 0)
+];
+"""
+
+
+def capture_base64(driver, full_page=False):
+    """One WebDriver screenshot as base64 PNG; returns (data, full_page used)"""
+    if not full_page:
+        return driver.get_screenshot_as_base64(), False
+
+    # Firefox captures the whole document in one command
+    native = getattr(driver, "get_full_page_screenshot_as_base64", None)
+    if native is not None:
+        return native(), True
+
+    # Otherwise grow the window to the document, capture, and put it back
+    original = driver.get_window_size()
+    width, height = driver.execute_script(PAGE_SIZE_SCRIPT)
+    try:
+        driver.set_window_size(max(width, original["width"]), max(height, original["height"]))
+        return driver.get_screenshot_as_base64(), True
+    finally:
+        driver.set_window_size(original["width"], original["height"])
+
+
+def process_frame(data, output_dir, max_width=None, image_format="png", quality=80):
+    """Decode, optionally downscale/recompress, and store under its content hash"""
+    start_time = time.perf_counter()
+    raw = base64.b64decode(data)
+    decode_ms = (time.perf_counter() - start_time) * 1000
+
+    encoded, extension, size = raw, "png", None
+    encode_start = time.perf_counter()
+    if max_width or image_format != "png":
+        try:
+            from PIL import Image
+        except ImportError:
+            # Without Pillow the PNG is stored as captured
+            Image = None
+        if Image is not None:
+            with Image.open(io.BytesIO(raw)) as image:
+                if max_width and image.width > max_width:
+                    height = round(image.height * max_width / image.width)
+                    image = image.resize((max_width, height), Image.LANCZOS)
+                buffer = io.BytesIO()
+                if image_format == "png":
+                    image.save(buffer, "PNG", optimize=True)
+                else:
+                    # JPEG and WebP have no alpha channel to keep
+                    image.convert("RGB").save(buffer, image_format.upper(), quality=quality)
+                encoded, extension, size = buffer.getvalue(), image_format, image.size
+    encode_ms = (time.perf_counter() - encode_start) * 1000
+
+    write_start = time.perf_counter()
+    digest = hashlib.sha256(encoded).hexdigest()
+    path = os.path.join(output_dir, f"{digest[:16]}.{extension}")
+    # Identical frames share one file
+    duplicate = os.path.exists(path)
+    if not duplicate:
+        os.makedirs(output_dir, exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(encoded)
+        os.replace(tmp, path)
+    write_ms = (time.perf_counter() - write_start) * 1000
+
+    return {
+        "file": path,
+        "sha256": digest,
+        "bytes": len(encoded),
+        "captured_bytes": len(raw),
+        "size": list(size) if size else None,
+        "duplicate": duplicate,
+        "decode_ms": round(decode_ms, 2),
+        "encode_ms": round(encode_ms, 2),
+        "write_ms": round(write_ms, 2)
+    }
+
+
+class ScreenshotPipeline:
+    """Hand captured frames to background workers so the test loop keeps going"""
+
+    def __init__(self, output_dir=DEFAULT_DIR, max_width=None, image_format="png",
+                 quality=80, workers=1):
+        self.output_dir = output_dir
+        # Downscale wider frames to this width (needs Pillow)
+        self.max_width = max_width
+        # "png", "jpeg" or "webp"; anything but png needs Pillow
+        self.image_format = image_format
+        self.quality = quality
+        self.workers = workers
+        # Started on the first capture, so runners that never screenshot
+        # create no thread and skip importing concurrent.futures
+        self.executor = None
+        self.pending = []
+
+    def capture(self, driver, name=None, full_page=False):
+        """Take a screenshot now and queue its processing; returns a Future"""
+        start_time = time.perf_counter()
+        data, full_page = capture_base64(driver, full_page)
+        capture_ms = (time.perf_counter() - start_time) * 1000
+
+        def work():
+            result = process_frame(data, self.output_dir, self.max_width, self.image_format, self.quality)
+            result.update({"name": name, "full_page": full_page, "capture_ms": round(capture_ms, 2)})
+            return result
+
+        if self.executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="screenshot")
+        future = self.executor.submit(work)
+        self.pending.append(future)
+        return future
+
+    def drain(self, timeout=None):
+        """Wait for every queued frame; returns their results in capture order"""
+        results = []
+        for future in self.pending:
+            try:
+                results.append(future.result(timeout))
+            except Exception as e:
+                results.append({"status": "error", "error": str(e)})
+        self.pending = []
+        return results
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
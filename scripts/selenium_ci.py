@@ -7,12 +7,45 @@ import os
 import sys
 import json
 import argparse
+import importlib.util
 import time
 from datetime import datetime
 
+from browser_discovery import discover, find_geckodriver, is_ready, print_report
+from driver_session import shared_session
+from lean_profile import LeanProfile
+from navigation_timing import collect_navigation_timing
+from profile_template import ProfileTemplate
+from readiness import DocumentReady, ElementPresent, PAGE_LOAD_STRATEGIES, navigate
+from result_sink import JSONLResultSink, write_summary
+from screenshot_pipeline import ScreenshotPipeline
+from target_urls import add_target_arguments, rewrite_url, start_targets
+from visual_diff import INSTALL_HINT, BaselineStore, missing_dependencies
+
 class GitHubSeleniumRunner:
-    def __init__(self, headless=True):
+    def __init__(self, headless=True, reuse_session=True, target_base_url=None,
+                 lean_profile=None, page_load_strategy="normal", profile_template=None,
+                 screenshots=None, visual_baseline=None, navigation_samples=5):
         self.headless = headless
+        # Loads of the navigation page, so the regression gate has samples to compare
+        self.navigation_samples = max(1, navigation_samples)
+        # BaselineStore to compare each stored screenshot with, or None
+        self.visual_baseline = visual_baseline
+        # ScreenshotPipeline that decodes and stores frames off the test thread;
+        # a default one is made on the first screenshot
+        self.screenshots = screenshots
+        self.pending_screenshots = []
+        # ProfileTemplate to start sessions from instead of a fresh profile
+        self.profile_template = profile_template
+        # "eager"/"none" return from get() early; each test waits for what it needs
+        self.page_load_strategy = page_load_strategy
+        # LeanProfile blocking images/fonts/media/trackers, or None for full loads
+        self.lean_profile = lean_profile
+        # Rewrite live URLs to a local target server when set
+        self.target_base_url = target_base_url
+        self.reuse_session = reuse_session
+        self.stream_file = "ci_test_results.jsonl"
+        self.sink = None
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "environment": self.detect_environment(),
@@ -37,6 +70,12 @@ class GitHubSeleniumRunner:
     
     def setup_selenium(self):
         """Setup Selenium based on environment"""
+        if self.reuse_session:
+            return shared_session.acquire(self.create_driver)
+        return self.create_driver()
+    
+    def create_driver(self):
+        """Start a new Firefox driver process"""
         print(f"🔧 Setting up Selenium for {self.results['environment']}...")
         
         try:
@@ -45,6 +84,7 @@ class GitHubSeleniumRunner:
             from selenium.webdriver.firefox.service import Service
             
             options = Options()
+            options.page_load_strategy = self.page_load_strategy
             
             if self.headless or self.is_github_actions():
                 options.add_argument("--headless")
@@ -55,13 +95,23 @@ class GitHubSeleniumRunner:
             options.add_argument("--disable-gpu")
             options.add_argument("--window-size=1920,1080")
             
+            if self.lean_profile:
+                self.lean_profile.apply(options)
+            if self.profile_template:
+                self.profile_template.apply(options)
+            
             # Environment-specific configurations
             if self.is_github_actions():
                 # GitHub Actions - use system geckodriver
                 service = Service('/usr/bin/geckodriver')
             else:
                 # Termux or local - try to find geckodriver
-                geckodriver_path = self.find_geckodriver()
+                report = self.check_browser()
+                if report["compatible"] is False:
+                    # Fail fast instead of paying for a doomed startup
+                    print(f"❌ {report['reason']}")
+                    return None
+                geckodriver_path = report["geckodriver"]["path"] or "geckodriver"
                 service = Service(executable_path=geckodriver_path)
             
             driver = webdriver.Firefox(service=service, options=options)
@@ -73,29 +123,12 @@ class GitHubSeleniumRunner:
             return None
     
     def find_geckodriver(self):
-        """Find geckodriver in common locations"""
-        possible_paths = [
-            '/usr/bin/geckodriver',
-            '/usr/local/bin/geckodriver',
-            os.path.expanduser('~/geckodriver'),
-            os.path.join(os.getcwd(), 'geckodriver')
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                return path
-        
-        # Try which command
-        import subprocess
-        try:
-            result = subprocess.run(['which', 'geckodriver'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
-            pass
-        
-        return 'geckodriver'  # Hope it's in PATH
+        """Find geckodriver via the cached discovery (no stat/which per call)"""
+        return find_geckodriver()
+    
+    def check_browser(self):
+        """Discovery report for geckodriver/Firefox, without launching anything"""
+        return discover()
     
     def run_ci_tests(self):
         """Run CI-optimized tests"""
@@ -105,50 +138,90 @@ class GitHubSeleniumRunner:
         if not driver:
             return self.results
         
+        # Stream every measurement to disk as it completes
+        self.sink = JSONLResultSink(self.stream_file, run_info={
+            "timestamp": self.results["timestamp"],
+            "environment": self.results["environment"],
+            "runner": self.results["runner"]
+        })
+        
         try:
             # Test 1: Basic navigation
             self.test_basic_navigation(driver)
             
-            # Test 2: Form interaction
+            # Test 2: Form interaction, from a clean session; the JavaScript
+            # test and the screenshot then run on the filled form
+            self.reset_session()
             self.test_form_interaction(driver)
             
             # Test 3: JavaScript execution
             self.test_javascript(driver)
             
-            # Test 4: Screenshot capability
+            # Test 4: Screenshot of the filled form; only the capture
+            # happens here, decode and write run on the pool
             if not self.is_github_actions():
                 self.test_screenshot(driver)
             
         finally:
-            driver.quit()
+            self.finish_screenshots()
+            if self.screenshots is not None:
+                self.screenshots.close()
+            self.release_driver(driver)
+            # Queued before the sink closes so it reaches the summary
+            if self.reuse_session:
+                self.record_meta("session", shared_session.report())
+            self.sink.close()
         
         self.save_results()
         return self.results
     
+    def target(self, url):
+        """Map a live URL onto the configured target server"""
+        return rewrite_url(url, self.target_base_url)
+    
+    def reset_session(self):
+        """Clear the shared driver's cookies and storage between tests"""
+        if self.reuse_session:
+            shared_session.reset()
+    
+    def release_driver(self, driver):
+        """Return the driver to the shared session or quit it"""
+        if self.reuse_session:
+            shared_session.release(driver)
+        else:
+            driver.quit()
+    
     def test_basic_navigation(self, driver):
         """Test basic web navigation"""
         print("🌐 Testing basic navigation...")
         
         try:
-            test_url = "https://httpbin.org/html"
-            driver.get(test_url)
+            test_url = self.target("https://httpbin.org/html")
+            samples_ms = []
+            for _ in range(self.navigation_samples):
+                timings = navigate(driver, test_url, DocumentReady("interactive"))
+                samples_ms.append(timings["ready_ms"])
             
             title = driver.title
             current_url = driver.current_url
             
-            self.results["tests"]["basic_navigation"] = {
+            self.record_result("basic_navigation", {
                 "status": "success",
                 "title": title,
                 "url": current_url,
+                "ready_ms": samples_ms[0],
+                "samples_ms": samples_ms,
+                "navigation_timing": collect_navigation_timing(driver),
                 "environment": self.results["environment"]
-            }
-            print(f"✅ Basic navigation: {title}")
+            })
+            print(f"✅ Basic navigation: {title} (ready in {min(samples_ms):.0f}-{max(samples_ms):.0f} ms "
+                  f"over {len(samples_ms)} loads)")
             
         except Exception as e:
-            self.results["tests"]["basic_navigation"] = {
+            self.record_result("basic_navigation", {
                 "status": "error",
                 "error": str(e)
-            }
+            })
             print(f"❌ Basic navigation failed: {e}")
     
     def test_form_interaction(self, driver):
@@ -156,7 +229,7 @@ class GitHubSeleniumRunner:
         print("📝 Testing form interaction...")
         
         try:
-            driver.get("https://httpbin.org/forms/post")
+            timings = navigate(driver, self.target("https://httpbin.org/forms/post"), ElementPresent("name", "custname"))
             
             # Find and interact with form elements
             from selenium.webdriver.common.by import By
@@ -171,18 +244,20 @@ class GitHubSeleniumRunner:
             input_field.send_keys("CI Test User")
             entered_text = input_field.get_attribute("value")
             
-            self.results["tests"]["form_interaction"] = {
+            self.record_result("form_interaction", {
                 "status": "success",
                 "entered_text": entered_text,
+                "ready_ms": timings["ready_ms"],
+                "navigation_timing": collect_navigation_timing(driver),
                 "environment": self.results["environment"]
-            }
+            })
             print(f"✅ Form interaction: Entered '{entered_text}'")
             
         except Exception as e:
-            self.results["tests"]["form_interaction"] = {
+            self.record_result("form_interaction", {
                 "status": "error",
                 "error": str(e)
-            }
+            })
             print(f"❌ Form interaction failed: {e}")
     
     def test_javascript(self, driver):
@@ -195,19 +270,19 @@ class GitHubSeleniumRunner:
                 "return {width: window.innerWidth, height: window.innerHeight};"
             )
             
-            self.results["tests"]["javascript"] = {
+            self.record_result("javascript", {
                 "status": "success",
                 "user_agent": result,
                 "window_size": window_size,
                 "environment": self.results["environment"]
-            }
+            })
             print(f"✅ JavaScript execution: {result[:50]}...")
             
         except Exception as e:
-            self.results["tests"]["javascript"] = {
+            self.record_result("javascript", {
                 "status": "error", 
                 "error": str(e)
-            }
+            })
             print(f"❌ JavaScript execution failed: {e}")
     
     def test_screenshot(self, driver):
@@ -218,28 +293,98 @@ class GitHubSeleniumRunner:
         print("📸 Testing screenshot...")
         
         try:
-            screenshot_path = "ci_screenshot.png"
-            driver.save_screenshot(screenshot_path)
-            
-            self.results["tests"]["screenshot"] = {
-                "status": "success",
-                "file": screenshot_path,
-                "environment": self.results["environment"]
-            }
-            print(f"✅ Screenshot saved: {screenshot_path}")
+            if self.screenshots is None:
+                self.screenshots = ScreenshotPipeline()
+            # Only the WebDriver round trip happens here; decode and write are queued
+            future = self.screenshots.capture(driver, name="ci_screenshot", full_page=True)
+            self.pending_screenshots.append(("screenshot", future))
+            print("✅ Screenshot captured, storing in the background")
             
         except Exception as e:
-            self.results["tests"]["screenshot"] = {
+            self.record_result("screenshot", {
                 "status": "error",
                 "error": str(e)
-            }
+            })
             print(f"❌ Screenshot failed: {e}")
     
+    def finish_screenshots(self):
+        """Wait for queued screenshots and record where they were stored"""
+        for test_name, future in self.pending_screenshots:
+            try:
+                stored = future.result(timeout=60)
+                self.record_result(test_name, dict(
+                    stored,
+                    status="success",
+                    environment=self.results["environment"]
+                ))
+                print(f"✅ Screenshot saved: {stored['file']} (capture {stored['capture_ms']} ms, "
+                      f"decode+encode+write {stored['decode_ms'] + stored['encode_ms'] + stored['write_ms']:.1f} ms)")
+            except Exception as e:
+                self.record_result(test_name, {
+                    "status": "error",
+                    "error": str(e)
+                })
+                print(f"❌ Screenshot failed: {e}")
+                continue
+            
+            if self.visual_baseline is not None:
+                self.test_visual_diff(stored)
+        self.pending_screenshots = []
+    
+    def test_visual_diff(self, stored):
+        """Compare a stored screenshot with its baseline"""
+        try:
+            diff = self.visual_baseline.check(stored["name"], stored["file"])
+            # A layout change is a failed check, not a crashed one
+            if diff["verdict"] == "changed":
+                diff = dict(diff, status="error", error=f"{diff['changed_ratio']:.2%} of pixels changed")
+            self.record_result("visual_diff", dict(diff, name=stored["name"]))
+            icon = "❌" if diff["verdict"] == "changed" else "✅"
+            print(f"{icon} Visual diff {stored['name']}: {diff['verdict']} "
+                  f"({len(diff.get('regions', []))} changed regions)")
+        except ImportError as e:
+            # Optional dependencies missing: nothing was compared, nothing failed
+            self.record_result("visual_diff", {
+                "status": "skipped",
+                "reason": str(e)
+            })
+            print(f"⏭️  Visual diff skipped: {e}")
+        except Exception as e:
+            self.record_result("visual_diff", {
+                "status": "error",
+                "error": str(e)
+            })
+            print(f"❌ Visual diff failed: {e}")
+    
+    def record_result(self, test_name, result, key=None):
+        """Store a result and stream it to the JSONL sink"""
+        if key is None:
+            self.results["tests"][test_name] = result
+        else:
+            self.results["tests"].setdefault(test_name, {})[key] = result
+        if self.sink is not None:
+            self.sink.record(test_name, result, key)
+    
+    def record_meta(self, name, value):
+        """Store a run-level value and stream it to the JSONL sink"""
+        self.results[name] = value
+        if self.sink is not None:
+            self.sink.meta(name, value)
+    
     def save_results(self):
         """Save test results"""
         filename = "ci_test_results.json"
-        with open(filename, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        if self.sink is not None:
+            # The summary is rebuilt from the stream written during the run
+            self.sink.close()
+            write_summary(self.sink.path, filename, ensure_ascii=True)
+        else:
+            with open(filename, 'w') as f:
+                json.dump(self.results, f, indent=2)
+        
+        # Keep a history across runs; the JSON file only holds the latest
+        from results_store import store_run
+        store_run("ci", self.results, run_id=self.sink.run_id if self.sink else None)
         
         # Print summary
         self.print_summary()
@@ -249,7 +394,10 @@ class GitHubSeleniumRunner:
         print("\n📈 CI TEST SUMMARY:")
         print("=" * 50)
         for test_name, result in self.results["tests"].items():
-            status = "✅ PASS" if result.get("status") == "success" else "❌ FAIL"
+            if result.get("status") == "skipped":
+                status = "⏭️  SKIP"
+            else:
+                status = "✅ PASS" if result.get("status") == "success" else "❌ FAIL"
             print(f"{test_name:20} {status}")
         
         print(f"\n🏁 Environment: {self.results['environment']}")
@@ -258,19 +406,69 @@ class GitHubSeleniumRunner:
 def main():
     parser = argparse.ArgumentParser(description='Selenium CI Runner')
     parser.add_argument('--check-only', action='store_true', 
-                       help='Only check Selenium availability')
+                       help='Only check Selenium availability (no browser launch)')
+    parser.add_argument('--launch-check', action='store_true',
+                       help='With --check-only, also start and stop a browser')
     parser.add_argument('--comprehensive', action='store_true',
                        help='Run comprehensive tests')
+    parser.add_argument('--lean', action='store_true',
+                       help='Block images, fonts, media and tracker hosts')
+    parser.add_argument('--page-load-strategy', choices=PAGE_LOAD_STRATEGIES, default='normal',
+                       help='WebDriver page load strategy for the session')
+    parser.add_argument('--profile-template', action='store_true',
+                       help='Start sessions from the cached Firefox profile template')
+    parser.add_argument('--screenshot-dir', default='screenshots',
+                       help='Directory for content-addressed screenshots')
+    parser.add_argument('--screenshot-max-width', type=int,
+                       help='Downscale screenshots wider than this (needs Pillow)')
+    parser.add_argument('--screenshot-format', choices=['png', 'jpeg', 'webp'], default='png',
+                       help='Recompress screenshots to this format (needs Pillow)')
+    parser.add_argument('--visual-baseline', metavar='DIR',
+                       help='Compare screenshots with baselines in DIR (needs numpy and Pillow)')
+    parser.add_argument('--update-visual-baseline', action='store_true',
+                       help='Replace the baselines with this run\'s screenshots')
+    parser.add_argument('--navigation-samples', type=int, default=5,
+                       help='Loads of the navigation page timed for the regression gate')
+    add_target_arguments(parser)
     
     args = parser.parse_args()
     
-    runner = GitHubSeleniumRunner(headless=True)
+    # numpy and Pillow are optional (requirements/requirements_visual.txt)
+    missing = missing_dependencies()
+    if args.visual_baseline and missing:
+        print(f"⏭️  Visual diff skipped: needs {' and '.join(missing)} ({INSTALL_HINT})")
+        args.visual_baseline = None
+    if (args.screenshot_max_width or args.screenshot_format != 'png') and "Pillow" in missing:
+        print(f"⚠️  Screenshots stored as captured PNG: resizing and recompression need Pillow ({INSTALL_HINT})")
     
-    if args.check_only:
+    target_base_url, _ = start_targets(args.local_targets, args.target_base_url)
+    runner = GitHubSeleniumRunner(
+        headless=True,
+        target_base_url=target_base_url,
+        lean_profile=LeanProfile() if args.lean else None,
+        page_load_strategy=args.page_load_strategy,
+        profile_template=ProfileTemplate() if args.profile_template else None,
+        screenshots=ScreenshotPipeline(args.screenshot_dir, args.screenshot_max_width, args.screenshot_format),
+        visual_baseline=BaselineStore(args.visual_baseline, update=args.update_visual_baseline)
+        if args.visual_baseline else None,
+        navigation_samples=args.navigation_samples
+    )
+    
+    if args.check_only and not args.launch_check:
+        report = runner.check_browser()
+        print_report(report)
+        if importlib.util.find_spec("selenium") is None:
+            print("❌ Selenium not installed")
+        elif is_ready(report):
+            print("✅ Selenium is available and working")
+            return 0
+        print("❌ Selenium is not available")
+        return 1
+    elif args.check_only:
         driver = runner.setup_selenium()
         if driver:
             print("✅ Selenium is available and working")
-            driver.quit()
+            runner.release_driver(driver)
             return 0
         else:
             print("❌ Selenium is not available")
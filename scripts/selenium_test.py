@@ -8,26 +8,62 @@ import os
 import sys
 import time
 import json
+import argparse
+import importlib.util
 from datetime import datetime
-from urllib.parse import urlparse
 
-try:
-    from selenium import webdriver
-    from selenium.webdriver.firefox.options import Options
-    from selenium.webdriver.firefox.service import Service
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from selenium.common.exceptions import TimeoutException, WebDriverException
-except ImportError as e:
-    print(f"❌ Selenium not installed: {e}")
-    print("Run: pip install selenium")
-    sys.exit(1)
+# Selenium itself is imported inside the methods that drive the browser,
+# so importing this module (or running --help) stays cheap
+from driver_session import shared_session
+from fetch_router import FetchRouter
+from lean_profile import LeanProfile, compare_profiles
+from page_extract import extract_page_info
+from profile_template import ProfileTemplate, startup_comparison
+from readiness import (
+    DocumentReady, ElementPresent, PAGE_LOAD_STRATEGIES, measure_readiness_savings, navigate
+)
+from page_load_benchmark import (
+    ParallelPageLoadBenchmark, measure_page_load, throughput_summary
+)
+from resource_waterfall import WaterfallRecorder, print_summary as print_waterfall
+from result_sink import JSONLResultSink, write_summary
+from step_scheduler import StepScheduler, driver_idle
+from target_urls import add_target_arguments, rewrite_url, start_targets
 
 
 class TermuxSeleniumTester:
-    def __init__(self, headless=True):
+    # What each test actually needs before it can start working on the page
+    READINESS = {
+        "google_search": ElementPresent("name", "q"),
+        "web_scraping": DocumentReady("interactive"),
+        "network_speed": DocumentReady("complete")
+    }
+    READINESS_URLS = {
+        "google_search": "https://www.google.com",
+        "web_scraping": "https://httpbin.org/html"
+    }
+    
+    def __init__(self, headless=True, reuse_session=True, page_load_workers=1,
+                 url_file=None, target_base_url=None, lean_profile=None,
+                 page_load_strategy="normal", readiness=None, profile_template=None,
+                 waterfall=None):
         self.headless = headless
+        # WaterfallRecorder exporting every navigation's resources as HAR, or None
+        self.waterfall = waterfall
+        # ProfileTemplate to start sessions from instead of a fresh profile
+        self.profile_template = profile_template
+        # "eager"/"none" return from get() early; READINESS decides the wait
+        self.page_load_strategy = page_load_strategy
+        self.readiness = dict(self.READINESS, **(readiness or {}))
+        # LeanProfile blocking images/fonts/media/trackers, or None for full loads
+        self.lean_profile = lean_profile
+        # Rewrite live URLs to a local target server when set
+        self.target_base_url = target_base_url
+        self.reuse_session = reuse_session
+        self.page_load_workers = page_load_workers
+        self.url_file = url_file
+        self.stream_file = "selenium_results.jsonl"
+        self.sink = None
         self.driver = None
         self.results = {
             "timestamp": datetime.now().isoformat(),
@@ -36,11 +72,30 @@ class TermuxSeleniumTester:
         
     def setup_driver(self):
         """Setup Firefox driver for Termux"""
+        if self.reuse_session:
+            self.driver = shared_session.acquire(self.create_driver)
+        else:
+            self.driver = self.create_driver()
+    
+    def create_driver(self, lean_profile=None, page_load_strategy=None, profile_template=None):
+        """Start a new Firefox driver process"""
         print("🚀 Setting up Firefox driver...")
         
+        if lean_profile is None:
+            lean_profile = self.lean_profile
+        if profile_template is None:
+            profile_template = self.profile_template
+        if page_load_strategy is None:
+            page_load_strategy = self.page_load_strategy
+        
         try:
+            from selenium import webdriver
+            from selenium.webdriver.firefox.options import Options
+            from selenium.webdriver.firefox.service import Service
+            
             # Firefox options for Termux
             options = Options()
+            options.page_load_strategy = page_load_strategy
             
             if self.headless:
                 options.add_argument("--headless")
@@ -55,6 +110,11 @@ class TermuxSeleniumTester:
             options.set_preference("general.useragent.override", 
                                  "Mozilla/5.0 (Linux; Android 10; Termux) AppleWebKit/537.36")
             
+            if lean_profile:
+                lean_profile.apply(options)
+            if profile_template:
+                profile_template.apply(options)
+            
             # Setup service
             service = Service(
                 executable_path=os.path.join(os.path.expanduser("~"), "geckodriver"),
@@ -62,8 +122,9 @@ class TermuxSeleniumTester:
             )
             
             # Create driver
-            self.driver = webdriver.Firefox(service=service, options=options)
+            driver = webdriver.Firefox(service=service, options=options)
             print("✅ Firefox driver started successfully!")
+            return driver
             
         except Exception as e:
             print(f"❌ Failed to start driver: {e}")
@@ -74,7 +135,11 @@ class TermuxSeleniumTester:
         print("\n🔍 Testing Google Search...")
         
         try:
-            self.driver.get("https://www.google.com")
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+            
+            navigate(self.driver, self.target("https://www.google.com"), self.readiness["google_search"])
             
             # Wait for page to load
             wait = WebDriverWait(self.driver, 10)
@@ -105,123 +170,285 @@ class TermuxSeleniumTester:
             }
             
             print(f"✅ Google search successful! Found {result_count} results")
-            self.results["tests"]["google_search"] = test_result
+            self.record_result("google_search", test_result)
             return test_result
             
         except Exception as e:
             error_msg = f"Google search failed: {str(e)}"
             print(f"❌ {error_msg}")
-            self.results["tests"]["google_search"] = {
+            self.record_result("google_search", {
                 "status": "error",
                 "error": error_msg
-            }
+            })
             return None
     
     def test_web_scraping(self, url="https://httpbin.org/html"):
         """Test basic web scraping"""
+        url = self.target(url)
         print(f"\n🕸️ Testing web scraping: {url}")
         
         try:
-            self.driver.get(url)
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support.ui import WebDriverWait
+            from selenium.webdriver.support import expected_conditions as EC
+            
+            navigate(self.driver, url, self.readiness["web_scraping"])
             
             # Wait for page load
             WebDriverWait(self.driver, 10).until(
                 EC.presence_of_element_located((By.TAG_NAME, "body"))
             )
             
-            # Extract page information
-            page_info = {
-                "title": self.driver.title,
-                "url": self.driver.current_url,
-                "content_length": len(self.driver.page_source),
-                "headers": list(self.driver.get_cookies())[:3]  # First 3 cookies
-            }
-            
-            # Try to extract some text content
-            try:
-                paragraphs = self.driver.find_elements(By.TAG_NAME, "p")
-                page_info["paragraph_count"] = len(paragraphs)
-                
-                if paragraphs:
-                    page_info["sample_text"] = paragraphs[0].text[:100] + "..." if len(paragraphs[0].text) > 100 else paragraphs[0].text
-            except:
-                page_info["paragraph_count"] = 0
+            # Title, URL, sizes and paragraphs in one round trip, cookies in a second
+            page_info, round_trips = extract_page_info(self.driver)
             
             test_result = {
                 "status": "success",
-                "page_info": page_info
+                "page_info": page_info,
+                "round_trips": round_trips
             }
+            if self.waterfall is not None:
+                try:
+                    test_result["waterfall"] = self.waterfall.capture(self.driver)
+                except Exception as e:
+                    test_result["waterfall_error"] = str(e)
             
-            print(f"✅ Web scraping successful! Title: '{self.driver.title}'")
-            self.results["tests"]["web_scraping"] = test_result
+            print(f"✅ Web scraping successful! Title: '{page_info['title']}' "
+                  f"({round_trips['commands_saved']} commands, ~{round_trips['bytes_saved']} bytes saved)")
+            self.record_result("web_scraping", test_result)
             return test_result
             
         except Exception as e:
             error_msg = f"Web scraping failed: {str(e)}"
             print(f"❌ {error_msg}")
-            self.results["tests"]["web_scraping"] = {
+            self.record_result("web_scraping", {
                 "status": "error", 
                 "error": error_msg
-            }
+            })
             return None
     
-    def test_network_speed(self):
+    def test_network_speed(self, test_urls=None):
         """Test page load speed"""
         print("\n⚡ Testing page load speed...")
         
-        test_urls = [
-            "https://www.google.com",
-            "https://httpbin.org/html", 
-            "https://example.com"
-        ]
+        if test_urls is None:
+            test_urls = [
+                "https://www.google.com",
+                "https://httpbin.org/html", 
+                "https://example.com"
+            ]
+        test_urls = [self.target(url) for url in test_urls]
+        
+        if self.page_load_workers > 1:
+            # Worker 0 reuses our driver, the others start their own
+            benchmark = ParallelPageLoadBenchmark(
+                self.create_driver,
+                workers=self.page_load_workers,
+                primary_driver=self.driver,
+                on_result=lambda url, result: self.record_result("network_speed", result, key=url),
+                ready=self.readiness["network_speed"],
+                waterfall=self.waterfall
+            )
+            speed_results, throughput = benchmark.run(test_urls)
+            self.results["tests"]["network_speed"] = speed_results
+            self.record_result("network_speed_throughput", throughput)
+            print(f"📊 Throughput: {throughput['pages_per_minute']} pages/min "
+                  f"with {throughput['workers']} workers")
+            return speed_results
         
         speed_results = {}
+        start_time = time.time()
         
         for url in test_urls:
-            try:
-                start_time = time.time()
-                self.driver.get(url)
-                
-                # Wait for page to be interactive
-                WebDriverWait(self.driver, 15).until(
-                    lambda driver: driver.execute_script("return document.readyState") == "complete"
-                )
-                
-                load_time = time.time() - start_time
-                speed_results[url] = {
-                    "load_time_seconds": round(load_time, 2),
-                    "status": "success"
-                }
-                
-                print(f"✅ {url}: {load_time:.2f}s")
-                
-            except Exception as e:
-                speed_results[url] = {
-                    "load_time_seconds": None,
-                    "status": "error",
-                    "error": str(e)
-                }
-                print(f"❌ {url}: Failed - {e}")
+            speed_results[url] = measure_page_load(self.driver, url, ready=self.readiness["network_speed"],
+                                                   waterfall=self.waterfall)
+            self.record_result("network_speed", speed_results[url], key=url)
+            
+            if speed_results[url]["status"] == "success":
+                print(f"✅ {url}: {speed_results[url]['load_time_seconds']:.2f}s")
+                if "waterfall" in speed_results[url]:
+                    print_waterfall(speed_results[url]["waterfall"])
+            else:
+                print(f"❌ {url}: Failed - {speed_results[url]['error']}")
         
-        self.results["tests"]["network_speed"] = speed_results
+        wall_time = time.time() - start_time
+        self.record_result("network_speed_throughput", throughput_summary(
+            speed_results, wall_time, workers=1
+        ))
         return speed_results
     
-    def run_all_tests(self):
+    def test_hybrid_fetch(self, test_urls=None):
+        """Fetch pages over plain HTTP, using the browser only when they need it"""
+        print("\n🔀 Testing hybrid HTTP/browser fetching...")
+        
+        if test_urls is None:
+            test_urls = [
+                "https://httpbin.org/html",
+                "https://httpbin.org/json",
+                "https://example.com",
+                "https://www.google.com"
+            ]
+        
+        # The fallback borrows this tester's warm driver instead of starting another
+        router = FetchRouter(self.create_driver, ready=self.readiness["web_scraping"], driver=self.driver)
+        try:
+            for url in [self.target(url) for url in test_urls]:
+                result, _ = router.fetch(url)
+                self.record_result("hybrid_fetch", result, key=url)
+                if result["status"] != "success":
+                    print(f"❌ {url}: {result['error']}")
+                elif result["route"] == "browser":
+                    print(f"🦊 {url}: browser ({result['reason']}) in {result['total_ms']:.0f} ms")
+                else:
+                    print(f"⚡ {url}: HTTP in {result['total_ms']:.0f} ms")
+        finally:
+            router.close()
+        
+        report = router.report()
+        self.record_result("hybrid_fetch_summary", report)
+        if report["no_browser_share"] is not None:
+            print(f"📊 {report['no_browser_share']:.0%} of pages without a browser, "
+                  f"time saved: {report['time_saved_ms']} ms")
+        return report
+    
+    def test_profile_comparison(self, test_urls=None):
+        """Compare page loads with the full and the lean profile"""
+        print("\n🪶 Comparing full and lean browser profiles...")
+        
+        if test_urls is None:
+            test_urls = ["https://httpbin.org/html", "https://example.com"]
+        test_urls = [self.target(url) for url in test_urls]
+        
+        full_driver = lean_driver = None
+        try:
+            # Fresh browsers so neither profile benefits from the other's cache
+            full_driver = self.create_driver(lean_profile=False)
+            lean_driver = self.create_driver(lean_profile=self.lean_profile or LeanProfile())
+            comparison, totals = compare_profiles(full_driver, lean_driver, test_urls)
+            
+            for url, entry in comparison.items():
+                self.record_result("lean_profile", entry, key=url)
+                if entry["status"] == "success":
+                    print(f"✅ {url}: {entry['seconds_saved']:+.2f}s, "
+                          f"{entry.get('bytes_saved', 'n/a')} bytes saved")
+                else:
+                    print(f"❌ {url}: {entry['error']}")
+            
+            totals["status"] = "success"
+            self.record_result("lean_profile_totals", totals)
+            print(f"📊 Lean profile saved {totals['seconds_saved']}s and "
+                  f"{totals['bytes_saved']} bytes over {totals['pages']} pages")
+            return totals
+            
+        except Exception as e:
+            print(f"❌ Profile comparison failed: {e}")
+            self.record_result("lean_profile_totals", {"status": "error", "error": str(e)})
+            return None
+        finally:
+            for driver in (full_driver, lean_driver):
+                if driver:
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+    
+    def test_startup_comparison(self, runs=3):
+        """Compare driver cold start with and without the profile template"""
+        print("\n🧊 Comparing driver startup with the profile template...")
+        
+        try:
+            template = self.profile_template or ProfileTemplate()
+            result = startup_comparison(
+                lambda: self.create_driver(profile_template=False),
+                lambda: self.create_driver(profile_template=template),
+                runs=runs
+            )
+            print(f"✅ Startup: {result['default_startup_ms']} ms fresh profile, "
+                  f"{result['template_startup_ms']} ms from template ({result['saved_ms']} ms saved)")
+            self.record_result("profile_template_startup", result)
+            return result
+            
+        except Exception as e:
+            print(f"❌ Startup comparison failed: {e}")
+            self.record_result("profile_template_startup", {"status": "error", "error": str(e)})
+            return None
+    
+    def test_readiness_savings(self):
+        """Measure time saved by waiting for each test's condition instead of the load event"""
+        print("\n⏱️ Measuring readiness savings...")
+        
+        # Only a "none" session lets us observe both points in one load
+        driver = self.driver if self.page_load_strategy == "none" else None
+        owns_driver = driver is None
+        savings = {}
+        
+        try:
+            if owns_driver:
+                driver = self.create_driver(page_load_strategy="none")
+            
+            for test_name, url in self.READINESS_URLS.items():
+                result = measure_readiness_savings(driver, self.target(url), self.readiness[test_name])
+                result["url"] = self.target(url)
+                savings[test_name] = result
+                self.record_result("readiness_savings", result, key=test_name)
+                
+                if result["status"] == "success":
+                    print(f"✅ {test_name}: ready {result['ready_ms']} ms vs complete "
+                          f"{result['complete_ms']} ms ({result['condition']})")
+                else:
+                    print(f"❌ {test_name}: {result['error']}")
+            
+            return savings
+            
+        except Exception as e:
+            print(f"❌ Readiness measurement failed: {e}")
+            self.record_result("readiness_savings", {"status": "error", "error": str(e)})
+            return None
+        finally:
+            if owns_driver and driver:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
+    
+    def run_all_tests(self, compare_profiles=False, readiness_report=False, compare_startup=False,
+                      hybrid=False):
         """Run all selenium tests"""
         print("🎯 Starting Selenium Test Suite...")
         print("=" * 50)
         
+        # Stream every measurement to disk as it completes
+        self.sink = JSONLResultSink(self.stream_file, run_info={"timestamp": self.results["timestamp"]})
+        
         try:
             self.setup_driver()
             
-            # Run tests
-            self.test_google_search()
-            time.sleep(2)  # Brief pause between tests
+            # Run tests back to back; each waits only for the browser to go idle.
+            # With eager/none the next get() simply abandons the old page.
+            idle = driver_idle(self.driver) if self.page_load_strategy == "normal" else None
+            # Later browser steps start from a clean session, not the previous step's cookies
+            reset = shared_session.reset if self.reuse_session else None
+            scheduler = StepScheduler()
+            scheduler.add("google_search", self.test_google_search)
+            scheduler.add("web_scraping", self.test_web_scraping, ready=idle, setup=reset,
+                          replaces_pause=True)
+            scheduler.add("network_speed", lambda: self.test_network_speed(self.load_url_list()),
+                          ready=idle, setup=reset, replaces_pause=True)
+            if compare_profiles:
+                scheduler.add("lean_profile", lambda: self.test_profile_comparison(self.load_url_list()))
+            if readiness_report:
+                scheduler.add("readiness_savings", self.test_readiness_savings)
+            if compare_startup:
+                scheduler.add("profile_template_startup", self.test_startup_comparison)
+            if hybrid:
+                scheduler.add("hybrid_fetch", lambda: self.test_hybrid_fetch(self.load_url_list()),
+                              ready=idle, setup=reset)
+            scheduler.run()
             
-            self.test_web_scraping()
-            time.sleep(2)
+            self.record_meta("scheduler", scheduler.report())
             
-            self.test_network_speed()
+            if self.reuse_session:
+                self.record_meta("session", shared_session.report())
             
             # Save results
             self.save_results()
@@ -236,17 +463,63 @@ class TermuxSeleniumTester:
             print(f"💥 Test suite failed: {e}")
             return None
         finally:
+            if self.sink is not None:
+                self.sink.close()
             self.cleanup()
     
+    def target(self, url):
+        """Map a live URL onto the configured target server"""
+        return rewrite_url(url, self.target_base_url)
+    
+    def load_url_list(self):
+        """Read benchmark URLs from url_file (one per line), if set"""
+        if not self.url_file:
+            return None
+        with open(self.url_file, encoding='utf-8') as f:
+            return [line.strip() for line in f if line.strip() and not line.startswith('#')]
+    
+    def record_result(self, test_name, result, key=None):
+        """Store a result and stream it to the JSONL sink"""
+        if key is None:
+            self.results["tests"][test_name] = result
+        else:
+            self.results["tests"].setdefault(test_name, {})[key] = result
+        if self.sink is not None:
+            self.sink.record(test_name, result, key)
+    
+    def record_meta(self, name, value):
+        """Store a run-level value and stream it to the JSONL sink"""
+        self.results[name] = value
+        if self.sink is not None:
+            self.sink.meta(name, value)
+    
     def save_results(self):
         """Save test results to JSON file"""
         filename = "selenium_results.json"
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        if self.sink is not None:
+            # The summary is rebuilt from the stream written during the run
+            self.sink.close()
+            write_summary(self.sink.path, filename)
+        else:
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.results, f, indent=2, ensure_ascii=False)
+        
+        if self.waterfall is not None:
+            har_file = self.waterfall.save()
+            if har_file:
+                print(f"🌊 Resource waterfall saved to: {har_file}")
+        
+        # Keep a history across runs; the JSON file only holds the latest
+        from results_store import store_run
+        store_run("selenium", self.results, run_id=self.sink.run_id if self.sink else None)
     
     def cleanup(self):
         """Clean up resources"""
-        if self.driver:
+        if self.driver and self.reuse_session:
+            # Keep the warm browser for the next suite in this process
+            shared_session.release(self.driver)
+            self.driver = None
+        elif self.driver:
             print("\n🧹 Cleaning up...")
             try:
                 self.driver.quit()
@@ -257,12 +530,59 @@ class TermuxSeleniumTester:
 
 def main():
     """Main function to run the tests"""
+    parser = argparse.ArgumentParser(description='Selenium Termux Test Runner')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Browser workers for the page load benchmark')
+    parser.add_argument('--urls-file',
+                       help='File with one URL per line for the page load benchmark')
+    parser.add_argument('--lean', action='store_true',
+                       help='Block images, fonts, media and tracker hosts')
+    parser.add_argument('--compare-profiles', action='store_true',
+                       help='Also report lean vs full profile load time and bytes')
+    parser.add_argument('--page-load-strategy', choices=PAGE_LOAD_STRATEGIES, default='normal',
+                       help='WebDriver page load strategy for the session')
+    parser.add_argument('--readiness-report', action='store_true',
+                       help='Also report time saved by per-test readiness conditions')
+    parser.add_argument('--profile-template', action='store_true',
+                       help='Start sessions from the cached Firefox profile template')
+    parser.add_argument('--compare-startup', action='store_true',
+                       help='Also report driver startup with and without the template')
+    parser.add_argument('--hybrid', action='store_true',
+                       help='Also fetch the URL list over HTTP first, using the browser only when needed')
+    parser.add_argument('--waterfall', nargs='?', const='selenium_waterfall.har', metavar='HAR_FILE',
+                       help='Export every page load\'s resources as HAR (default selenium_waterfall.har)')
+    parser.add_argument('--waterfall-top', type=int, default=5,
+                       help='Slowest/heaviest resources listed per page')
+    add_target_arguments(parser)
+    args = parser.parse_args()
+    
+    if importlib.util.find_spec("selenium") is None:
+        print("❌ Selenium not installed")
+        print("Run: pip install selenium")
+        sys.exit(1)
+    
+    target_base_url, _ = start_targets(args.local_targets, args.target_base_url)
+    
     print("🚀 Selenium Termux Test Runner")
     print("This may take a few minutes...")
     
     try:
-        tester = TermuxSeleniumTester(headless=True)
-        results = tester.run_all_tests()
+        tester = TermuxSeleniumTester(
+            headless=True,
+            page_load_workers=args.workers,
+            url_file=args.urls_file,
+            target_base_url=target_base_url,
+            lean_profile=LeanProfile() if args.lean else None,
+            page_load_strategy=args.page_load_strategy,
+            profile_template=ProfileTemplate() if args.profile_template else None,
+            waterfall=WaterfallRecorder(args.waterfall, args.waterfall_top) if args.waterfall else None
+        )
+        results = tester.run_all_tests(
+            compare_profiles=args.compare_profiles,
+            readiness_report=args.readiness_report,
+            compare_startup=args.compare_startup,
+            hybrid=args.hybrid
+        )
         
         if results:
             # Print summary
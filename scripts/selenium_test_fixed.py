@@ -7,9 +7,7 @@ import os
 import sys
 import time
 import json
-import requests
 from datetime import datetime
-from bs4 import BeautifulSoup
 
 class TermuxNetworkTester:
     def __init__(self):
@@ -20,9 +18,15 @@ class TermuxNetworkTester:
         }
     
     def test_requests_scraping(self):
-        """Test web scraping using requests + BeautifulSoup (no browser)"""
+        """Test web scraping using requests + streaming extraction (no browser)"""
         print("\n🕸️ Testing Requests-based Scraping...")
         
+        import requests
+        from html_extract import extract_from_response, get_extractor
+        
+        # Stops downloading and parsing once <title> has been seen
+        extractor = get_extractor("streaming")
+        
         test_urls = [
             "https://httpbin.org/html",
             "https://httpbin.org/json",
@@ -39,21 +43,25 @@ class TermuxNetworkTester:
                     'User-Agent': 'Mozilla/5.0 (Linux; Android 10; Termux) AppleWebKit/537.36'
                 }
                 
-                response = requests.get(url, headers=headers, timeout=30)
-                load_time = time.time() - start_time
+                is_html = 'html' in url
+                response = requests.get(url, headers=headers, timeout=30, stream=is_html)
                 
-                # Parse with BeautifulSoup for HTML
-                if 'html' in url:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    title = soup.title.string if soup.title else "No title"
+                if is_html:
+                    fields, bytes_read = extract_from_response(response, extractor)
+                    # Wire size from the header; without it the size is unknown,
+                    # since the streaming engine may stop before the end
+                    content_length = response.headers.get('Content-Length')
+                    load_time = time.time() - start_time
                     scraping_results[url] = {
                         "status": "success",
                         "load_time": round(load_time, 2),
                         "status_code": response.status_code,
-                        "title": title,
-                        "content_length": len(response.content)
+                        "title": fields["title"] or "No title",
+                        "content_length": int(content_length) if content_length else None,
+                        "bytes_read": bytes_read
                     }
                 else:
+                    load_time = time.time() - start_time
                     # For JSON responses
                     scraping_results[url] = {
                         "status": "success", 
@@ -75,34 +83,20 @@ class TermuxNetworkTester:
         return scraping_results
     
     def test_network_speed(self):
-        """Test network speed using speedtest-cli"""
+        """Test multi-stream throughput and latency under load"""
         print("\n🚀 Testing Network Speed...")
         
         try:
-            import speedtest
-            
-            st = speedtest.Speedtest()
-            st.get_best_server()
-            
-            print("📡 Testing download speed...")
-            download_speed = st.download() / 1_000_000  # Convert to Mbps
+            from throughput_benchmark import ThroughputBenchmark
             
-            print("📡 Testing upload speed...")
-            upload_speed = st.upload() / 1_000_000  # Convert to Mbps
+            speed_results = ThroughputBenchmark().run()
+            if speed_results["status"] != "success":
+                raise RuntimeError(speed_results["error"])
             
-            ping = st.results.ping
-            
-            speed_results = {
-                "download_mbps": round(download_speed, 2),
-                "upload_mbps": round(upload_speed, 2),
-                "ping_ms": round(ping, 2),
-                "server": st.results.server['name'],
-                "status": "success"
-            }
-            
-            print(f"✅ Download: {download_speed:.2f} Mbps")
-            print(f"✅ Upload: {upload_speed:.2f} Mbps") 
-            print(f"✅ Ping: {ping:.2f} ms")
+            print(f"✅ Download: {speed_results['download_mbps']:.2f} Mbps")
+            print(f"✅ Upload: {speed_results['upload_mbps']:.2f} Mbps") 
+            print(f"✅ Ping: {speed_results['ping_ms']:.2f} ms "
+                  f"(+{speed_results['latency']['bufferbloat_ms']} ms under load)")
             
             self.results["tests"]["network_speed"] = speed_results
             return speed_results
@@ -120,6 +114,8 @@ class TermuxNetworkTester:
         """Test latency to various websites"""
         print("\n📡 Testing Latency...")
         
+        import requests
+        
         test_sites = [
             "https://www.google.com",
             "https://www.github.com",
@@ -252,7 +248,7 @@ class TermuxNetworkTester:
 def main():
     """Main function"""
     print("🚀 Termux Network Test Runner")
-    print("Using requests + speedtest (no browser required)")
+    print("Using requests + built-in throughput benchmark (no browser required)")
     
     try:
         tester = TermuxNetworkTester()
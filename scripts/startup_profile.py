@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Startup-time report - interpreter start plus per-module import cost (-X importtime)
+"""
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Entry points we run every few minutes on the phones
+DEFAULT_MODULES = ["selenium_test", "selenium_ci", "network_test", "selenium_test_fixed"]
+
+
+def interpreter_startup_ms(runs=5):
+    """Best-of-N wall time of a bare `python -c pass`"""
+    best = None
+    for _ in range(runs):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best, 2)
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        rows.append((name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+def profile_import(module, top=10):
+    """Import module in a fresh interpreter and report where the time went"""
+    start_time = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start_time) * 1000
+
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "unknown error"
+        return {"status": "error", "error": last_line}
+
+    rows = parse_importtime(completed.stderr)
+
+    # importtime lists children before their parent, so the depth-1 rows
+    # since the previous top-level row are what the module pulled in
+    target = None
+    children = []
+    pending = []
+    for row in rows:
+        if row[3] == 1:
+            pending.append(row)
+        elif row[3] == 0:
+            if row[0] == module:
+                target, children = row, pending
+            pending = []
+
+    heaviest = sorted(rows, key=lambda row: row[1], reverse=True)[:top]
+
+    return {
+        "status": "success",
+        "wall_ms": round(wall_ms, 2),
+        "import_ms": round(target[2] / 1000, 2) if target else None,
+        "direct_imports": {name: round(cum / 1000, 2) for name, _, cum, _ in
+                           sorted(children, key=lambda row: row[2], reverse=True)[:top]},
+        "heaviest_modules_self_ms": {name: round(self_us / 1000, 2) for name, self_us, _, _ in heaviest}
+    }
+
+
+def over_budget(reports, budget_ms):
+    """Modules whose import took longer than budget_ms (None disables the check)"""
+    if budget_ms is None:
+        return []
+    return [module for module, report in reports.items()
+            if report["status"] == "success" and (report["import_ms"] or 0) > budget_ms]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report interpreter and import startup cost')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES,
+                       help='Modules in scripts/ to profile')
+    parser.add_argument('--top', type=int, default=8, help='Rows to show per module')
+    parser.add_argument('--budget-ms', type=float,
+                       help='Exit non-zero if any module import exceeds this many ms')
+    args = parser.parse_args()
+
+    print("⏱️  Startup Time Report")
+    print("=" * 50)
+    base_ms = interpreter_startup_ms()
+    print(f"🐍 Interpreter start (python -c pass): {base_ms:.1f} ms")
+
+    reports = {}
+    for module in args.modules:
+        report = reports[module] = profile_import(module, args.top)
+        if report["status"] != "success":
+            print(f"\n❌ {module}: {report['error']}")
+            continue
+
+        print(f"\n📦 {module}: import {report['import_ms']} ms (process {report['wall_ms']:.1f} ms)")
+        for name, ms in report["direct_imports"].items():
+            print(f"   {name:32} {ms:8.2f} ms")
+
+    slow = over_budget(reports, args.budget_ms)
+    if slow:
+        print(f"\n❌ Over the {args.budget_ms} ms budget: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
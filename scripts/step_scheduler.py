@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Event-driven test step scheduler - runs steps back to back, waiting only on real readiness
+"""
+
+import time
+from urllib.parse import urlparse
+
+
+# Fixed pause the runners used to sleep between tests
+LEGACY_PAUSE_SECONDS = 2
+
+
+def wait_until(predicate, timeout=10, poll=0.05):
+    """Poll predicate until it is true; returns False on timeout"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if predicate():
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+def driver_idle(driver):
+    """Readiness condition: no navigation in flight in the driver's window"""
+    def predicate():
+        # No browser (or a dead one) has nothing in flight to wait for
+        if driver is None:
+            return True
+        try:
+            return driver.execute_script("return document.readyState") == "complete"
+        except Exception:
+            return True
+    return predicate
+
+
+class HostPoliteness:
+    """Enforce a minimum interval between steps hitting the same host"""
+
+    def __init__(self, min_interval=1.0):
+        self.min_interval = min_interval
+        self.last_used = {}
+
+    def remaining(self, hosts):
+        """Seconds until every host may be used again (<= 0 means now)"""
+        now = time.monotonic()
+        return max(
+            [self.last_used.get(host, -self.min_interval) + self.min_interval - now for host in hosts] or [0]
+        )
+
+    def wait(self, hosts):
+        """Sleep only as long as the most recently used host requires"""
+        remaining = self.remaining(hosts)
+        if remaining > 0:
+            time.sleep(remaining)
+            return remaining
+        return 0.0
+
+    def mark(self, hosts):
+        now = time.monotonic()
+        for host in hosts:
+            self.last_used[host] = now
+
+
+def hosts_of(urls):
+    """Hostnames for a list of URLs or bare domains"""
+    return sorted({urlparse(url).hostname or url for url in urls})
+
+
+class StepScheduler:
+    """Run registered steps in order with no fixed sleeps between them"""
+
+    def __init__(self, politeness_interval=1.0, ready_timeout=10,
+                 legacy_pause=LEGACY_PAUSE_SECONDS):
+        self.politeness = HostPoliteness(politeness_interval)
+        self.ready_timeout = ready_timeout
+        self.legacy_pause = legacy_pause
+        self.steps = []
+        self.timings = []
+
+    def add(self, name, func, ready=None, hosts=(), setup=None, replaces_pause=False):
+        """Register a step; ready is an optional predicate to wait on first,
+        setup an optional callable run just before it (e.g. a session reset).
+        replaces_pause marks steps the old runners slept legacy_pause before"""
+        self.steps.append((name, func, ready, list(hosts), setup, replaces_pause))
+
+    def run(self):
+        """Run every step; exceptions propagate like the old inline calls"""
+        results = {}
+        for name, func, ready, hosts, setup, replaces_pause in self.steps:
+            waited = 0.0
+            setup_seconds = 0.0
+
+            if ready is not None:
+                start_time = time.monotonic()
+                if not wait_until(ready, self.ready_timeout):
+                    print(f"⚠️  {name}: readiness not reached after {self.ready_timeout}s, running anyway")
+                waited += time.monotonic() - start_time
+
+            if hosts:
+                waited += self.politeness.wait(hosts)
+
+            if setup is not None:
+                start_time = time.monotonic()
+                setup()
+                setup_seconds = time.monotonic() - start_time
+
+            start_time = time.monotonic()
+            try:
+                results[name] = func()
+            finally:
+                if hosts:
+                    self.politeness.mark(hosts)
+                self.timings.append({
+                    "step": name,
+                    "wait_seconds": round(waited, 3),
+                    "setup_seconds": round(setup_seconds, 3),
+                    "run_seconds": round(time.monotonic() - start_time, 3),
+                    "replaces_pause": replaces_pause
+                })
+        return results
+
+    def report(self):
+        """Idle time spent waiting vs the old fixed sleeps between steps"""
+        waited = sum(t["wait_seconds"] for t in self.timings)
+        # Steps added since (crawl, extras) never had a pause to remove
+        legacy_idle = self.legacy_pause * sum(1 for t in self.timings if t["replaces_pause"])
+        return {
+            "steps": self.timings,
+            "wait_seconds_total": round(waited, 3),
+            "legacy_idle_seconds": legacy_idle,
+            "idle_seconds_removed": round(max(legacy_idle - waited, 0), 3)
+        }
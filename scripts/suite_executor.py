@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Suite executor - run independent checks concurrently with per-category limits
+"""
+
+import time
+import threading
+
+
+# One browser at a time on a phone; network probes mostly wait on I/O
+DEFAULT_LIMITS = {
+    "browser": 1,
+    "http": 8,
+    "cpu": 2
+}
+
+
+class SuiteExecutor:
+    """Run registered checks as soon as their dependencies finish"""
+
+    def __init__(self, limits=None, default_limit=1, sequential=False):
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.default_limit = default_limit
+        # One check at a time in registration order, like the old runners
+        self.sequential = sequential
+        self.semaphores = {}
+        self.checks = []
+        self.lock = threading.Lock()
+
+    def add(self, name, func, category="cpu", depends_on=()):
+        """Register a check; func returns a result dict with a status"""
+        registered = {check["name"] for check in self.checks}
+        missing = set(depends_on) - registered
+        if missing:
+            raise ValueError(f"{name} depends on checks not registered yet: {', '.join(sorted(missing))}")
+        self.checks.append({
+            "name": name,
+            "func": func,
+            "category": category,
+            "depends_on": list(depends_on)
+        })
+
+    def _semaphore(self, category):
+        with self.lock:
+            if category not in self.semaphores:
+                self.semaphores[category] = threading.Semaphore(self.limits.get(category, self.default_limit))
+            return self.semaphores[category]
+
+    def _call(self, check):
+        """Run one check; returns (result, started, finished)"""
+        started = time.perf_counter()
+        try:
+            result = check["func"]()
+        except Exception as e:
+            result = {"status": "error", "error": str(e)}
+        return result, started, time.perf_counter()
+
+    def run(self):
+        """Run every check; returns (results in registration order, report)"""
+        done = {check["name"]: threading.Event() for check in self.checks}
+        results = {}
+        timings = {}
+        start_time = time.perf_counter()
+
+        def worker(check):
+            for dependency in check["depends_on"]:
+                done[dependency].wait()
+            with self._semaphore(check["category"]):
+                result, started, finished = self._call(check)
+            with self.lock:
+                results[check["name"]] = result
+                timings[check["name"]] = (started - start_time, finished - started)
+            done[check["name"]].set()
+
+        if self.sequential:
+            for check in self.checks:
+                worker(check)
+        else:
+            threads = [threading.Thread(target=worker, args=(check,), daemon=True) for check in self.checks]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        wall_time = time.perf_counter() - start_time
+
+        ordered = {check["name"]: results[check["name"]] for check in self.checks}
+        return ordered, self.report(timings, wall_time)
+
+    def critical_path(self, timings):
+        """Longest dependency chain by measured duration; returns (seconds, names)"""
+        longest = {}
+        for check in self.checks:
+            # add() guarantees dependencies come first
+            best = max(check["depends_on"], key=lambda name: longest[name][0], default=None)
+            base_seconds, base_chain = longest[best] if best else (0.0, [])
+            longest[check["name"]] = (base_seconds + timings[check["name"]][1], base_chain + [check["name"]])
+        return max(longest.values(), key=lambda item: item[0], default=(0.0, []))
+
+    def report(self, timings, wall_time):
+        summed = sum(duration for _, duration in timings.values())
+        critical_seconds, critical_chain = self.critical_path(timings)
+        return {
+            "wall_seconds": round(wall_time, 3),
+            "summed_seconds": round(summed, 3),
+            "critical_path_seconds": round(critical_seconds, 3),
+            "critical_path": critical_chain,
+            "parallel_speedup": round(summed / wall_time, 2) if wall_time > 0 else None,
+            "limits": self.limits,
+            "checks": [
+                {
+                    "name": check["name"],
+                    "category": check["category"],
+                    "start_seconds": round(timings[check["name"]][0], 3),
+                    "duration_seconds": round(timings[check["name"]][1], 3)
+                }
+                for check in self.checks
+            ]
+        }
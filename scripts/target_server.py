@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Local deterministic target server - the endpoints our suites hit, without the internet
+"""
+
+import ssl
+import sys
+import html
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+# Re-exported so server users get the URL mapping from one place
+from target_urls import rewrite_url  # noqa: F401
+
+
+PARAGRAPH = (
+    "Availing himself of the mild, summer-cool weather that now reigned in these "
+    "latitudes, and in preparation for the peculiarly active pursuits shortly to be "
+    "anticipated, Perth, the begrimed, blistered old blacksmith, had not removed his "
+    "portable forge to the hold again. "
+)
+
+
+# Incompressible filler for /bytes, generated once
+NOISE = random.Random(0).randbytes(64 * 1024)
+STREAM_CHUNK = len(NOISE)
+
+
+class RouteProfile:
+    """Per-route network shaping: added latency, bandwidth cap and payload size"""
+
+    def __init__(self, latency_ms=0, bandwidth_kbps=None, payload_bytes=None):
+        self.latency_ms = latency_ms
+        # None means unthrottled
+        self.bandwidth_kbps = bandwidth_kbps
+        # None means the route's natural size
+        self.payload_bytes = payload_bytes
+
+    @classmethod
+    def parse(cls, spec):
+        """Parse 'latency=50,bandwidth=256,size=100000'"""
+        values = {}
+        for part in filter(None, spec.split(',')):
+            key, _, value = part.partition('=')
+            values[key.strip()] = float(value)
+        return cls(
+            latency_ms=values.get('latency', 0),
+            bandwidth_kbps=values.get('bandwidth'),
+            payload_bytes=int(values['size']) if 'size' in values else None
+        )
+
+    def to_dict(self):
+        return {
+            "latency_ms": self.latency_ms,
+            "bandwidth_kbps": self.bandwidth_kbps,
+            "payload_bytes": self.payload_bytes
+        }
+
+
+def pad_html(body, payload_bytes):
+    """Pad an HTML page with paragraphs to exactly payload_bytes"""
+    if not payload_bytes or len(body) >= payload_bytes:
+        return body
+    closing = "</body></html>"
+    head = body[:-len(closing)]
+    filler = f"<p>{PARAGRAPH}</p>\n"
+    head += filler * ((payload_bytes - len(body)) // len(filler))
+    # Top up the remainder with a comment so the size is exact
+    rest = payload_bytes - len(head) - len(closing)
+    if rest >= 7:
+        head += "<!--" + "x" * (rest - 7) + "-->"
+    return head + closing
+
+
+def html_page(profile):
+    body = (
+        "<!DOCTYPE html><html><head><title>Herman Melville - Moby-Dick</title></head><body>"
+        "<h1>Herman Melville - Moby-Dick</h1>"
+        f"<div><p>{PARAGRAPH}</p></div>"
+        "</body></html>"
+    )
+    return pad_html(body, profile.payload_bytes), "text/html; charset=utf-8"
+
+
+def json_page(profile):
+    payload = {
+        "slideshow": {
+            "author": "Yours Truly",
+            "date": "date of publication",
+            "title": "Sample Slide Show",
+            "slides": [
+                {"title": "Wake up to WonderWidgets!", "type": "all"},
+                {"title": "Overview", "type": "all", "items": ["Why WonderWidgets are great"]}
+            ]
+        }
+    }
+    body = json.dumps(payload, indent=2)
+    if profile.payload_bytes and len(body) < profile.payload_bytes:
+        payload["padding"] = "x" * (profile.payload_bytes - len(body) - 20)
+        body = json.dumps(payload, indent=2)
+    return body, "application/json"
+
+
+def form_page(profile):
+    body = (
+        "<!DOCTYPE html><html><head><title>Order form</title></head><body>"
+        '<form method="post" action="/post">'
+        '<p><label>Customer name: <input name="custname"></label></p>'
+        '<p><label>Telephone: <input type=tel name="custtel"></label></p>'
+        '<p><label>E-mail address: <input type=email name="custemail"></label></p>'
+        "<p><button>Submit order</button></p>"
+        "</form></body></html>"
+    )
+    return pad_html(body, profile.payload_bytes), "text/html; charset=utf-8"
+
+
+def search_page(profile, query):
+    results = ""
+    if query:
+        items = "".join(
+            f'<div class="g"><h3>Result {i} for {html.escape(query)}</h3><p>{PARAGRAPH}</p></div>'
+            for i in range(1, 11)
+        )
+        results = f'<div id="search">{items}</div>'
+    body = (
+        "<!DOCTYPE html><html><head><title>"
+        f"{html.escape(query) + ' - Search' if query else 'Search'}</title></head><body>"
+        '<form action="/search" method="get"><input name="q" value=""></form>'
+        f"{results}</body></html>"
+    )
+    return pad_html(body, profile.payload_bytes), "text/html; charset=utf-8"
+
+
+def index_page(profile):
+    body = (
+        "<!DOCTYPE html><html><head><title>Local target server</title></head><body>"
+        '<p><a href="/html">/html</a> <a href="/json">/json</a> '
+        '<a href="/forms/post">/forms/post</a> <a href="/search">/search</a> '
+        '<a href="/bytes/1048576">/bytes/1048576</a></p>'
+        "</body></html>"
+    )
+    return pad_html(body, profile.payload_bytes), "text/html; charset=utf-8"
+
+
+class TargetRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'SeleniumTestsTarget/1.0'
+    # Headers and body go out in separate writes; without this, Nagle plus
+    # delayed ACKs add ~40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # Throughput clients hang up mid-body once their window closes
+            self.close_connection = True
+
+    def do_HEAD(self):
+        self.handle_route(send_body=False)
+
+    def do_GET(self):
+        self.handle_route(send_body=True)
+
+    def do_POST(self):
+        # Read in slices so large uploads to the sink never sit in memory
+        remaining = int(self.headers.get('Content-Length') or 0)
+        self.received = 0
+        while remaining > 0:
+            chunk = self.rfile.read(min(remaining, STREAM_CHUNK))
+            if not chunk:
+                break
+            self.received += len(chunk)
+            remaining -= len(chunk)
+        if remaining > 0:
+            # Client gave up mid-body; nobody is left to read a reply
+            self.close_connection = True
+            return
+        self.handle_route(send_body=True)
+
+    def handle_route(self, send_body):
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip('/') or '/'
+        # /bytes/<n> is shaped by the "/bytes" profile whatever the size
+        profile = self.server.profile_for('/bytes' if path.startswith('/bytes/') else path)
+
+        if path == '/html':
+            body, content_type = html_page(profile)
+        elif path == '/json':
+            body, content_type = json_page(profile)
+        elif path == '/forms/post':
+            body, content_type = form_page(profile)
+        elif path == '/search':
+            query = parse_qs(parsed.query).get('q', [''])[0]
+            body, content_type = search_page(profile, query)
+        elif path == '/post':
+            body, content_type = json.dumps({"status": "received"}), "application/json"
+        elif path == '/upload':
+            # Throughput sink: the body was already counted and discarded
+            body, content_type = json.dumps({"received": getattr(self, 'received', 0)}), "application/json"
+        elif path.startswith('/bytes/') and path[len('/bytes/'):].isdigit():
+            self.send_stream(int(path[len('/bytes/'):]), profile, send_body)
+            return
+        elif path == '/':
+            body, content_type = index_page(profile)
+        else:
+            self.send_error(404)
+            return
+
+        if profile.latency_ms:
+            time.sleep(profile.latency_ms / 1000)
+
+        data = body.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if send_body:
+            self.write_throttled(data, profile.bandwidth_kbps)
+
+    def send_stream(self, total, profile, send_body):
+        """Throughput source: total bytes of filler, generated on the fly"""
+        if profile.latency_ms:
+            time.sleep(profile.latency_ms / 1000)
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(total))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        if not send_body:
+            return
+
+        sent = 0
+        while sent < total:
+            chunk = NOISE[:min(STREAM_CHUNK, total - sent)]
+            self.write_throttled(chunk, profile.bandwidth_kbps)
+            sent += len(chunk)
+
+    def write_throttled(self, data, bandwidth_kbps):
+        """Write data no faster than bandwidth_kbps (kilobits per second)"""
+        if not bandwidth_kbps:
+            self.wfile.write(data)
+            return
+
+        bytes_per_second = bandwidth_kbps * 1000 / 8
+        # 20 slices per second keeps the pacing smooth
+        chunk = max(int(bytes_per_second / 20), 1)
+        start_time = time.monotonic()
+        sent = 0
+        while sent < len(data):
+            self.wfile.write(data[sent:sent + chunk])
+            sent += chunk
+            ahead = sent / bytes_per_second - (time.monotonic() - start_time)
+            if ahead > 0:
+                time.sleep(ahead)
+
+
+class TargetServer:
+    """Run the target server in a background thread"""
+
+    def __init__(self, host='127.0.0.1', port=0, routes=None, default_profile=None,
+                 certfile=None, keyfile=None, verbose=False):
+        self.httpd = ThreadingHTTPServer((host, port), TargetRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.verbose = verbose
+        self.routes = routes or {}
+        self.default_profile = default_profile or RouteProfile()
+        self.httpd.profile_for = lambda path: self.routes.get(path, self.default_profile)
+
+        self.scheme = 'http'
+        if certfile:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(certfile, keyfile)
+            self.httpd.socket = context.wrap_socket(self.httpd.socket, server_side=True)
+            self.scheme = 'https'
+
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"{self.scheme}://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local deterministic target server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--route', action='append', default=[],
+                       help="Per-route shaping, e.g. /html:latency=50,bandwidth=256,size=100000")
+    parser.add_argument('--default', default='',
+                       help="Shaping for routes without --route, same syntax")
+    parser.add_argument('--certfile', help='Serve HTTPS with this certificate')
+    parser.add_argument('--keyfile', help='Private key for --certfile')
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    routes = {}
+    for spec in args.route:
+        path, _, profile = spec.partition(':')
+        routes[path] = RouteProfile.parse(profile)
+
+    server = TargetServer(args.host, args.port, routes, RouteProfile.parse(args.default),
+                          args.certfile, args.keyfile, args.verbose)
+    print(f"🎯 Target server listening on {server.base_url}")
+    for path, profile in routes.items():
+        print(f"   {path}: {profile.to_dict()}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  Target server stopped")
+    finally:
+        server.httpd.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
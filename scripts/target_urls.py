@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Target URL routing - maps live test URLs onto the local target server
+"""
+
+from urllib.parse import urlparse, urlunparse
+
+
+# Where each live target lives on the local server
+LIVE_HOST_ROUTES = {
+    "www.google.com": "/search",
+    "google.com": "/search",
+    "example.com": "/html",
+    "www.github.com": "/",
+    "github.com": "/"
+}
+LOCAL_ROUTES = {"/", "/html", "/json", "/forms/post", "/search", "/post", "/upload"}
+
+
+def rewrite_url(url, base_url):
+    """Point a live test URL at the local target server"""
+    if not base_url:
+        return url
+    parsed = urlparse(url)
+    base = urlparse(base_url)
+    path = parsed.path.rstrip('/') or '/'
+    if path == '/' and parsed.hostname in LIVE_HOST_ROUTES:
+        path = LIVE_HOST_ROUTES[parsed.hostname]
+    elif path not in LOCAL_ROUTES and not path.startswith('/bytes/'):
+        path = '/html'
+    # Keep the live host in the URL so per-URL results stay distinct
+    query = '&'.join(filter(None, [parsed.query, f"origin={parsed.hostname}" if parsed.hostname else '']))
+    return urlunparse((base.scheme, base.netloc, path, '', query, ''))
+
+
+def add_target_arguments(parser):
+    """The runners' shared --local-targets / --target-base-url options"""
+    parser.add_argument('--local-targets', action='store_true',
+                       help='Run against the bundled local target server')
+    parser.add_argument('--target-base-url',
+                       help='Run against a target server already listening at this URL')
+
+
+def start_targets(local=False, base_url=None):
+    """Resolve a runner's target option; returns (base_url, server or None)"""
+    if local:
+        # Only pay for http.server when the local targets are wanted
+        from target_server import TargetServer
+        server = TargetServer().start()
+        print(f"🎯 Using local target server at {server.base_url}")
+        return server.base_url, server
+    return base_url, None
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark - multi-stream download/upload over plain HTTP, with latency under load
+"""
+
+import ssl
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import http.client
+from urllib.parse import urlparse
+
+from latency_prober import summarize_samples
+from target_urls import add_target_arguments, start_targets
+
+
+# Any server with a sized download and a POST sink works; these are public
+# endpoints used when no target server is given
+DEFAULT_DOWNLOAD_URL = "https://speed.cloudflare.com/__down?bytes={bytes}"
+DEFAULT_UPLOAD_URL = "https://speed.cloudflare.com/__up"
+
+# The bundled target server's source and sink
+LOCAL_DOWNLOAD_PATH = "/bytes/{bytes}"
+LOCAL_UPLOAD_PATH = "/upload"
+
+CHUNK_SIZE = 64 * 1024
+USER_AGENT = 'Mozilla/5.0 (Linux; Android 10; Termux) AppleWebKit/537.36'
+
+# Added latency under load (ms) -> grade, as popularised by bufferbloat tests
+BUFFERBLOAT_GRADES = [(5, "A+"), (30, "A"), (60, "B"), (200, "C"), (400, "D")]
+
+
+def endpoints_for(base_url=None):
+    """(download URL template, upload URL) for a target server base URL"""
+    if not base_url:
+        return DEFAULT_DOWNLOAD_URL, DEFAULT_UPLOAD_URL
+    base = base_url.rstrip('/')
+    return base + LOCAL_DOWNLOAD_PATH, base + LOCAL_UPLOAD_PATH
+
+
+def to_mbps(byte_count, seconds):
+    return round(byte_count * 8 / seconds / 1_000_000, 2) if seconds > 0 else None
+
+
+def bufferbloat_grade(added_ms):
+    if added_ms is None:
+        return None
+    for limit, grade in BUFFERBLOAT_GRADES:
+        if added_ms < limit:
+            return grade
+    return "F"
+
+
+def open_connection(url, timeout):
+    """Keep-alive connection for url; returns (connection, request path)"""
+    parsed = urlparse(url)
+    if parsed.scheme == "https":
+        conn = http.client.HTTPSConnection(parsed.hostname, parsed.port, timeout=timeout,
+                                           context=ssl.create_default_context())
+    else:
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=timeout)
+    path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+    return conn, path
+
+
+class _Phase:
+    """Byte counters for one load phase; bytes before the warmup ends are not counted"""
+
+    def __init__(self, streams, warmup, duration):
+        self.start = time.perf_counter()
+        self.measure_from = self.start + warmup
+        self.deadline = self.measure_from + duration
+        # One slot per stream, each written by a single thread
+        self.bytes = [0] * streams
+        self.requests = [0] * streams
+        self.errors = [None] * streams
+        self.stop = threading.Event()
+
+    def add(self, stream, byte_count):
+        if time.perf_counter() >= self.measure_from:
+            self.bytes[stream] += byte_count
+
+    def running(self):
+        return not self.stop.is_set() and time.perf_counter() < self.deadline
+
+    def report(self):
+        # A phase cut short by errors is measured over the time it actually ran
+        window = min(time.perf_counter(), self.deadline) - self.measure_from
+        streams = []
+        for index, byte_count in enumerate(self.bytes):
+            stream = {
+                "stream": index,
+                "bytes": byte_count,
+                "requests": self.requests[index],
+                "mbps": to_mbps(byte_count, window)
+            }
+            if self.errors[index]:
+                stream["error"] = self.errors[index]
+            streams.append(stream)
+        total = sum(self.bytes)
+        return {
+            "status": "success" if total else "error",
+            "aggregate_mbps": to_mbps(total, window),
+            "bytes": total,
+            "seconds": round(max(window, 0.0), 3),
+            "streams": streams
+        }
+
+
+class ThroughputBenchmark:
+    """Saturate a link with parallel HTTP streams and measure what gets through"""
+
+    def __init__(self, download_url=DEFAULT_DOWNLOAD_URL, upload_url=DEFAULT_UPLOAD_URL,
+                 streams=4, transfer_bytes=10_000_000, duration=8.0, warmup=2.0,
+                 latency_url=None, latency_interval=0.2, idle_samples=5, timeout=10,
+                 chunk_size=CHUNK_SIZE):
+        # "{bytes}" in the download URL is replaced by transfer_bytes
+        self.download_url = download_url
+        # None skips the upload phase
+        self.upload_url = upload_url
+        self.streams = streams
+        # Size of each GET / POST; a stream repeats requests until the phase ends
+        self.transfer_bytes = transfer_bytes
+        self.duration = duration
+        # TCP slow start is excluded from the measurement
+        self.warmup = warmup
+        self.latency_url = latency_url or download_url.replace("{bytes}", "0")
+        self.latency_interval = latency_interval
+        self.idle_samples = idle_samples
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.payload = random.Random(1).randbytes(chunk_size)
+
+    def _download_stream(self, phase, index):
+        url = self.download_url.replace("{bytes}", str(self.transfer_bytes))
+        conn = None
+        try:
+            while phase.running():
+                if conn is None:
+                    conn, path = open_connection(url, self.timeout)
+                conn.request("GET", path, headers={'User-Agent': USER_AGENT, 'Cache-Control': 'no-store'})
+                response = conn.getresponse()
+                if response.status != 200:
+                    raise RuntimeError(f"HTTP {response.status} from {url}")
+                while True:
+                    chunk = response.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    phase.add(index, len(chunk))
+                    if not phase.running():
+                        # Abandon the rest of the body rather than overrun the phase
+                        conn.close()
+                        conn = None
+                        break
+                phase.requests[index] += 1
+        except (OSError, http.client.HTTPException, RuntimeError) as e:
+            phase.errors[index] = str(e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _upload_stream(self, phase, index):
+        conn = None
+        try:
+            while phase.running():
+                if conn is None:
+                    conn, path = open_connection(self.upload_url, self.timeout)
+                conn.putrequest("POST", path)
+                conn.putheader('User-Agent', USER_AGENT)
+                conn.putheader('Content-Type', 'application/octet-stream')
+                conn.putheader('Content-Length', str(self.transfer_bytes))
+                conn.endheaders()
+
+                # Counted as handed to the socket, like other upload meters
+                sent = 0
+                while sent < self.transfer_bytes and phase.running():
+                    chunk = self.payload[:min(self.chunk_size, self.transfer_bytes - sent)]
+                    conn.send(chunk)
+                    sent += len(chunk)
+                    phase.add(index, len(chunk))
+                if sent < self.transfer_bytes:
+                    conn.close()
+                    conn = None
+                    break
+
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    raise RuntimeError(f"HTTP {response.status} from {self.upload_url}")
+                phase.requests[index] += 1
+        except (OSError, http.client.HTTPException, RuntimeError) as e:
+            phase.errors[index] = str(e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _probe(self, state):
+        """One small request on the probe's own connection; returns ms or None"""
+        try:
+            if state.get("conn") is None:
+                state["conn"], state["path"] = open_connection(self.latency_url, self.timeout)
+            start = time.perf_counter()
+            state["conn"].request("GET", state["path"], headers={'User-Agent': USER_AGENT})
+            state["conn"].getresponse().read()
+            return (time.perf_counter() - start) * 1000
+        except (OSError, http.client.HTTPException):
+            if state.get("conn") is not None:
+                state["conn"].close()
+            state["conn"] = None
+            state["errors"] = state.get("errors", 0) + 1
+            return None
+
+    def idle_latency(self):
+        """Latency samples with no load, after one connection-opening request"""
+        state = {}
+        self._probe(state)
+        samples = [ms for ms in (self._probe(state) for _ in range(self.idle_samples)) if ms is not None]
+        if state.get("conn") is not None:
+            state["conn"].close()
+        return samples
+
+    def run_phase(self, direction):
+        """Run one loaded phase; returns (throughput report, loaded latency samples)"""
+        phase = _Phase(self.streams, self.warmup, self.duration)
+        target = self._download_stream if direction == "download" else self._upload_stream
+        threads = [threading.Thread(target=target, args=(phase, index), daemon=True)
+                   for index in range(self.streams)]
+        for thread in threads:
+            thread.start()
+
+        # Probe on the calling thread while the streams run
+        state = {}
+        loaded = []
+        while phase.running():
+            if not any(thread.is_alive() for thread in threads):
+                break
+            ms = self._probe(state)
+            if ms is not None and time.perf_counter() >= phase.measure_from:
+                loaded.append(ms)
+            time.sleep(self.latency_interval)
+        phase.stop.set()
+        if state.get("conn") is not None:
+            state["conn"].close()
+
+        for thread in threads:
+            thread.join(self.timeout)
+        return phase.report(), loaded
+
+    def run(self):
+        """Idle latency, then download and upload phases; returns a result dict"""
+        idle = self.idle_latency()
+        download, download_loaded = self.run_phase("download")
+        upload, upload_loaded = self.run_phase("upload") if self.upload_url else (None, [])
+
+        idle_summary = summarize_samples(idle)
+        latency = {
+            "idle": idle_summary,
+            "download_loaded": summarize_samples(download_loaded),
+            "upload_loaded": summarize_samples(upload_loaded) if self.upload_url else None
+        }
+        # Bufferbloat: how much the median probe slows down once the link is busy
+        loaded_p50 = [summary["p50_ms"] for summary in (latency["download_loaded"], latency["upload_loaded"])
+                      if summary and summary["p50_ms"] is not None]
+        added_ms = None
+        if idle_summary["p50_ms"] is not None and loaded_p50:
+            added_ms = round(max(loaded_p50) - idle_summary["p50_ms"], 2)
+        latency["bufferbloat_ms"] = added_ms
+        latency["bufferbloat_grade"] = bufferbloat_grade(added_ms)
+
+        ok = download["status"] == "success" and (upload is None or upload["status"] == "success")
+        result = {
+            "status": "success" if ok else "error",
+            "download_mbps": download["aggregate_mbps"],
+            "upload_mbps": upload["aggregate_mbps"] if upload else None,
+            "ping_ms": idle_summary["p50_ms"],
+            "server": urlparse(self.download_url).netloc,
+            "download": download,
+            "upload": upload,
+            "latency": latency,
+            "config": {
+                "streams": self.streams,
+                "transfer_bytes": self.transfer_bytes,
+                "duration": self.duration,
+                "warmup": self.warmup
+            }
+        }
+        if not ok:
+            errors = [stream["error"] for phase in (download, upload) if phase
+                      for stream in phase["streams"] if "error" in stream]
+            result["error"] = errors[0] if errors else "no bytes transferred"
+        return result
+
+
+def print_report(result):
+    for direction in ("download", "upload"):
+        phase = result[direction]
+        if not phase:
+            continue
+        per_stream = ", ".join(str(stream["mbps"]) for stream in phase["streams"])
+        print(f"📡 {direction.capitalize()}: {phase['aggregate_mbps']} Mbps ({per_stream})")
+    latency = result["latency"]
+    print(f"⏱️  Idle latency p50: {latency['idle']['p50_ms']} ms")
+    for key in ("download_loaded", "upload_loaded"):
+        if latency[key]:
+            print(f"⏱️  Latency under {key.split('_')[0]} p50/p90: "
+                  f"{latency[key]['p50_ms']} / {latency[key]['p90_ms']} ms")
+    if latency["bufferbloat_ms"] is not None:
+        print(f"🎈 Bufferbloat: +{latency['bufferbloat_ms']} ms (grade {latency['bufferbloat_grade']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-stream HTTP throughput and bufferbloat benchmark')
+    parser.add_argument('--download-url', help='Download URL; "{bytes}" is replaced by the transfer size')
+    parser.add_argument('--upload-url', help='URL accepting POSTed bodies')
+    parser.add_argument('--no-upload', action='store_true', help='Skip the upload phase')
+    parser.add_argument('--streams', type=int, default=4, help='Parallel connections per phase')
+    parser.add_argument('--transfer-bytes', type=int, default=10_000_000, help='Bytes per request')
+    parser.add_argument('--duration', type=float, default=8.0, help='Measured seconds per phase')
+    parser.add_argument('--warmup', type=float, default=2.0, help='Unmeasured seconds before each phase')
+    parser.add_argument('--json', action='store_true', help='Print the raw result')
+    add_target_arguments(parser)
+    args = parser.parse_args()
+
+    base_url, _ = start_targets(args.local_targets, args.target_base_url)
+    download_url, upload_url = endpoints_for(base_url)
+    benchmark = ThroughputBenchmark(
+        download_url=args.download_url or download_url,
+        upload_url=None if args.no_upload else (args.upload_url or upload_url),
+        streams=args.streams,
+        transfer_bytes=args.transfer_bytes,
+        duration=args.duration,
+        warmup=args.warmup
+    )
+    result = benchmark.run()
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        print_report(result)
+    if result["status"] != "success":
+        print(f"❌ {result['error']}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
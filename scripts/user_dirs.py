@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+"""
+Per-user cache and data directories shared by the scripts
+"""
+
+import os
+
+
+# Rebuildable state: browser discovery, the profile template
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "selenium_tests")
+
+# State worth keeping: the results history
+DATA_DIR = os.path.join(os.path.expanduser("~"), ".local", "share", "selenium_tests")
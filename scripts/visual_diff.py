@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Visual diff - vectorized screenshot comparison against stored baselines (NumPy + Pillow)
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+
+
+DEFAULT_BASELINE_DIR = "visual_baselines"
+INSTALL_HINT = "pip install -r requirements/requirements_visual.txt"
+
+
+def missing_dependencies():
+    """Names of the optional packages visual diffs need that are not installed"""
+    import importlib.util
+    return [name for name, module in (("numpy", "numpy"), ("Pillow", "PIL"))
+            if importlib.util.find_spec(module) is None]
+
+
+def _require():
+    """numpy and PIL.Image, imported on first use"""
+    try:
+        import numpy
+        from PIL import Image
+    except ImportError as e:
+        raise ImportError(f"visual diff needs numpy and Pillow ({e}); {INSTALL_HINT}") from e
+    return numpy, Image
+
+
+def load_luma(source, downscale=1):
+    """Luminance array (int16) of a path, bytes, PIL image or array, reduced by downscale"""
+    np, Image = _require()
+    if isinstance(source, np.ndarray):
+        luma = source.astype(np.int32 if downscale > 1 else np.int16)
+        if downscale > 1:
+            # Block mean, matching Image.reduce on decoded frames
+            height, width = luma.shape[0] // downscale, luma.shape[1] // downscale
+            # Summing strided views beats a 4-D reshape reduction by a wide margin
+            total = sum(
+                luma[dy:height * downscale:downscale, dx:width * downscale:downscale]
+                for dy in range(downscale) for dx in range(downscale)
+            )
+            luma = (total // (downscale * downscale)).astype(np.int16)
+        return luma
+    if isinstance(source, (bytes, bytearray)):
+        import io
+        source = io.BytesIO(source)
+    image = source if isinstance(source, Image.Image) else Image.open(source)
+    # "L" is ITU-R 601 luma, close enough to perceived brightness
+    gray = image.convert("L")
+    if downscale > 1:
+        # One pyramid level per factor of two; box-filtered in C
+        gray = gray.reduce(downscale)
+    return np.asarray(gray, dtype=np.int16)
+
+
+def _label_tiles(flagged):
+    """8-connected components of a boolean tile grid; yields lists of (row, col)"""
+    rows, cols = flagged.shape
+    seen = set()
+    for start in zip(*flagged.nonzero()):
+        start = (int(start[0]), int(start[1]))
+        if start in seen:
+            continue
+        seen.add(start)
+        stack, component = [start], []
+        while stack:
+            row, col = stack.pop()
+            component.append((row, col))
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    neighbour = (row + dr, col + dc)
+                    if (0 <= neighbour[0] < rows and 0 <= neighbour[1] < cols
+                            and neighbour not in seen and flagged[neighbour]):
+                        seen.add(neighbour)
+                        stack.append(neighbour)
+        yield component
+
+
+class VisualDiff:
+    """Compare two screenshots tile by tile with a luminance tolerance"""
+
+    def __init__(self, tolerance=16, tile=16, min_tile_pixels=2, max_changed_ratio=0.001,
+                 downscale=1):
+        # Luminance delta (0-255) below which a pixel counts as unchanged;
+        # absorbs anti-aliasing and compression noise
+        self.tolerance = tolerance
+        # Changed pixels are grouped into tile x tile blocks before labelling
+        self.tile = tile
+        # Tiles with fewer changed pixels are treated as noise
+        self.min_tile_pixels = min_tile_pixels
+        # Share of changed pixels above which the verdict is "changed"
+        self.max_changed_ratio = max_changed_ratio
+        # Compare at 1/downscale resolution; boxes are reported in full-size pixels
+        self.downscale = downscale
+
+    def compare(self, baseline, current):
+        """Diff two images; returns verdict, changed_ratio and changed regions"""
+        np, _ = _require()
+        start_time = time.perf_counter()
+        a = load_luma(baseline, self.downscale)
+        b = load_luma(current, self.downscale)
+        scale = self.downscale
+
+        if a.shape != b.shape:
+            height, width = b.shape
+            return self._result("changed", 1.0, [[0, 0, width * scale, height * scale]], start_time,
+                                size_changed=True, baseline_size=[a.shape[1] * scale, a.shape[0] * scale])
+
+        mask = np.abs(a - b) > self.tolerance
+        if not mask.any():
+            return self._result("same", 0.0, [], start_time)
+
+        # Pad to whole tiles, then count changed pixels per tile in one reshape
+        tile = self.tile
+        height, width = mask.shape
+        rows, cols = -(-height // tile), -(-width // tile)
+        padded = np.zeros((rows * tile, cols * tile), dtype=bool)
+        padded[:height, :width] = mask
+        counts = padded.reshape(rows, tile, cols, tile).sum(axis=(1, 3))
+        flagged = counts >= self.min_tile_pixels
+
+        regions = []
+        changed = 0
+        for component in _label_tiles(flagged):
+            tile_rows = [row for row, _ in component]
+            tile_cols = [col for _, col in component]
+            changed += int(sum(counts[row, col] for row, col in component))
+            # Tighten the box to the changed pixels inside the component's tiles
+            top, bottom = min(tile_rows) * tile, (max(tile_rows) + 1) * tile
+            left, right = min(tile_cols) * tile, (max(tile_cols) + 1) * tile
+            ys, xs = padded[top:bottom, left:right].nonzero()
+            regions.append([
+                int((left + xs.min()) * scale),
+                int((top + ys.min()) * scale),
+                int((left + xs.max() + 1) * scale),
+                int((top + ys.max() + 1) * scale)
+            ])
+
+        ratio = changed / mask.size
+        verdict = "changed" if ratio > self.max_changed_ratio else "same"
+        regions.sort(key=lambda box: (box[2] - box[0]) * (box[3] - box[1]), reverse=True)
+        return self._result(verdict, ratio, regions, start_time)
+
+    def _result(self, verdict, ratio, regions, start_time, **extra):
+        result = {
+            "status": "success",
+            "verdict": verdict,
+            "changed_ratio": round(ratio, 6),
+            # [left, top, right, bottom], largest first
+            "regions": regions,
+            "tolerance": self.tolerance,
+            "downscale": self.downscale,
+            "diff_ms": round((time.perf_counter() - start_time) * 1000, 2)
+        }
+        result.update(extra)
+        return result
+
+
+class BaselineStore:
+    """One baseline image per screenshot name, compared on every check"""
+
+    def __init__(self, directory=DEFAULT_BASELINE_DIR, differ=None, update=False):
+        self.directory = directory
+        self.differ = differ or VisualDiff()
+        # Replace baselines with the new capture after comparing
+        self.update = update
+
+    def path_for(self, name):
+        return os.path.join(self.directory, f"{name}.png")
+
+    def check(self, name, image_path):
+        """Compare image_path with the baseline for name; the first capture becomes it"""
+        baseline = self.path_for(name)
+        if not os.path.exists(baseline):
+            self._store(image_path, baseline)
+            return {"status": "success", "verdict": "new", "baseline": baseline}
+
+        result = self.differ.compare(baseline, image_path)
+        result["baseline"] = baseline
+        if self.update:
+            self._store(image_path, baseline)
+        return result
+
+    def _store(self, image_path, baseline):
+        os.makedirs(self.directory, exist_ok=True)
+        if image_path.endswith(".png"):
+            shutil.copyfile(image_path, baseline)
+        else:
+            # Baselines are always lossless
+            _, Image = _require()
+            with Image.open(image_path) as image:
+                image.save(baseline, "PNG")
+
+
+def draw_regions(image_path, regions, output_path):
+    """Copy of the image with changed regions outlined in red"""
+    _, Image = _require()
+    from PIL import ImageDraw
+    with Image.open(image_path) as image:
+        marked = image.convert("RGB")
+    draw = ImageDraw.Draw(marked)
+    for left, top, right, bottom in regions:
+        draw.rectangle([left, top, right - 1, bottom - 1], outline=(255, 0, 0), width=3)
+    marked.save(output_path)
+    return output_path
+
+
+def benchmark(differ, count=200, size=(1280, 800)):
+    """Images per minute for synthetic page-sized frames with a few changed blocks"""
+    np, _ = _require()
+    rng = np.random.default_rng(0)
+    width, height = size
+    base = rng.integers(0, 256, (height, width), dtype=np.int16)
+    frames = []
+    for i in range(8):
+        frame = base.copy()
+        y, x = rng.integers(0, height - 60), rng.integers(0, width - 200)
+        frame[y:y + 40, x:x + 180] = 255 - frame[y:y + 40, x:x + 180]
+        frames.append(frame)
+
+    start_time = time.perf_counter()
+    for i in range(count):
+        differ.compare(base, frames[i % len(frames)])
+    elapsed = time.perf_counter() - start_time
+    return {
+        "images": count,
+        "size": list(size),
+        "seconds": round(elapsed, 3),
+        "images_per_minute": round(count / elapsed * 60)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare screenshots against a baseline')
+    parser.add_argument('baseline', nargs='?', help='Baseline image')
+    parser.add_argument('current', nargs='?', help='New capture')
+    parser.add_argument('--tolerance', type=int, default=16, help='Luminance delta treated as unchanged')
+    parser.add_argument('--tile', type=int, default=16)
+    parser.add_argument('--max-changed-ratio', type=float, default=0.001)
+    parser.add_argument('--downscale', type=int, default=1, help='Compare at 1/N resolution')
+    parser.add_argument('--diff-image', help='Write the current image with changed regions outlined')
+    parser.add_argument('--benchmark', type=int, metavar='N', help='Time N synthetic comparisons instead')
+    args = parser.parse_args()
+
+    differ = VisualDiff(args.tolerance, args.tile, max_changed_ratio=args.max_changed_ratio,
+                        downscale=args.downscale)
+    if args.benchmark:
+        print(json.dumps(benchmark(differ, args.benchmark), indent=2))
+        return 0
+    if not (args.baseline and args.current):
+        parser.error("baseline and current images are required")
+
+    result = differ.compare(args.baseline, args.current)
+    print(json.dumps(result, indent=2))
+    if args.diff_image and result["regions"]:
+        draw_regions(args.current, result["regions"], args.diff_image)
+        print(f"🖍️  Regions outlined in {args.diff_image}")
+    return 1 if result["verdict"] == "changed" else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,8 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_history(tmp_path, monkeypatch):
+    """Runner code under test appends to a throwaway history, never the user's"""
+    monkeypatch.setenv("SELENIUM_TESTS_DB", str(tmp_path / "results.sqlite"))
+    monkeypatch.delenv("SELENIUM_TESTS_NO_HISTORY", raising=False)
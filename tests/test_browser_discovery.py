@@ -0,0 +1,62 @@
+import pytest
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import browser_discovery
+from browser_discovery import BrowserDiscovery, check_compatibility, parse_version
+
+
+def fake_binary(path, version_line):
+    with open(path, 'w') as f:
+        f.write(f"#!/bin/sh\necho '{version_line}'\n")
+    os.chmod(path, 0o755)
+    return str(path)
+
+
+class TestBrowserDiscovery:
+    @pytest.fixture
+    def binaries(self, tmp_path, monkeypatch):
+        geckodriver = fake_binary(tmp_path / "geckodriver", "geckodriver 0.34.0 (c44f0d09630a 2024-01-02)")
+        firefox = fake_binary(tmp_path / "firefox", "Mozilla Firefox 115.6.0esr")
+        monkeypatch.setitem(browser_discovery.CANDIDATES, "geckodriver", [geckodriver])
+        monkeypatch.setitem(browser_discovery.CANDIDATES, "firefox", [firefox])
+        return geckodriver, firefox
+
+    def test_discover_and_cache(self, binaries, tmp_path):
+        """Test that a second discovery is answered from the cache file"""
+        cache_file = str(tmp_path / "cache" / "discovery.json")
+
+        first = BrowserDiscovery(cache_file).discover()
+        second = BrowserDiscovery(cache_file).discover()
+
+        assert first["geckodriver"]["version"] == [0, 34, 0]
+        assert first["firefox"]["version"] == [115, 6, 0]
+        assert first["compatible"] is True
+        assert not first["cached"]
+        assert second["cached"]
+
+    def test_mtime_change_invalidates(self, binaries, tmp_path):
+        """Test that replacing a binary triggers a fresh version probe"""
+        cache_file = str(tmp_path / "discovery.json")
+        BrowserDiscovery(cache_file).discover()
+
+        geckodriver, _ = binaries
+        fake_binary(geckodriver, "geckodriver 0.36.0 (a3d508507022 2025-02-24)")
+        stat = os.stat(geckodriver)
+        os.utime(geckodriver, (stat.st_atime, stat.st_mtime + 10))
+
+        report = BrowserDiscovery(cache_file).discover()
+
+        assert report["geckodriver"]["version"] == [0, 36, 0]
+        assert report["compatible"] is False
+        assert "128" in report["reason"]
+
+    def test_version_table(self):
+        """Test the geckodriver to minimum Firefox mapping"""
+        assert parse_version("Mozilla Firefox 128.0") == (128, 0, 0)
+        assert check_compatibility((0, 33, 0), (102, 0, 0)) == (True, "ok")
+        assert check_compatibility((0, 33, 0), (91, 0, 0))[0] is False
+        assert check_compatibility(None, (128, 0, 0))[0] is None
@@ -0,0 +1,121 @@
+import threading
+import time
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from crawler import Crawler, HashedURLSet, extract_links, normalize_url
+from target_server import TargetServer
+
+
+class FakeResponse:
+    def __init__(self, url, links):
+        self.url = url
+        self.status_code = 200
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+        self.encoding = 'utf-8'
+        self.content = "".join(f'<a href="{link}">x</a>' for link in links).encode()
+
+    def close(self):
+        pass
+
+
+class FakeBinaryResponse:
+    """A PDF whose body must never be downloaded"""
+
+    def __init__(self, url):
+        self.url = url
+        self.status_code = 200
+        self.headers = {'Content-Type': 'application/pdf', 'Content-Length': '5000000'}
+        self.closed = False
+
+    @property
+    def content(self):
+        raise AssertionError("non-HTML body was downloaded")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    """Every page links to ten children; tracks concurrency per host"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def get(self, url, timeout=None, stream=False):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        path = url.rstrip('/')
+        return FakeResponse(url, [f"{path}/{i}" for i in range(10)] + ["#top", "mailto:x@y"]), 10.0, False
+
+
+class TestCrawler:
+    def test_normalize_and_dedupe(self):
+        """Test that equivalent URLs collapse to one seen entry"""
+        seen = HashedURLSet()
+        assert seen.add(normalize_url("HTTP://Example.com:80/a#frag"))
+        assert not seen.add(normalize_url("http://example.com/a"))
+        assert normalize_url("https://example.com") == "https://example.com/"
+        assert len(seen) == 1
+
+    def test_extract_links(self):
+        """Test that relative links are resolved and non-http links dropped"""
+        html = b'<a href="/x">1</a><a href="y?q=1#f">2</a><a href="javascript:void(0)">3</a>'
+        assert extract_links(html, "http://example.com/dir/") == [
+            "http://example.com/x", "http://example.com/dir/y?q=1"
+        ]
+
+    def test_limits(self):
+        """Test the page cap and per-host concurrency limit"""
+        client = FakeClient()
+        pages = []
+        crawler = Crawler(["http://example.com/"], max_depth=5, max_pages=25, workers=8,
+                          per_host_concurrency=2, politeness_interval=0, client=client,
+                          on_page=lambda url, result: pages.append(url))
+
+        report = crawler.run()
+
+        assert report["pages"] == 25 == len(pages) == len(set(pages))
+        assert client.peak <= 2
+        assert report["max_depth_reached"] == 2
+
+    def test_non_html_body_skipped(self):
+        """Test that a PDF is reported from its headers and its connection closed"""
+        pdf = FakeBinaryResponse("http://example.com/report.pdf")
+
+        class PDFClient:
+            def get(self, url, timeout=None, stream=False):
+                assert stream
+                if url.endswith(".pdf"):
+                    return pdf, 3.0, False
+                return FakeResponse(url, ["/report.pdf"]), 3.0, False
+
+        crawler = Crawler(["http://example.com/"], max_depth=2, politeness_interval=0, client=PDFClient())
+        report = crawler.run()
+
+        [result] = [r for r in crawler.results if r["url"].endswith(".pdf")]
+        assert result["status"] == "success" and result["body_skipped"]
+        assert result["bytes"] == 5000000
+        assert pdf.closed
+        assert report["pages"] == 2
+
+    def test_local_site(self):
+        """Test a depth-limited crawl of the local target server"""
+        with TargetServer() as server:
+            crawler = Crawler([server.base_url + "/"], max_depth=1, max_pages=20, politeness_interval=0)
+            report = crawler.run()
+            crawler.client.close()
+
+        urls = {result["url"] for result in crawler.results}
+        assert server.base_url + "/html" in urls
+        assert report["errors"] == 0
+        assert all(result["depth"] <= 1 for result in crawler.results)
@@ -0,0 +1,86 @@
+import pytest
+import socket
+import threading
+import time
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import dns_benchmark
+from dns_benchmark import DNSCache
+
+FAKE = {"A": ["10.0.0.7"], "AAAA": []}
+
+
+class TestDNSCache:
+    def test_hit(self):
+        """Test that a primed host is answered from the cache"""
+        cache = DNSCache(ttl=60)
+        cache.prime("Cached.Test", FAKE)
+
+        with cache:
+            results = socket.getaddrinfo("cached.test", 443)
+
+        assert results == [(socket.AF_INET, socket.SOCK_STREAM, socket.IPPROTO_TCP, '', ("10.0.0.7", 443))]
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 0
+
+    def test_expiry(self):
+        """Test that an expired entry is resolved again"""
+        cache = DNSCache(ttl=0.05)
+        cache.prime("localhost", FAKE)
+        time.sleep(0.1)
+
+        results = cache.getaddrinfo("localhost", 80)
+
+        assert "10.0.0.7" not in [sockaddr[0] for *_, sockaddr in results]
+        assert cache.stats()["misses"] == 1
+        # The fresh answer is cached again
+        cache.getaddrinfo("localhost", 80)
+        assert cache.stats()["hits"] == 1
+
+    def test_uninstall(self):
+        """Test that leaving the context restores the system resolver"""
+        with DNSCache() as cache:
+            assert socket.getaddrinfo == cache.getaddrinfo
+        assert socket.getaddrinfo is dns_benchmark._system_getaddrinfo
+
+        cache.uninstall()
+        assert socket.getaddrinfo is dns_benchmark._system_getaddrinfo
+
+    def test_uncacheable_calls_pass_through(self):
+        """Test that numeric service names and flags bypass the cache"""
+        cache = DNSCache()
+        cache.prime("localhost", FAKE)
+
+        results = cache.getaddrinfo("localhost", "http", flags=socket.AI_CANONNAME)
+
+        assert "10.0.0.7" not in [sockaddr[0] for *_, sockaddr in results]
+        assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 0
+
+    def test_counters_under_threads(self):
+        """Test that concurrent lookups are all counted"""
+        cache = DNSCache()
+        cache.prime("cached.test", FAKE)
+
+        def lookups():
+            for _ in range(500):
+                cache.getaddrinfo("cached.test", 80)
+
+        threads = [threading.Thread(target=lookups) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert cache.stats()["hits"] == 4000
+
+    def test_warm(self):
+        """Test that warm() resolves only hosts missing from the cache"""
+        cache = DNSCache()
+        cache.prime("cached.test", FAKE)
+
+        assert cache.warm(["cached.test", "localhost"]) == 1
+        assert cache.lookup("localhost") is not None
+        assert cache.warm(["cached.test", "localhost"]) == 0
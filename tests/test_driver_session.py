@@ -0,0 +1,120 @@
+import pytest
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from driver_session import DriverSessionManager, origin_of
+
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_handle = handle
+
+
+class FakeDriver:
+    def __init__(self):
+        self.window_handles = ["main", "popup"]
+        self.current_handle = "main"
+        self.switch_to = FakeSwitchTo(self)
+        self.cookies_cleared = 0
+        self.scripts = []
+        self.visited = []
+        self.url = "about:blank"
+        self.quit_called = False
+
+    @property
+    def current_url(self):
+        if self.quit_called:
+            raise RuntimeError("driver is gone")
+        return self.url
+
+    def close(self):
+        self.window_handles.remove(self.current_handle)
+
+    def delete_all_cookies(self):
+        self.cookies_cleared += 1
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        if "location.origin" in script:
+            return origin_of(self.url)
+
+    def get(self, url):
+        self.visited.append(url)
+        self.url = url
+
+    def quit(self):
+        self.quit_called = True
+
+
+class TestDriverSessionManager:
+    @pytest.fixture
+    def manager(self):
+        return DriverSessionManager()
+
+    def test_factory_called_once(self, manager):
+        """Test that a warm driver is reused instead of restarted"""
+        created = []
+
+        def factory():
+            created.append(FakeDriver())
+            return created[-1]
+
+        first = manager.acquire(factory)
+        second = manager.acquire(factory)
+
+        assert first is second
+        assert len(created) == 1
+        assert manager.report()["reuses"] == 1
+
+    def test_reset_clears_state(self, manager):
+        """Test that reuse resets cookies, storage and windows"""
+        driver = manager.acquire(FakeDriver)
+        driver.url = "https://a.test/"
+        manager.acquire(FakeDriver)
+
+        assert driver.window_handles == ["main"]
+        assert driver.cookies_cleared == 1
+        assert any("localStorage" in script for script in driver.scripts)
+        assert driver.visited[-1] == "about:blank"
+
+    def test_reset_clears_every_visited_origin(self, manager):
+        """Test that reset visits each origin the session loaded, not just the current one"""
+        driver = manager.acquire(FakeDriver)
+        for url in ("https://a.test/page", "http://b.test:8080/x", "https://a.test/other"):
+            manager.visited(driver, url)
+        driver.url = "http://b.test:8080/x"
+        # Another driver's pages are not this session's to clear
+        manager.visited(FakeDriver(), "https://c.test/")
+
+        manager.reset()
+
+        assert driver.visited == ["https://a.test/robots.txt", "about:blank"]
+        assert driver.cookies_cleared == 2
+        assert manager.origins == set()
+        assert manager.report()["resets"] == 1
+
+    def test_origin_of(self):
+        """Test that only http(s) URLs have an origin to clear"""
+        assert origin_of("https://a.test:8443/x?y=1") == "https://a.test:8443"
+        assert origin_of("about:blank") is None
+        assert origin_of(None) is None
+
+    def test_dead_driver_restarted(self, manager):
+        """Test that a crashed driver is replaced by a fresh one"""
+        first = manager.acquire(FakeDriver)
+        first.quit()
+        second = manager.acquire(FakeDriver)
+
+        assert second is not first
+        assert manager.report()["cold_starts"] == 2
+
+    def test_failed_factory(self, manager):
+        """Test that a factory returning None is passed through"""
+        assert manager.acquire(lambda: None) is None
+        assert manager.driver is None
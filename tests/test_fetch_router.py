@@ -0,0 +1,131 @@
+import pytest
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import fetch_router
+from driver_session import DriverSessionManager
+from fetch_router import FetchRouter, url_pattern
+from target_server import TargetServer
+
+ARTICLE = "<html><body><h1>Title</h1><p>" + "Plenty of server-rendered text. " * 20 + "</p></body></html>"
+APP_SHELL = '<html><body><div id="root"></div><script src="/app.js"></script></body></html>'
+NOSCRIPT = ("<html><body><noscript>You need to enable JavaScript to run this app.</noscript>"
+            "<p>" + "Footer text. " * 30 + "</p><script></script></body></html>")
+
+
+class FakeResponse:
+    def __init__(self, body, content_type="text/html; charset=utf-8", status_code=200):
+        self.status_code = status_code
+        self.headers = {"Content-Type": content_type}
+        self.content = body.encode()
+        self.text = body
+
+
+class FakeClient:
+    def __init__(self, pages, status_codes=None):
+        self.pages = pages
+        self.status_codes = status_codes or {}
+        self.requests = []
+
+    def get(self, url, timeout=None):
+        self.requests.append(url)
+        path = url.split("/", 3)[3]
+        return FakeResponse(self.pages[path], status_code=self.status_codes.get(path, 200)), 5.0, False
+
+
+class FakeDriver:
+    current_url = "about:blank"
+    page_source = "<html><body>rendered</body></html>"
+
+
+class TestFetchRouter:
+    @pytest.fixture
+    def router(self, monkeypatch):
+        monkeypatch.setattr(fetch_router, "shared_session", DriverSessionManager())
+        monkeypatch.setattr(fetch_router, "navigate", lambda driver, url, ready, timeout: None)
+        client = FakeClient({"article/1": ARTICLE, "app/7": APP_SHELL, "app/8": APP_SHELL,
+                             "wall": NOSCRIPT, "api": "{}"})
+        return FetchRouter(FakeDriver, client=client)
+
+    def test_heuristics(self, router):
+        """Test each heuristic against server-rendered and client-rendered pages"""
+        assert router.needs_browser(ARTICLE.encode()) is None
+        assert router.needs_browser(APP_SHELL.encode()).startswith("script-only body")
+        assert router.needs_browser(NOSCRIPT.encode()) == "noscript wall"
+        assert router.needs_browser(ARTICLE.encode(), selector="#results") == "#results not in HTML"
+        assert router.needs_browser(ARTICLE.encode(), selector="h1") is None
+
+    def test_routing_and_cache(self, router):
+        """Test fallback, per-pattern caching and the savings report"""
+        article, _ = router.fetch("https://site.test/article/1")
+        first, _ = router.fetch("https://site.test/app/7")
+        second, content = router.fetch("https://site.test/app/8")
+        api, _ = router.fetch("https://site.test/api")
+
+        assert article["route"] == "http" and api["route"] == "http"
+        assert first["route"] == "browser" and not first["cached_decision"]
+        # Same pattern: straight to the browser, no HTTP attempt
+        assert second["route"] == "browser" and second["cached_decision"]
+        assert "https://site.test/app/8" not in router.client.requests
+        assert content == FakeDriver.page_source
+
+        report = router.report()
+        assert report["http_pages"] == 2 and report["browser_pages"] == 2
+        assert report["no_browser_share"] == 0.5
+        assert report["wasted_http_ms"] > 0
+        assert report["time_saved_ms"] is not None
+
+    def test_heuristics_share_one_parse(self):
+        """Test that the script-only check leaves the shared tree intact"""
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(NOSCRIPT, 'html.parser')
+        fetch_router.ScriptOnlyBody(min_text_chars=1000)(soup)
+
+        assert len(soup.find_all("script")) == 1
+        assert fetch_router.NoscriptWall()(soup) == "noscript wall"
+
+    def test_http_error_not_cached(self, monkeypatch):
+        """Test that an HTTP error goes to the browser without caching the pattern"""
+        monkeypatch.setattr(fetch_router, "navigate", lambda driver, url, ready, timeout: None)
+        client = FakeClient({"article/1": "<html>Service Unavailable</html>"}, {"article/1": 503})
+        router = FetchRouter(driver=FakeDriver(), client=client)
+
+        result, _ = router.fetch("https://site.test/article/1")
+
+        assert result["route"] == "browser" and result["reason"] == "HTTP 503"
+        assert router.decisions == {}
+
+    def test_borrowed_driver_not_released(self, monkeypatch):
+        """Test that a caller's driver is used without the shared session"""
+        session = DriverSessionManager()
+        monkeypatch.setattr(fetch_router, "shared_session", session)
+        monkeypatch.setattr(fetch_router, "navigate", lambda driver, url, ready, timeout: None)
+        driver = FakeDriver()
+        router = FetchRouter(driver=driver, client=FakeClient({"app/7": APP_SHELL}))
+
+        result, _ = router.fetch("https://site.test/app/7")
+        router.close()
+
+        assert result["route"] == "browser"
+        assert router.driver is driver
+        assert session.driver is None
+
+    def test_url_pattern(self):
+        """Test that ids and hashes collapse into one pattern"""
+        assert url_pattern("https://a.test/items/123/edit") == "a.test/items/*/edit"
+        assert url_pattern("https://a.test/u/0f3e9a1b2c4d?x=1") == "a.test/u/*"
+        assert url_pattern("https://a.test") == "a.test/"
+
+    def test_local_targets_without_browser(self):
+        """Test that the local target pages are all served over HTTP"""
+        with TargetServer() as server:
+            router = FetchRouter(driver_factory=None)
+            for path in ["/html", "/json", "/search?q=termux"]:
+                result, _ = router.fetch(server.base_url + path)
+                assert result["route"] == "http", result
+            router.client.close()
+
+        assert router.report()["no_browser_share"] == 1.0
@@ -0,0 +1,108 @@
+import pytest
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from html_extract import StreamingExtractor, extract_from_response, get_extractor, synthetic_page
+
+
+class FakeRaw:
+    def __init__(self, wire_bytes):
+        self.wire_bytes = wire_bytes
+
+    def tell(self):
+        return self.wire_bytes
+
+
+class FakeStreamedResponse:
+    """Decoded body in chunks; the raw stream reports how much came off the wire"""
+
+    def __init__(self, body, headers, wire_bytes):
+        self.body = body
+        self.headers = headers
+        self.raw = FakeRaw(wire_bytes)
+        self.encoding = "utf-8"
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
+class TestHTMLExtract:
+    @pytest.fixture
+    def page(self):
+        return synthetic_page(200000)
+
+    def test_streaming_stops_after_title(self, page):
+        """Test that the streaming engine reads only the first chunk for a head title"""
+        extractor = StreamingExtractor(chunk_size=4096)
+        chunks = (page[i:i + 4096] for i in range(0, len(page), 4096))
+
+        fields, bytes_read, complete = extractor.extract_chunks(chunks)
+
+        assert fields == {"title": "Benchmark page"}
+        assert complete
+        assert bytes_read == 4096
+
+    def test_engines_agree(self, page):
+        """Test that the streaming and BeautifulSoup engines extract the same fields"""
+        fields = ("title", "h1", "description")
+        streaming = get_extractor("streaming", fields).extract(page)
+        soup = get_extractor("soup", fields).extract(page)
+
+        assert streaming == soup == {
+            "title": "Benchmark page",
+            "h1": "Heading",
+            "description": "synthetic"
+        }
+
+    def test_missing_title_reads_whole_page(self):
+        """Test that a page without a title is read to the end and yields None"""
+        page = b"<html><body>" + b"<p>x</p>" * 1000 + b"</body></html>"
+        chunks = (page[i:i + 1024] for i in range(0, len(page), 1024))
+
+        fields, bytes_read, complete = StreamingExtractor(chunk_size=1024).extract_chunks(chunks)
+
+        assert fields == {"title": None}
+        assert not complete
+        assert bytes_read == len(page)
+
+    def test_unknown_engine(self):
+        """Test that an unknown engine name is rejected"""
+        with pytest.raises(ValueError):
+            get_extractor("regex")
+
+    def test_compressed_body_is_drained(self, page):
+        """Test that a gzip body fully on the wire is drained, not closed"""
+        # Decoded chunks far exceed the compressed Content-Length
+        response = FakeStreamedResponse(page[:80000], {"Content-Length": "3000", "Content-Encoding": "gzip"},
+                                        wire_bytes=3000)
+
+        fields, bytes_read = extract_from_response(response, StreamingExtractor(chunk_size=4096))
+
+        assert fields == {"title": "Benchmark page"}
+        assert not response.closed
+        assert bytes_read == 80000
+
+    def test_large_remainder_closes(self, page):
+        """Test that a big unread remainder closes the connection instead"""
+        response = FakeStreamedResponse(page, {"Content-Length": str(len(page))}, wire_bytes=4096)
+
+        _, bytes_read = extract_from_response(response, StreamingExtractor(chunk_size=4096))
+
+        assert response.closed
+        assert bytes_read == 4096
+
+    def test_unknown_length_closes(self, page):
+        """Test that without Content-Length the stream is closed, not drained blindly"""
+        response = FakeStreamedResponse(page, {}, wire_bytes=4096)
+
+        extract_from_response(response, StreamingExtractor(chunk_size=4096))
+
+        assert response.closed
@@ -0,0 +1,60 @@
+import pytest
+import threading
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from http_client import PooledHTTPClient
+from target_server import TargetServer
+
+
+class TestPooledHTTPClient:
+    @pytest.fixture
+    def server(self):
+        with TargetServer() as server:
+            yield server
+
+    def test_cold_then_warm(self, server):
+        """Test that only the first request to a host opens a connection"""
+        client = PooledHTTPClient()
+        try:
+            tags = [client.get(server.base_url + path)[2] for path in ["/html", "/json", "/html"]]
+        finally:
+            client.close()
+
+        assert tags == [True, False, False]
+        assert client.stats() == {"cold_requests": 1, "warm_requests": 2}
+
+    def test_close_drops_connections(self, server):
+        """Test that a request after close() is cold again"""
+        client = PooledHTTPClient()
+        client.get(server.base_url + "/json")
+        client.close()
+
+        _, elapsed_ms, cold = client.get(server.base_url + "/json")
+        client.close()
+
+        assert cold
+        assert elapsed_ms > 0
+
+    def test_pool_per_thread(self, server):
+        """Test that concurrent requests open at most pool_maxsize kept-alive sockets"""
+        client = PooledHTTPClient(pool_maxsize=2)
+        barrier = threading.Barrier(2)
+
+        def fetch():
+            barrier.wait()
+            for _ in range(3):
+                client.get(server.base_url + "/json")
+
+        threads = [threading.Thread(target=fetch) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        client.close()
+
+        assert client.cold_requests + client.warm_requests == 6
+        assert client.cold_requests <= 2
@@ -0,0 +1,64 @@
+import pytest
+import sys
+import os
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from latency_prober import AsyncLatencyProber, percentile, summarize_samples
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestLatencyProber:
+    @pytest.fixture
+    def server_url(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}/"
+        server.shutdown()
+        server.server_close()
+
+    def test_percentile_interpolation(self):
+        """Test percentile interpolation on a sorted list"""
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        assert percentile(values, 0) == 1.0
+        assert percentile(values, 50) == 3.0
+        assert percentile(values, 90) == pytest.approx(4.6)
+        assert percentile([], 50) is None
+
+    def test_summary_keys(self):
+        """Test that summaries report min/p50/p90/p99/max"""
+        summary = summarize_samples([3.0, 1.0, 2.0])
+        assert summary["min_ms"] == 1.0
+        assert summary["p50_ms"] == 2.0
+        assert summary["max_ms"] == 3.0
+
+    def test_probe_local_server(self, server_url):
+        """Test sampling over one keep-alive connection"""
+        prober = AsyncLatencyProber(samples=10, warmup=2)
+        result = prober.run([server_url])[server_url]
+
+        assert result["status"] == "success"
+        assert result["status_code"] == 204
+        assert result["samples"] == 10
+        assert result["reconnects"] == 0
+        assert result["min_ms"] <= result["p50_ms"] <= result["max_ms"]
+
+    def test_probe_unreachable(self):
+        """Test that connection failures are reported per site"""
+        prober = AsyncLatencyProber(samples=1, warmup=0, timeout=2)
+        result = prober.run(["http://127.0.0.1:9/"])["http://127.0.0.1:9/"]
+        assert result["status"] == "error"
@@ -0,0 +1,61 @@
+import pytest
+import sys
+import os
+from urllib.parse import unquote
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import lean_profile
+from lean_profile import BLACKHOLE_PROXY, LeanProfile, blocklist_pac, compare_profiles
+
+
+class TestLeanProfile:
+    def test_blocklist_pac(self):
+        """Test that listed hosts go to the dead proxy and the rest connect directly"""
+        pac = blocklist_pac(["*.tracker.test", "ads.test"])
+
+        assert pac.startswith("function FindProxyForURL(url, host) {")
+        assert 'shExpMatch(host, "*.tracker.test") || shExpMatch(host, "ads.test")' in pac
+        assert f'return "{BLACKHOLE_PROXY}";' in pac
+        assert pac.endswith('return "DIRECT"; }')
+
+    def test_preferences(self):
+        """Test resource prefs and a PAC proxy that never fails over to direct"""
+        prefs = LeanProfile(block=("images",), blocklist=("*.tracker.test",)).preferences()
+
+        assert prefs["permissions.default.image"] == 2
+        assert "gfx.downloadable_fonts.enabled" not in prefs
+        assert prefs["network.proxy.type"] == 2
+        assert prefs["network.proxy.failover_direct"] is False
+        pac_url = prefs["network.proxy.autoconfig_url"]
+        assert pac_url.startswith("data:application/x-ns-proxy-autoconfig,")
+        assert unquote(pac_url.split(",", 1)[1]) == blocklist_pac(("*.tracker.test",))
+
+    def test_no_blocklist_keeps_proxy_settings(self):
+        """Test that an empty blocklist leaves the proxy alone"""
+        prefs = LeanProfile(blocklist=()).preferences()
+        assert not any(name.startswith("network.proxy.") for name in prefs)
+
+    def test_unknown_resource_type(self):
+        """Test that a typo in the block list is rejected"""
+        with pytest.raises(ValueError):
+            LeanProfile(block=("images", "videos"))
+
+    def test_compare_alternates_order(self, monkeypatch):
+        """Test that the profiles take turns loading first"""
+        loads = []
+
+        def fake_load(driver, url, timeout):
+            loads.append(driver)
+            full = driver == "full"
+            return {"status": "success", "load_time_seconds": 2.0 if full else 1.5,
+                    "transfer_bytes": 1000 if full else 400}
+
+        monkeypatch.setattr(lean_profile, "_load", fake_load)
+        comparison, totals = compare_profiles("full", "lean", ["u1", "u2", "u3"])
+
+        assert loads == ["full", "lean", "lean", "full", "full", "lean"]
+        assert [entry["first"] for entry in comparison.values()] == ["full", "lean", "full"]
+        assert totals["seconds_saved"] == 1.5
+        assert totals["bytes_saved"] == 1800
@@ -0,0 +1,48 @@
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from navigation_timing import navigation_breakdown
+
+
+class TestNavigationTiming:
+    def test_https_breakdown(self):
+        """Test phase split for a TLS navigation"""
+        entry = {
+            "startTime": 0, "redirectStart": 0, "redirectEnd": 0,
+            "domainLookupStart": 5, "domainLookupEnd": 25,
+            "connectStart": 25, "secureConnectionStart": 40, "connectEnd": 90,
+            "requestStart": 91, "responseStart": 191, "responseEnd": 211,
+            "domContentLoadedEventEnd": 300, "loadEventEnd": 450,
+            "transferSize": 1234
+        }
+        timing = navigation_breakdown(entry)
+
+        assert timing["dns_ms"] == 20
+        assert timing["connect_ms"] == 15
+        assert timing["tls_ms"] == 50
+        assert timing["ttfb_ms"] == 100
+        assert timing["response_ms"] == 20
+        assert timing["dom_content_loaded_ms"] == 300
+        assert timing["load_ms"] == 450
+        assert timing["redirect_ms"] == 0
+
+    def test_plain_http_has_no_tls(self):
+        """Test that plain HTTP reports no TLS phase"""
+        entry = {
+            "startTime": 0, "domainLookupStart": 1, "domainLookupEnd": 1,
+            "connectStart": 1, "secureConnectionStart": 0, "connectEnd": 11,
+            "requestStart": 11, "responseStart": 31, "responseEnd": 32,
+            "domContentLoadedEventEnd": 40, "loadEventEnd": 0
+        }
+        timing = navigation_breakdown(entry)
+
+        assert timing["tls_ms"] is None
+        assert timing["connect_ms"] == 10
+        assert timing["load_ms"] is None
+
+    def test_missing_entry(self):
+        """Test that a missing entry gives no breakdown"""
+        assert navigation_breakdown(None) is None
@@ -0,0 +1,92 @@
+import pytest
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from page_extract import ELEMENT_REFERENCE_BYTES, extract_page_info, page_info_from_payload, round_trip_report
+
+COOKIES = [
+    {"name": "session", "value": "abc", "httpOnly": True, "secure": True, "path": "/"},
+    {"name": "theme", "value": "dark", "httpOnly": False, "secure": False, "path": "/"},
+    {"name": "a", "value": "1"},
+    {"name": "b", "value": "2"}
+]
+
+
+def payload(paragraphs=3, first_length=150, cookies=()):
+    return {
+        "title": "Example",
+        "url": "https://example.com/",
+        "content_length": 1000,
+        "cookies": list(cookies),
+        "paragraph_count": paragraphs,
+        "sample_text": "x" * min(first_length, 100) if paragraphs else None,
+        "first_paragraph_length": first_length if paragraphs else 0
+    }
+
+
+class FakeDriver:
+    def __init__(self):
+        self.commands = []
+
+    def execute_script(self, script, script_cookies):
+        self.commands.append("execute_script")
+        # document.cookie never exposes HttpOnly cookies or attributes
+        visible = [{"name": c["name"], "value": c["value"]} for c in COOKIES if not c.get("httpOnly")]
+        return payload(cookies=visible[:3] if script_cookies else [])
+
+    def get_cookies(self):
+        self.commands.append("get_cookies")
+        return COOKIES
+
+
+class TestPageExtract:
+    def test_page_info_layout(self):
+        """Test that the payload maps onto the legacy page_info keys"""
+        info = page_info_from_payload(payload(cookies=COOKIES[:1]))
+
+        assert info == {
+            "title": "Example",
+            "url": "https://example.com/",
+            "content_length": 1000,
+            "headers": COOKIES[:1],
+            "paragraph_count": 3,
+            "sample_text": "x" * 100 + "..."
+        }
+
+    def test_short_and_missing_paragraphs(self):
+        """Test the ellipsis rule and pages without paragraphs"""
+        assert page_info_from_payload(payload(first_length=40))["sample_text"] == "x" * 40
+        assert "sample_text" not in page_info_from_payload(payload(paragraphs=0))
+
+    def test_round_trip_report(self):
+        """Test the command count and byte estimate versus per-field calls"""
+        report = round_trip_report(payload(paragraphs=3, first_length=150), commands=2)
+
+        assert report["legacy_commands"] == 7
+        assert report["commands_saved"] == 5
+        assert report["legacy_bytes_estimate"] >= 1000 + 3 * ELEMENT_REFERENCE_BYTES + 2 * 152
+        assert report["bytes_saved"] == report["legacy_bytes_estimate"] - report["payload_bytes"]
+
+        no_paragraphs = round_trip_report(payload(paragraphs=0))
+        assert no_paragraphs["legacy_commands"] == 5 and no_paragraphs["commands_saved"] == 4
+
+    def test_cookies_from_webdriver_by_default(self):
+        """Test that HttpOnly cookies and attributes are kept by default"""
+        driver = FakeDriver()
+        info, report = extract_page_info(driver)
+
+        assert driver.commands == ["execute_script", "get_cookies"]
+        assert info["headers"] == COOKIES[:3]
+        assert report["commands"] == 2
+
+    def test_script_cookies_opt_in(self):
+        """Test the single-command path reading document.cookie"""
+        driver = FakeDriver()
+        info, report = extract_page_info(driver, script_cookies=True)
+
+        assert driver.commands == ["execute_script"]
+        assert [cookie["name"] for cookie in info["headers"]] == ["theme", "a", "b"]
+        assert report["commands"] == 1
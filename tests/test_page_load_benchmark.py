@@ -0,0 +1,138 @@
+import pytest
+import threading
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import page_load_benchmark
+from page_load_benchmark import ParallelPageLoadBenchmark, max_workers_for_memory, measure_page_load
+
+
+class FakeDriver:
+    def __init__(self, name):
+        self.name = name
+        self.loaded = []
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def fake_navigate(driver, url, ready, timeout):
+    if url.endswith("/broken"):
+        raise TimeoutError(f"{url} not ready")
+    driver.loaded.append(url)
+    return {"get_ms": 5.0, "ready_ms": 20.0}
+
+
+class TestParallelPageLoadBenchmark:
+    @pytest.fixture(autouse=True)
+    def fake_browser(self, monkeypatch):
+        monkeypatch.setattr(page_load_benchmark, "navigate", fake_navigate)
+        monkeypatch.setattr(page_load_benchmark, "collect_navigation_timing", lambda driver: None)
+        monkeypatch.setattr(page_load_benchmark, "available_memory_mb", lambda: None)
+
+    def test_every_url_once_in_input_order(self):
+        """Test that workers share the queue and results keep the input order"""
+        drivers = []
+        lock = threading.Lock()
+
+        def factory():
+            with lock:
+                drivers.append(FakeDriver(f"d{len(drivers)}"))
+                return drivers[-1]
+
+        urls = [f"http://site.test/{i}" for i in range(12)] + ["http://site.test/broken"]
+        streamed = []
+        benchmark = ParallelPageLoadBenchmark(factory, workers=3,
+                                              on_result=lambda url, result: streamed.append(url))
+        results, throughput = benchmark.run(urls)
+
+        assert list(results) == urls
+        assert sorted(streamed) == sorted(urls)
+        assert sum(len(driver.loaded) for driver in drivers) == 12
+        assert results["http://site.test/broken"]["status"] == "error"
+        assert throughput["workers"] == 3 and throughput["pages_loaded"] == 12
+        assert all(driver.quit_called for driver in drivers)
+
+    def test_primary_driver_is_borrowed(self):
+        """Test that the warm primary driver loads pages but is not quit"""
+        primary = FakeDriver("primary")
+        benchmark = ParallelPageLoadBenchmark(lambda: FakeDriver("extra"), workers=1,
+                                              primary_driver=primary)
+        results, _ = benchmark.run(["http://site.test/a", "http://site.test/b"])
+
+        assert primary.loaded == ["http://site.test/a", "http://site.test/b"]
+        assert not primary.quit_called
+        assert {result["worker"] for result in results.values()} == {0}
+
+    def test_no_browser_available(self):
+        """Test that URLs are reported as errors when every driver fails to start"""
+        def factory():
+            raise RuntimeError("geckodriver missing")
+
+        results, throughput = ParallelPageLoadBenchmark(factory, workers=2).run(["http://site.test/a"])
+
+        assert results["http://site.test/a"]["error"] == "No browser worker available"
+        assert throughput["pages_loaded"] == 0
+
+
+class FailingWaterfall:
+    def capture(self, driver):
+        raise RuntimeError("Resource Timing script failed")
+
+
+class TestMeasurePageLoad:
+    def test_waterfall_failure_keeps_load(self, monkeypatch):
+        """Test that a failed waterfall capture leaves a successful load intact"""
+        monkeypatch.setattr(page_load_benchmark, "navigate", fake_navigate)
+        monkeypatch.setattr(page_load_benchmark, "collect_navigation_timing", lambda driver: None)
+
+        result = measure_page_load(FakeDriver("d"), "http://site.test/a", waterfall=FailingWaterfall())
+
+        assert result["status"] == "success"
+        assert result["load_time_seconds"] == 0.02
+        assert result["waterfall_error"] == "Resource Timing script failed"
+
+
+class TestHarnessOverhead:
+    @pytest.fixture(autouse=True)
+    def fake_browser(self, monkeypatch):
+        monkeypatch.setattr(page_load_benchmark, "navigate", fake_navigate)
+
+    def test_against_load_event(self, monkeypatch):
+        """Test that overhead is measured against loadEventEnd once it fired"""
+        monkeypatch.setattr(page_load_benchmark, "collect_navigation_timing",
+                            lambda driver: {"load_ms": 15.0, "dom_content_loaded_ms": 8.0})
+        overhead = measure_page_load(FakeDriver("d"), "http://site.test/a")["harness_overhead"]
+
+        assert overhead["browser_milestone"] == "load_ms"
+        assert overhead["overhead_ms"] == 5.0
+
+    def test_before_load_event(self, monkeypatch):
+        """Test that an early ready condition falls back to DOMContentLoaded, then to nothing"""
+        timing = {"load_ms": None, "dom_content_loaded_ms": 12.0}
+        monkeypatch.setattr(page_load_benchmark, "collect_navigation_timing", lambda driver: dict(timing))
+        overhead = measure_page_load(FakeDriver("d"), "http://site.test/a")["harness_overhead"]
+        assert overhead["browser_milestone"] == "dom_content_loaded_ms"
+        assert overhead["overhead_ms"] == 8.0
+
+        timing["dom_content_loaded_ms"] = None
+        overhead = measure_page_load(FakeDriver("d"), "http://site.test/a")["harness_overhead"]
+        assert overhead["overhead_ms"] is None and overhead["browser_milestone"] is None
+
+
+class TestMaxWorkersForMemory:
+    def test_memory_cap(self, monkeypatch):
+        """Test that the worker count is capped by available memory but never below one"""
+        monkeypatch.setattr(page_load_benchmark, "available_memory_mb", lambda: 1000)
+        assert max_workers_for_memory(4, mb_per_worker=400) == 2
+        assert max_workers_for_memory(4, mb_per_worker=4000) == 1
+        assert max_workers_for_memory(0) == 1
+
+    def test_unknown_memory(self, monkeypatch):
+        """Test that the request stands when /proc/meminfo is unavailable"""
+        monkeypatch.setattr(page_load_benchmark, "available_memory_mb", lambda: None)
+        assert max_workers_for_memory(6) == 6
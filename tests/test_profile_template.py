@@ -0,0 +1,127 @@
+import pytest
+import threading
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from driver_session import DriverSessionManager
+import profile_template
+from profile_template import STAMP_FILE, ProfileTemplate, _link_or_copy
+
+
+class TestProfileTemplate:
+    @pytest.fixture
+    def template(self, tmp_path):
+        template = ProfileTemplate(str(tmp_path / "template"))
+        template.build(warm=False)
+        # What a warmed profile would contain
+        for name in ("cert9.db", "places.sqlite", "prefs.js", "startupCache.bin"):
+            with open(os.path.join(template.path, name), 'w') as f:
+                f.write(name)
+        yield template
+        template.cleanup()
+
+    def test_is_current(self, tmp_path, template):
+        """Test that the stamp tracks the preference digest"""
+        assert template.is_current()
+        assert not ProfileTemplate(template.path, extra_prefs={"browser.tabs.warnOnClose": False}).is_current()
+        assert not ProfileTemplate(str(tmp_path / "missing")).is_current()
+
+    def test_user_js(self, template):
+        """Test that every template preference is written to user.js"""
+        with open(os.path.join(template.path, "user.js")) as f:
+            user_js = f.read()
+        assert 'user_pref("app.update.auto", false);' in user_js
+        assert len(user_js.splitlines()) == len(template.prefs)
+
+    def test_clone(self, template):
+        """Test that a clone shares immutable files and copies the rest"""
+        clone = template.clone()
+
+        assert sorted(os.listdir(clone)) == sorted(set(os.listdir(template.path)) - {STAMP_FILE})
+        linked = os.path.samefile(os.path.join(clone, "startupCache.bin"),
+                                  os.path.join(template.path, "startupCache.bin"))
+        # Hardlinks may be unsupported on the test filesystem; copies are fine then
+        assert linked or os.path.getsize(os.path.join(clone, "startupCache.bin")) > 0
+        for name in ("user.js", "prefs.js", "places.sqlite", "cert9.db"):
+            assert not os.path.samefile(os.path.join(clone, name), os.path.join(template.path, name))
+
+        # Writes to a session copy never reach the template
+        with open(os.path.join(clone, "prefs.js"), 'w') as f:
+            f.write("changed")
+        with open(os.path.join(template.path, "prefs.js")) as f:
+            assert f.read() == "prefs.js"
+
+    def test_cleanup(self, template):
+        """Test that cleanup removes every session copy"""
+        clones = [template.clone(), template.clone()]
+        assert clones[0] != clones[1]
+
+        template.cleanup()
+
+        assert not any(os.path.exists(clone) for clone in clones)
+        assert os.path.isdir(template.path)
+
+    def test_rebuild_replaces_in_place(self, tmp_path, template):
+        """Test that a rebuild swaps in a complete template and leaves no staging dirs"""
+        stale = ProfileTemplate(template.path, extra_prefs={"browser.tabs.warnOnClose": False})
+        stale.build(warm=False)
+
+        assert stale.is_current()
+        assert not os.path.exists(os.path.join(template.path, "places.sqlite"))
+        assert os.listdir(tmp_path) == ["template"]
+
+    def test_concurrent_clones_build_once(self, tmp_path, monkeypatch):
+        """Test that worker threads cloning a missing template build it once"""
+        template = ProfileTemplate(str(tmp_path / "template"))
+        builds = []
+        build = template.build
+        monkeypatch.setattr(template, "build", lambda warm=True: builds.append(1) or build(warm=False))
+
+        threads = [threading.Thread(target=template.clone) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(builds) == 1
+        assert len(template.clones) == 4
+        assert all(os.path.isfile(os.path.join(clone, "user.js")) for clone in template.clones)
+        template.cleanup()
+
+    def test_cleanup_after_driver_quit(self, tmp_path, monkeypatch):
+        """Test that session copies outlive the shared driver running on them"""
+        session = DriverSessionManager()
+        monkeypatch.setattr(profile_template, "shared_session", session)
+        template = ProfileTemplate(str(tmp_path / "template"))
+        template.build(warm=False)
+        clone = template.clone()
+
+        profile_at_quit = []
+
+        class Driver:
+            def quit(self):
+                profile_at_quit.append(os.path.isdir(clone))
+
+        session.driver = Driver()
+        session.shutdown()
+
+        # Firefox still had its profile until quit returned
+        assert profile_at_quit == [True]
+        assert not os.path.exists(clone)
+
+    def test_link_or_copy_falls_back(self, tmp_path, monkeypatch):
+        """Test that a failing hardlink falls back to a copy"""
+        src = tmp_path / "blob.bin"
+        src.write_bytes(b"data")
+
+        def no_links(src, dst):
+            raise OSError("hardlinks not supported")
+
+        monkeypatch.setattr(os, "link", no_links)
+        dst = _link_or_copy(str(src), str(tmp_path / "copy.bin"))
+
+        assert open(dst, 'rb').read() == b"data"
+        assert not os.path.samefile(dst, src)
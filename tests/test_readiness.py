@@ -0,0 +1,87 @@
+import pytest
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from readiness import (
+    DocumentReady, ElementPresent, JSPredicate, navigate, measure_readiness_savings,
+    strategy_condition
+)
+
+
+class FakeNoneStrategyDriver:
+    """Driver whose get() returns immediately, like pageLoadStrategy none"""
+
+    def __init__(self, polls_to_interactive=2, polls_to_complete=4):
+        self.polls_to_interactive = polls_to_interactive
+        self.polls_to_complete = polls_to_complete
+        self.old_document = False
+        self.polls = 0
+        self.loaded = False
+
+    def get(self, url):
+        # The old document lingers for one poll after navigation starts
+        self.polls = -1
+        self.loaded = True
+
+    def execute_script(self, script, *args):
+        if script.startswith("window.__seleniumTestsOldDocument = true"):
+            self.old_document = True
+            return None
+        if "__seleniumTestsOldDocument === true" in script:
+            self.polls += 1
+            if self.polls <= 0:
+                return True
+            self.old_document = False
+            return False
+        if script == "return document.readyState":
+            self.polls += 1
+            if self.polls >= self.polls_to_complete:
+                return "complete"
+            return "interactive" if self.polls >= self.polls_to_interactive else "loading"
+        return self.polls >= self.polls_to_interactive
+
+    def find_elements(self, by, value):
+        return ["element"] if self.polls >= self.polls_to_interactive else []
+
+
+class TestReadiness:
+    @pytest.fixture
+    def driver(self):
+        return FakeNoneStrategyDriver()
+
+    def test_navigate_waits_for_new_document(self, driver):
+        """Test that navigate ignores the previous, already complete document"""
+        navigate(driver, "http://example.test/", DocumentReady("interactive"), poll=0)
+
+        assert driver.polls >= driver.polls_to_interactive
+
+    def test_conditions_are_callables(self, driver):
+        """Test that element and JS conditions can be polled against a driver"""
+        driver.polls = driver.polls_to_interactive
+
+        assert ElementPresent("name", "q")(driver)
+        assert JSPredicate("window.appReady")(driver)
+        assert not DocumentReady("complete")(driver)
+
+    def test_readiness_savings(self, driver):
+        """Test that time to ready is reported against time to complete"""
+        result = measure_readiness_savings(driver, "http://example.test/", ElementPresent("name", "q"), poll=0)
+
+        assert result["status"] == "success"
+        assert result["complete_ms"] >= result["ready_ms"]
+        assert result["saved_ms"] >= 0
+
+    def test_timeout_raises(self, driver):
+        """Test that a condition that never holds raises TimeoutError"""
+        with pytest.raises(TimeoutError):
+            navigate(driver, "http://example.test/", lambda d: False, timeout=0.05, poll=0.01)
+
+    def test_strategy_conditions(self):
+        """Test that strategies map to the readiness they imply"""
+        assert strategy_condition("none") is None
+        assert strategy_condition("eager").name == "document_interactive"
+        with pytest.raises(ValueError):
+            strategy_condition("lazy")
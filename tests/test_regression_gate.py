@@ -0,0 +1,108 @@
+import pytest
+import sys
+import os
+import itertools
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from regression_gate import (
+    collect_samples, compare_metric, mann_whitney_u, metric_key, update_baseline, load_baseline
+)
+
+
+def brute_force_upper_tail(current, baseline):
+    """P(U >= observed) by enumerating every split of the pooled samples"""
+    pooled = list(current) + list(baseline)
+    observed = sum(1 for c in current for b in baseline if c > b)
+    splits = list(itertools.combinations(range(len(pooled)), len(current)))
+    hits = 0
+    for chosen in splits:
+        first = [pooled[i] for i in chosen]
+        second = [pooled[i] for i in range(len(pooled)) if i not in chosen]
+        if sum(1 for c in first for b in second if c > b) >= observed:
+            hits += 1
+    return hits / len(splits)
+
+
+class TestRegressionGate:
+    def test_exact_p_value(self):
+        """Test the exact null distribution against brute-force enumeration"""
+        current = [12.0, 15.0, 19.0, 22.0]
+        baseline = [10.0, 11.0, 13.0, 14.0, 16.0]
+
+        u, p_value = mann_whitney_u(current, baseline)
+
+        assert u == 16
+        assert p_value == pytest.approx(brute_force_upper_tail(current, baseline))
+
+    def test_slowdown_is_flagged(self):
+        """Test that a large, consistent slowdown is a regression"""
+        baseline = [100 + i for i in range(20)]
+        current = [180 + i for i in range(10)]
+
+        verdict = compare_metric(current, baseline)
+
+        assert verdict["verdict"] == "regression"
+        assert verdict["p_value"] < 0.001
+        assert verdict["effect_size"] == 1.0
+
+    def test_small_slowdown_below_threshold(self):
+        """Test that a significant but small slowdown passes the effect-size threshold"""
+        baseline = [100 + i for i in range(20)]
+        current = [110 + i for i in range(20)]
+
+        verdict = compare_metric(current, baseline, min_slowdown=0.2)
+
+        assert verdict["p_value"] < 0.05
+        assert verdict["verdict"] == "ok"
+
+    def test_insufficient_baseline(self):
+        """Test that metrics without enough baseline samples are not gated"""
+        assert compare_metric([500], [100, 101])["verdict"] == "insufficient"
+
+    def test_collect_samples_and_keys(self):
+        """Test that raw samples are preferred and local ports are normalised"""
+        results = {"tests": {
+            "latency": {"http://127.0.0.1:41157/?origin=github.com": {
+                "status": "success", "latency_ms": 12, "samples_ms": [11, 12, 13]
+            }},
+            "network_speed": {"https://example.com": {"status": "success", "load_time_seconds": 1.5}},
+            "javascript": {"status": "success", "user_agent": "x"}
+        }}
+
+        samples = collect_samples(results)
+
+        assert samples == {
+            "latency|local://target/?origin=github.com": [11, 12, 13],
+            "network_speed|https://example.com": [1500]
+        }
+        assert metric_key("dns_resolution", "google.com") == "dns_resolution|google.com"
+
+    def test_ci_runner_results_are_gated(self, monkeypatch):
+        """Test that the CI runner's navigation tests produce samples the gate can fail on"""
+        import selenium_ci
+        loads = itertools.count(100, 10)
+        monkeypatch.setattr(selenium_ci, "navigate",
+                            lambda driver, url, ready: {"get_ms": 1.0, "ready_ms": float(next(loads))})
+        monkeypatch.setattr(selenium_ci, "collect_navigation_timing", lambda driver: None)
+
+        class Driver:
+            title = "Herman Melville - Moby-Dick"
+            current_url = "http://127.0.0.1:8000/html"
+
+        runner = selenium_ci.GitHubSeleniumRunner(navigation_samples=5)
+        runner.test_basic_navigation(Driver())
+        samples = collect_samples(runner.results)
+
+        assert samples == {"basic_navigation": [100.0, 110.0, 120.0, 130.0, 140.0]}
+        slower = [value * 2 for value in samples["basic_navigation"]]
+        assert compare_metric(slower, samples["basic_navigation"])["verdict"] == "regression"
+
+    def test_baseline_keeps_recent_samples(self, tmp_path):
+        """Test that updating the baseline appends and trims per metric"""
+        path = str(tmp_path / "baseline.json")
+        update_baseline(path, None, {"latency|a": [1, 2, 3]}, max_samples=4)
+        update_baseline(path, load_baseline(path), {"latency|a": [4, 5]}, max_samples=4)
+
+        assert load_baseline(path)["metrics"]["latency|a"] == [2, 3, 4, 5]
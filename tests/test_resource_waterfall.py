@@ -0,0 +1,90 @@
+import json
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from resource_waterfall import BROWSER_BUFFER_SIZE, RESOURCE_FIELDS, WaterfallRecorder, har_timings
+
+
+def entry(name, initiator, start, end, transfer, request_start=None, **fields):
+    values = dict(name=name, initiatorType=initiator, startTime=start, duration=end - start,
+                  fetchStart=start, requestStart=request_start or 0, responseEnd=end,
+                  transferSize=transfer, encodedBodySize=transfer, decodedBodySize=transfer * 2,
+                  nextHopProtocol="h2", responseStatus=200)
+    if request_start:
+        values["responseStart"] = request_start + 10
+    values.update(fields)
+    return [values.get(field) for field in RESOURCE_FIELDS]
+
+
+class FakeDriver:
+    def execute_script(self, script, fields):
+        assert fields == RESOURCE_FIELDS
+        return {
+            "url": "https://example.com/",
+            "title": "Example",
+            "timeOrigin": 1700000000000.0,
+            "navigation": [entry("https://example.com/", "navigation", 0, 400, 5000, request_start=20)],
+            "resources": [
+                entry("https://example.com/app.js", "script", 100, 900, 90000, request_start=150,
+                      domainLookupStart=100, domainLookupEnd=120, connectStart=120, connectEnd=140,
+                      secureConnectionStart=130),
+                entry("https://cdn.example.net/font.woff2", "css", 120, 300, 40000),
+                entry("https://example.com/api", "fetch", 500, 520, 300, request_start=505)
+            ]
+        }
+
+
+class TestResourceWaterfall:
+    def test_timing_phases(self):
+        """Test HAR phases for a timed and an opaque cross-origin entry"""
+        timed = dict(zip(RESOURCE_FIELDS, entry("a", "script", 100, 900, 1, request_start=150,
+                                               domainLookupStart=100, domainLookupEnd=120,
+                                               connectStart=120, connectEnd=140,
+                                               secureConnectionStart=130)))
+        timings, opaque = har_timings(timed)
+        assert not opaque
+        assert timings == {"blocked": 10, "dns": 20, "connect": 20, "ssl": 10,
+                           "send": 0, "wait": 10, "receive": 740}
+
+        opaque_entry = dict(zip(RESOURCE_FIELDS, entry("b", "css", 120, 300, 1)))
+        timings, opaque = har_timings(opaque_entry)
+        assert opaque and timings["wait"] == 180 and timings["dns"] == -1
+
+    def test_summary_and_har(self, tmp_path):
+        """Test top-N lists and a HAR file with the document first"""
+        recorder = WaterfallRecorder(str(tmp_path / "run.har"), top=2)
+        summary = recorder.capture(FakeDriver())
+
+        assert summary["resources"] == 4
+        assert [row["url"] for row in summary["slowest"]] == [
+            "https://example.com/app.js", "https://example.com/"
+        ]
+        assert summary["heaviest"][0]["transfer_size"] == 90000
+        assert summary["by_type"]["script"] == {"count": 1, "transfer_size": 90000}
+        assert not summary["truncated"]
+
+        with open(recorder.save()) as f:
+            log = json.load(f)["log"]
+        assert log["version"] == "1.2"
+        assert log["pages"][0]["title"] == "Example"
+        assert log["entries"][0]["_initiatorType"] == "document"
+        assert all(e["pageref"] == "page_1" for e in log["entries"])
+
+    def test_truncated_at_browser_buffer(self, tmp_path):
+        """Test that a page filling the browser's Resource Timing buffer is flagged"""
+        recorder = WaterfallRecorder(str(tmp_path / "run.har"))
+
+        def page(count):
+            return {"url": "https://example.com/", "navigation": [],
+                    "resources": [entry(f"https://example.com/{i}.png", "img", i, i + 5, 10)
+                                  for i in range(count)]}
+
+        assert not recorder.add_page(page(BROWSER_BUFFER_SIZE - 1))["truncated"]
+        assert recorder.add_page(page(BROWSER_BUFFER_SIZE))["truncated"]
+
+    def test_nothing_captured(self, tmp_path):
+        """Test that an unused recorder writes no file"""
+        assert WaterfallRecorder(str(tmp_path / "empty.har")).save() is None
@@ -0,0 +1,71 @@
+import pytest
+import sys
+import os
+import json
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from result_sink import JSONLResultSink, build_summary, write_summary
+
+
+class TestResultSink:
+    @pytest.fixture
+    def stream_path(self, tmp_path):
+        return str(tmp_path / "results.jsonl")
+
+    def test_one_line_per_record(self, stream_path):
+        """Test that every measurement becomes one JSON line"""
+        sink = JSONLResultSink(stream_path, run_info={"timestamp": "t0"})
+        sink.record("latency", {"status": "success", "latency_ms": 12.5}, key="https://a")
+        sink.record("latency", {"status": "error", "error": "boom"}, key="https://b")
+        sink.close()
+
+        with open(stream_path) as f:
+            lines = [json.loads(line) for line in f]
+
+        assert [line["type"] for line in lines] == ["run", "measurement", "measurement"]
+        assert lines[1]["key"] == "https://a"
+
+    def test_summary_matches_legacy_layout(self, stream_path):
+        """Test that the stream rebuilds the legacy results layout"""
+        sink = JSONLResultSink(stream_path, run_info={"timestamp": "t0", "environment": "Termux"})
+        sink.record("web_scraping", {"status": "success"}, key="https://a")
+        sink.record("network_speed", {"status": "success", "download_mbps": 10})
+        sink.meta("connection_pool", {"cold_requests": 1})
+        sink.close()
+
+        summary = build_summary(stream_path)
+
+        assert summary == {
+            "timestamp": "t0",
+            "environment": "Termux",
+            "tests": {
+                "web_scraping": {"https://a": {"status": "success"}},
+                "network_speed": {"status": "success", "download_mbps": 10}
+            },
+            "connection_pool": {"cold_requests": 1}
+        }
+
+    def test_stream_rotated_per_run(self, stream_path):
+        """Test that each run starts a fresh stream and only the previous one is kept"""
+        for value in (1, 2, 3):
+            sink = JSONLResultSink(stream_path, run_info={"timestamp": f"t{value}"})
+            sink.record("x", {"status": "success", "value": value})
+            sink.close()
+
+        with open(stream_path) as f:
+            assert sum(1 for line in f if '"type": "run"' in line) == 1
+        assert build_summary(stream_path)["tests"]["x"]["value"] == 3
+        assert build_summary(stream_path + ".1")["tests"]["x"]["value"] == 2
+
+    def test_truncated_line_ignored(self, stream_path, tmp_path):
+        """Test that a half-written line from a crash is skipped"""
+        sink = JSONLResultSink(stream_path, run_info={"timestamp": "t0"})
+        sink.record("x", {"status": "success"})
+        sink.close()
+        with open(stream_path, 'a') as f:
+            f.write('{"type": "measurement", "run_id"')
+
+        summary = write_summary(stream_path, str(tmp_path / "summary.json"))
+        assert summary["tests"]["x"]["status"] == "success"
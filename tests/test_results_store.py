@@ -0,0 +1,78 @@
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from results_store import ResultsStore, headline_timing, store_run
+
+
+def run_results(days_ago, load_seconds, latency_ms):
+    return {
+        "timestamp": (datetime.now() - timedelta(days=days_ago)).isoformat(),
+        "tests": {
+            "network_speed": {
+                "https://a": {"status": "success", "load_time_seconds": load_seconds},
+                "https://b": {"status": "error", "error": "timeout", "load_time_seconds": None}
+            },
+            "latency": {"https://a": {"status": "success", "latency_ms": latency_ms}},
+            "screenshot": {"status": "success", "file": "x.png"}
+        },
+        "session": {"cold_starts": 1}
+    }
+
+
+class TestResultsStore:
+    @pytest.fixture
+    def store(self, tmp_path):
+        store = ResultsStore(str(tmp_path / "history.sqlite"))
+        yield store
+        store.close()
+
+    def test_append_flattens_results(self, store):
+        """Test that every test/target pair becomes one indexed row"""
+        stored = store.append_run("selenium", run_results(0, 1.5, 40), environment="local")
+
+        assert stored == 4
+        rows = store.samples(test="network_speed")
+        assert [(row["target"], row["value_ms"]) for row in rows] == [("https://a", 1500)]
+
+    def test_trend_and_slowest(self, store):
+        """Test that trend buckets by day and slowest ranks targets by median"""
+        for days_ago, load_seconds in ((2, 1.0), (1, 2.0), (1, 4.0), (0, 3.0)):
+            store.append_run("selenium", run_results(days_ago, load_seconds, 50), environment="local")
+
+        trend = store.trend(test="network_speed", days=7)
+        slowest = store.slowest(days=7)
+
+        assert [row["count"] for row in trend] == [1, 2, 1]
+        assert trend[1]["p50_ms"] == 3000
+        assert slowest[0]["target"] == "https://a"
+        assert store.trend(test="network_speed", days=0.5)[0]["count"] == 1
+
+    def test_moving_percentiles(self, store):
+        """Test that moving percentiles only look at the last window samples"""
+        for days_ago, latency in enumerate((10, 20, 30, 1000)):
+            store.append_run("network", run_results(4 - days_ago, 1, latency), environment="termux")
+
+        moving = store.moving_percentiles(test="latency", environment="termux", window=2)
+
+        assert [row["p50_ms"] for row in moving] == [10, 15, 25, 515]
+
+    def test_headline_timing(self):
+        """Test that the headline metric is normalised to milliseconds"""
+        assert headline_timing({"load_time": 0.25}) == ("load_time", 250)
+        assert headline_timing({"status": "success"}) == (None, None)
+
+    def test_store_run_honours_environment(self, tmp_path, monkeypatch):
+        """Test that SELENIUM_TESTS_DB and SELENIUM_TESTS_NO_HISTORY are read per call"""
+        db = str(tmp_path / "elsewhere.sqlite")
+        monkeypatch.setenv("SELENIUM_TESTS_DB", db)
+
+        assert store_run("network", run_results(0, 1, 20)) == 4
+        assert os.path.exists(db)
+
+        monkeypatch.setenv("SELENIUM_TESTS_NO_HISTORY", "1")
+        assert store_run("network", run_results(0, 1, 20)) is None
@@ -0,0 +1,97 @@
+import pytest
+import base64
+import struct
+import zlib
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from screenshot_pipeline import ScreenshotPipeline, capture_base64
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def png_base64(width, height, color=(200, 30, 30)):
+    """Solid RGB PNG built by hand, so only the Pillow tests need Pillow"""
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    # Filter byte 0 (none) before every row
+    pixels = (b"\x00" + bytes(color) * width) * height
+    png = (b"\x89PNG\r\n\x1a\n" + png_chunk(b"IHDR", header) +
+           png_chunk(b"IDAT", zlib.compress(pixels)) + png_chunk(b"IEND", b""))
+    return base64.b64encode(png).decode("ascii")
+
+
+class FakeDriver:
+    """Viewport-only driver that resizes its window for full-page fallback"""
+
+    def __init__(self):
+        self.window = {"width": 400, "height": 300}
+        self.sizes = []
+
+    def get_screenshot_as_base64(self):
+        return png_base64(self.window["width"], self.window["height"])
+
+    def get_window_size(self):
+        return dict(self.window)
+
+    def set_window_size(self, width, height):
+        self.window = {"width": width, "height": height}
+        self.sizes.append((width, height))
+
+    def execute_script(self, script):
+        return [400, 1200]
+
+
+class TestScreenshotPipeline:
+    @pytest.fixture
+    def pipeline(self, tmp_path):
+        with ScreenshotPipeline(str(tmp_path)) as pipeline:
+            yield pipeline
+
+    def test_content_addressed_dedupe(self, pipeline):
+        """Test that identical frames are stored once under their hash"""
+        driver = FakeDriver()
+        first = pipeline.capture(driver, name="a").result()
+        second = pipeline.capture(driver, name="b").result()
+
+        assert first["file"] == second["file"]
+        assert os.path.basename(first["file"]) == first["sha256"][:16] + ".png"
+        assert not first["duplicate"] and second["duplicate"]
+        assert first["capture_ms"] >= 0 and first["decode_ms"] >= 0
+
+    def test_full_page_fallback(self):
+        """Test that the window is grown to the document and restored"""
+        driver = FakeDriver()
+        data, full_page = capture_base64(driver, full_page=True)
+
+        assert full_page
+        assert driver.sizes == [(400, 1200), (400, 300)]
+        assert data == png_base64(400, 1200)
+
+    def test_downscale_and_recompress(self, tmp_path):
+        """Test that Pillow downscales wide frames and recompresses them"""
+        pytest.importorskip("PIL")
+        with ScreenshotPipeline(str(tmp_path), max_width=200, image_format="jpeg") as pipeline:
+            pipeline.capture(FakeDriver(), name="small")
+            [stored] = pipeline.drain()
+
+        assert stored["size"] == [200, 150]
+        assert stored["file"].endswith(".jpeg")
+        from PIL import Image
+        with Image.open(stored["file"]) as image:
+            assert image.format == "JPEG"
+
+    def test_no_worker_until_first_capture(self, tmp_path):
+        """Test that a pipeline that never captures starts no thread"""
+        pipeline = ScreenshotPipeline(str(tmp_path))
+        assert pipeline.executor is None
+
+        pipeline.capture(FakeDriver()).result()
+        assert pipeline.executor is not None
+
+        pipeline.close()
+        assert pipeline.executor is None
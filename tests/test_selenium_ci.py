@@ -0,0 +1,30 @@
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import visual_diff
+from selenium_ci import GitHubSeleniumRunner
+
+
+class MissingDependencyBaseline:
+    def check(self, name, image_path):
+        raise ImportError("visual diff needs numpy and Pillow (No module named 'numpy')")
+
+
+class TestVisualDiffCheck:
+    def test_missing_dependencies_skip(self):
+        """Test that a visual diff without numpy/Pillow is skipped, not failed"""
+        runner = GitHubSeleniumRunner(visual_baseline=MissingDependencyBaseline())
+        runner.test_visual_diff({"name": "ci_screenshot", "file": "frame.png"})
+
+        result = runner.results["tests"]["visual_diff"]
+        assert result["status"] == "skipped"
+        assert "numpy" in result["reason"]
+
+    def test_missing_dependencies_named(self, monkeypatch):
+        """Test that missing optional packages are reported by their pip names"""
+        import importlib.util
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+        assert visual_diff.missing_dependencies() == ["numpy", "Pillow"]
@@ -0,0 +1,54 @@
+import pytest
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from startup_profile import over_budget, parse_importtime, profile_import
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _json
+import time:       900 |       1020 |   json.decoder
+import time:       300 |       1320 | json
+import time:        40 |         40 |   queue
+import time:      2000 |       2040 | result_sink
+Traceback lines and warnings are ignored
+"""
+
+
+class TestStartupProfile:
+    def test_parse_importtime(self):
+        """Test that rows keep self, cumulative time and nesting depth"""
+        rows = parse_importtime(IMPORTTIME)
+
+        assert rows[0] == ("_json", 120, 120, 2)
+        assert rows[2] == ("json", 300, 1320, 0)
+        assert [row[0] for row in rows] == ["_json", "json.decoder", "json", "queue", "result_sink"]
+
+    def test_over_budget(self):
+        """Test that only successful imports above the budget fail the check"""
+        reports = {
+            "fast": {"status": "success", "import_ms": 20.0},
+            "slow": {"status": "success", "import_ms": 250.0},
+            "broken": {"status": "error", "error": "ModuleNotFoundError"}
+        }
+
+        assert over_budget(reports, 100) == ["slow"]
+        assert over_budget(reports, None) == []
+
+    def test_profile_real_module(self):
+        """Test a fresh-interpreter import of a script module"""
+        report = profile_import("result_sink", top=3)
+
+        assert report["status"] == "success"
+        assert report["import_ms"] > 0
+        assert len(report["heaviest_modules_self_ms"]) == 3
+
+    def test_profile_missing_module(self):
+        """Test that a failing import is reported, not raised"""
+        report = profile_import("no_such_module_here")
+
+        assert report["status"] == "error"
+        assert "no_such_module_here" in report["error"]
@@ -0,0 +1,118 @@
+import pytest
+import time
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from step_scheduler import HostPoliteness, StepScheduler, driver_idle, hosts_of
+
+
+class LoadingDriver:
+    """readyState is 'loading' for the first few polls"""
+
+    def __init__(self, loading_polls=3):
+        self.polls = 0
+        self.loading_polls = loading_polls
+
+    def execute_script(self, script):
+        self.polls += 1
+        return "loading" if self.polls <= self.loading_polls else "complete"
+
+
+class DeadDriver:
+    def execute_script(self, script):
+        raise ConnectionRefusedError("session is gone")
+
+
+class TestStepScheduler:
+    def test_no_fixed_sleeps(self):
+        """Test that steps run back to back in order and the saving is reported"""
+        order = []
+        scheduler = StepScheduler()
+        for name in ("a", "b", "c"):
+            scheduler.add(name, lambda name=name: order.append(name) or name, replaces_pause=name != "a")
+
+        start_time = time.monotonic()
+        results = scheduler.run()
+
+        assert time.monotonic() - start_time < 0.5
+        assert order == ["a", "b", "c"] and results == {"a": "a", "b": "b", "c": "c"}
+        report = scheduler.report()
+        assert report["legacy_idle_seconds"] == 4
+        assert report["idle_seconds_removed"] == pytest.approx(4, abs=0.1)
+
+    def test_only_replaced_pauses_counted(self):
+        """Test that steps without a legacy pause add nothing to the idle saving"""
+        scheduler = StepScheduler()
+        scheduler.add("search", lambda: None)
+        scheduler.add("scraping", lambda: None, replaces_pause=True)
+        scheduler.add("crawl", lambda: None)
+        scheduler.add("extras", lambda: None)
+        scheduler.run()
+
+        assert scheduler.report()["legacy_idle_seconds"] == 2
+
+    def test_waits_for_readiness(self):
+        """Test that a step waits until its ready predicate passes"""
+        driver = LoadingDriver()
+        scheduler = StepScheduler()
+        scheduler.add("step", lambda: driver.polls, ready=driver_idle(driver))
+
+        assert scheduler.run()["step"] == 4
+
+    def test_missing_or_dead_driver_does_not_wait(self):
+        """Test that driver_idle passes at once without a live browser"""
+        scheduler = StepScheduler(ready_timeout=5)
+        scheduler.add("no_driver", lambda: None, ready=driver_idle(None))
+        scheduler.add("dead_driver", lambda: None, ready=driver_idle(DeadDriver()))
+
+        start_time = time.monotonic()
+        scheduler.run()
+
+        assert time.monotonic() - start_time < 0.5
+
+    def test_setup_runs_before_step(self):
+        """Test that a step's setup runs after its wait and before the step itself"""
+        order = []
+        scheduler = StepScheduler()
+        scheduler.add("first", lambda: order.append("first"))
+        scheduler.add("second", lambda: order.append("second"), setup=lambda: order.append("reset"))
+        scheduler.run()
+
+        assert order == ["first", "reset", "second"]
+        assert all("setup_seconds" in timing for timing in scheduler.timings)
+
+    def test_exception_propagates_and_is_timed(self):
+        """Test that a failing step raises but still records its timing"""
+        scheduler = StepScheduler()
+        scheduler.add("boom", lambda: 1 / 0)
+
+        with pytest.raises(ZeroDivisionError):
+            scheduler.run()
+        assert [timing["step"] for timing in scheduler.timings] == ["boom"]
+
+
+class TestHostPoliteness:
+    def test_gap_only_for_repeated_hosts(self):
+        """Test that only a host used recently is made to wait"""
+        politeness = HostPoliteness(min_interval=0.2)
+        politeness.mark(["a.test"])
+
+        assert politeness.remaining(["b.test"]) <= 0
+        assert 0 < politeness.remaining(["a.test", "b.test"]) <= 0.2
+
+        start_time = time.monotonic()
+        waited = politeness.wait(["a.test"])
+        assert waited > 0
+        assert time.monotonic() - start_time >= 0.15
+        assert politeness.wait(["a.test"]) == 0.0
+
+    def test_no_hosts(self):
+        """Test that a step without hosts never waits"""
+        assert HostPoliteness().remaining([]) == 0
+
+    def test_hosts_of(self):
+        """Test that URLs and bare domains map to sorted unique hostnames"""
+        assert hosts_of(["https://b.test/x", "https://b.test/y", "a.test"]) == ["a.test", "b.test"]
@@ -0,0 +1,85 @@
+import pytest
+import sys
+import os
+import time
+import threading
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from suite_executor import SuiteExecutor
+
+
+def sleeper(seconds, status="success"):
+    def check():
+        time.sleep(seconds)
+        return {"status": status}
+    return check
+
+
+class TestSuiteExecutor:
+    def test_independent_checks_overlap(self):
+        """Test that checks in different categories run concurrently"""
+        executor = SuiteExecutor()
+        executor.add("browser", sleeper(0.2), category="browser")
+        executor.add("http_a", sleeper(0.2), category="http")
+        executor.add("http_b", sleeper(0.2), category="http")
+
+        results, report = executor.run()
+
+        assert list(results) == ["browser", "http_a", "http_b"]
+        assert report["wall_seconds"] < 0.35
+        assert report["summed_seconds"] >= 0.6
+
+    def test_category_limit(self):
+        """Test that no more than the category limit run at once"""
+        running = []
+        peak = []
+        lock = threading.Lock()
+
+        def check():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.05)
+            with lock:
+                running.pop()
+            return {"status": "success"}
+
+        executor = SuiteExecutor(limits={"browser": 1})
+        for i in range(3):
+            executor.add(f"browser_{i}", check, category="browser")
+        executor.run()
+
+        assert max(peak) == 1
+
+    def test_dependencies_and_critical_path(self):
+        """Test that dependents wait and the critical path follows the chain"""
+        executor = SuiteExecutor()
+        executor.add("import", sleeper(0.1))
+        executor.add("use", sleeper(0.1), depends_on=["import"])
+        executor.add("probe", sleeper(0.05), category="http")
+
+        _, report = executor.run()
+        timings = {check["name"]: check for check in report["checks"]}
+
+        assert timings["use"]["start_seconds"] >= timings["import"]["duration_seconds"]
+        assert report["critical_path"] == ["import", "use"]
+        assert report["critical_path_seconds"] >= 0.2
+
+    def test_exceptions_become_errors(self):
+        """Test that a raising check is reported as an error result"""
+        def broken():
+            raise RuntimeError("boom")
+
+        executor = SuiteExecutor(sequential=True)
+        executor.add("broken", broken)
+
+        results, _ = executor.run()
+
+        assert results["broken"] == {"status": "error", "error": "boom"}
+
+    def test_unknown_dependency(self):
+        """Test that depending on an unregistered check is rejected"""
+        with pytest.raises(ValueError):
+            SuiteExecutor().add("use", sleeper(0), depends_on=["import"])
@@ -0,0 +1,66 @@
+import pytest
+import requests
+import time
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from target_server import TargetServer, RouteProfile, rewrite_url
+
+
+class TestTargetServer:
+    @pytest.fixture
+    def server(self):
+        routes = {
+            "/html": RouteProfile(payload_bytes=20000),
+            "/json": RouteProfile(latency_ms=200)
+        }
+        with TargetServer(routes=routes) as server:
+            yield server
+
+    def test_suite_endpoints(self, server):
+        """Test that every endpoint the suites use is served"""
+        for path in ["/", "/html", "/json", "/forms/post", "/search"]:
+            response = requests.get(server.base_url + path, timeout=5)
+            assert response.status_code == 200
+
+        assert 'name="custname"' in requests.get(server.base_url + "/forms/post").text
+        assert 'name="q"' in requests.get(server.base_url + "/search").text
+
+    def test_search_results(self, server):
+        """Test that a query renders a results block with headings"""
+        page = requests.get(server.base_url + "/search", params={"q": "<b>termux</b>"}).text
+        assert 'id="search"' in page
+        assert page.count("<h3>") == 10
+        assert "<b>termux</b>" not in page
+
+    def test_payload_size(self, server):
+        """Test that the configured payload size is exact"""
+        response = requests.get(server.base_url + "/html")
+        assert len(response.content) == 20000
+        assert response.text.endswith("</body></html>")
+
+    def test_route_latency(self, server):
+        """Test that per-route latency is added"""
+        start_time = time.perf_counter()
+        requests.get(server.base_url + "/json")
+        assert time.perf_counter() - start_time >= 0.2
+
+    def test_bandwidth_limit(self):
+        """Test that bandwidth shaping paces the body"""
+        routes = {"/html": RouteProfile(bandwidth_kbps=800, payload_bytes=50000)}
+        with TargetServer(routes=routes) as server:
+            start_time = time.perf_counter()
+            requests.get(server.base_url + "/html")
+            # 50 kB at 100 kB/s
+            assert time.perf_counter() - start_time >= 0.45
+
+    def test_rewrite_url(self):
+        """Test mapping of live URLs onto the local server"""
+        base = "http://127.0.0.1:8080"
+        assert rewrite_url("https://www.google.com", base) == base + "/search?origin=www.google.com"
+        assert rewrite_url("https://httpbin.org/forms/post", base) == base + "/forms/post?origin=httpbin.org"
+        assert rewrite_url("https://example.com", base) == base + "/html?origin=example.com"
+        assert rewrite_url("https://example.com", None) == "https://example.com"
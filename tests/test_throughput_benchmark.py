@@ -0,0 +1,61 @@
+import pytest
+import requests
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from target_server import TargetServer, RouteProfile
+from throughput_benchmark import ThroughputBenchmark, bufferbloat_grade, endpoints_for
+
+
+class TestThroughputBenchmark:
+    @pytest.fixture
+    def server(self):
+        with TargetServer() as server:
+            yield server
+
+    def test_source_and_sink(self, server):
+        """Test that the target server streams exact sizes and counts uploads"""
+        response = requests.get(server.base_url + "/bytes/100000", timeout=5)
+        assert len(response.content) == 100000
+
+        response = requests.post(server.base_url + "/upload", data=b"x" * 70000, timeout=5)
+        assert response.json() == {"received": 70000}
+
+    def test_local_benchmark(self, server):
+        """Test that both directions report per-stream and aggregate throughput"""
+        download_url, upload_url = endpoints_for(server.base_url)
+        benchmark = ThroughputBenchmark(download_url, upload_url, streams=2,
+                                        transfer_bytes=1_000_000, duration=0.5, warmup=0.1,
+                                        latency_interval=0.05)
+
+        result = benchmark.run()
+
+        assert result["status"] == "success"
+        for direction in ("download", "upload"):
+            assert len(result[direction]["streams"]) == 2
+            assert result[direction]["bytes"] == sum(stream["bytes"] for stream in result[direction]["streams"])
+            assert result[f"{direction}_mbps"] > 0
+        assert result["latency"]["idle"]["p50_ms"] is not None
+        assert result["latency"]["download_loaded"]["p50_ms"] is not None
+
+    def test_throttled_route(self):
+        """Test that a bandwidth cap on the source shows up in the aggregate"""
+        routes = {"/bytes": RouteProfile(bandwidth_kbps=4000)}
+        with TargetServer(routes=routes) as server:
+            download_url, _ = endpoints_for(server.base_url)
+            benchmark = ThroughputBenchmark(download_url, upload_url=None, streams=1,
+                                            transfer_bytes=10_000_000, duration=1.0, warmup=0.2)
+            result = benchmark.run()
+
+        assert result["upload"] is None
+        assert 2.5 < result["download_mbps"] < 5
+
+    def test_bufferbloat_grades(self):
+        """Test the added-latency grading thresholds"""
+        assert bufferbloat_grade(2) == "A+"
+        assert bufferbloat_grade(100) == "C"
+        assert bufferbloat_grade(1000) == "F"
+        assert bufferbloat_grade(None) is None
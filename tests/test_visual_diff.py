@@ -0,0 +1,64 @@
+import pytest
+import sys
+import os
+
+# Add scripts directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+np = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+
+from visual_diff import BaselineStore, VisualDiff
+
+
+def page(width=320, height=240):
+    """Light page with a dark header bar"""
+    frame = np.full((height, width), 240, dtype=np.uint8)
+    frame[10:40, 10:310] = 30
+    return frame
+
+
+class TestVisualDiff:
+    def test_identical_and_noise(self):
+        """Test that identical frames and sub-tolerance noise are the same"""
+        differ = VisualDiff(tolerance=16)
+        noisy = page().astype(np.int16) + np.random.default_rng(0).integers(-8, 9, (240, 320))
+
+        assert differ.compare(page(), page())["verdict"] == "same"
+        result = differ.compare(page(), noisy)
+        assert result["verdict"] == "same"
+        assert result["changed_ratio"] == 0
+
+    def test_changed_regions(self):
+        """Test that separate changes get separate tight boxes, largest first"""
+        current = page()
+        current[100:150, 50:130] = 0
+        current[200:210, 280:300] = 0
+
+        result = VisualDiff().compare(page(), current)
+
+        assert result["verdict"] == "changed"
+        assert result["regions"] == [[50, 100, 130, 150], [280, 200, 300, 210]]
+        assert result["changed_ratio"] == pytest.approx((50 * 80 + 10 * 20) / (240 * 320), abs=1e-6)
+
+    def test_downscaled_boxes_in_full_pixels(self):
+        """Test that comparing a pyramid level still reports full-size coordinates"""
+        current = page()
+        current[100:150, 48:128] = 0
+
+        result = VisualDiff(downscale=2).compare(page(), current)
+
+        assert result["regions"] == [[48, 100, 128, 150]]
+
+    def test_baseline_store(self, tmp_path):
+        """Test that the first capture becomes the baseline and later ones are compared"""
+        first, second = tmp_path / "first.png", tmp_path / "second.png"
+        Image.fromarray(page()).save(first)
+        changed = page()
+        changed[60:200, 60:260] = 0
+        Image.fromarray(changed).save(second)
+        store = BaselineStore(str(tmp_path / "baselines"))
+
+        assert store.check("home", str(first))["verdict"] == "new"
+        assert store.check("home", str(first))["verdict"] == "same"
+        assert store.check("home", str(second))["verdict"] == "changed"